@@ -0,0 +1,258 @@
+"""Benchmarks for the PurviewCollections hot paths.
+
+Runs every benchmark against the in-memory FakePurview for each combination
+of tree depth, fan-out (breadth) and simulated latency, and writes the wall
+time, request count and peak memory as JSON.
+
+Usage (from the repository root, or with the package installed with pip install -e .):
+    python -m benchmarks.run --depth 2 3 --breadth 5 10 --latency 0 0.005 --output results.json
+    python -m benchmarks.run --benchmarks list_collections delete_collection_assets
+"""
+import argparse
+import atexit
+import contextlib
+import importlib.metadata
+import io
+import json
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from itertools import product
+from typing import Callable, Dict, List, Optional, Tuple
+
+from purviewautomation import PurviewCollections, SnapshotCache
+from purviewautomation.testing import FakeAuth, FakePurview
+
+BENCHMARKS = {}
+
+
+def benchmark(name: str) -> Callable:
+    """Registers a benchmark.
+
+    The function gets the config and returns a function (run) that does
+    the work being measured and the FakePurview it calls. Everything
+    before run is setup and isn't measured.
+    """
+
+    def register(function: Callable) -> Callable:
+        BENCHMARKS[name] = function
+        return function
+
+    return register
+
+
+def make_client(config: Dict, page_size: int = 1000, cache_ttl: float = 30):
+    purview = FakePurview(page_size=page_size, latency=config["latency"], seed=config["seed"])
+    names = purview.generate_tree(depth=config["depth"], breadth=config["breadth"])
+    client = PurviewCollections(
+        "account", FakeAuth(), transport=purview, cache_ttl=cache_ttl, max_workers=config["workers"]
+    )
+    return client, purview, names
+
+
+@benchmark("list_collections")
+def list_collections(config: Dict) -> Tuple[Callable, FakePurview]:
+    client, purview, _ = make_client(config, cache_ttl=0)
+    return lambda: client.list_collections(), purview
+
+
+@benchmark("list_collections_snapshot")
+def list_collections_snapshot(config: Dict) -> Tuple[Callable, FakePurview]:
+    client, purview, _ = make_client(config)
+    snapshot_dir = tempfile.mkdtemp()
+    atexit.register(shutil.rmtree, snapshot_dir, ignore_errors=True)
+    cache = SnapshotCache(snapshot_dir)
+    PurviewCollections("account", FakeAuth(), transport=purview, snapshot_cache=cache).list_collections()
+
+    def run():
+        # a new process: nothing cached in memory, the snapshot is on disk
+        PurviewCollections("account", FakeAuth(), transport=purview, snapshot_cache=cache).list_collections()
+
+    return run, purview
+
+
+@benchmark("get_real_collection_name")
+def get_real_collection_name(config: Dict) -> Tuple[Callable, FakePurview]:
+    client, purview, names = make_client(config)
+    friendly_names = [purview.collections[name]["friendlyName"] for name in names]
+    lookups = random.Random(config["seed"]).choices(friendly_names, k=config["lookups"])
+
+    def run():
+        for name in lookups:
+            client.get_real_collection_name(name)
+
+    return run, purview
+
+
+@benchmark("create_collections")
+def create_collections(config: Dict) -> Tuple[Callable, FakePurview]:
+    client, purview, _ = make_client(config)
+    paths = ["/".join(f"new{path}-{level}" for level in range(config["depth"])) for path in range(config["paths"])]
+    return lambda: client.create_collections("account", paths), purview
+
+
+@benchmark("create_collections_parallel")
+def create_collections_parallel(config: Dict) -> Tuple[Callable, FakePurview]:
+    client, purview, _ = make_client(config)
+    paths = ["/".join(f"new{path}-{level}" for level in range(config["depth"])) for path in range(config["paths"])]
+    return lambda: client.create_collections("account", paths, parallel=True), purview
+
+
+@benchmark("delete_collections_recursively")
+def delete_collections_recursively(config: Dict) -> Tuple[Callable, FakePurview]:
+    client, purview, names = make_client(config)
+    return lambda: client.delete_collections_recursively(names[0], also_delete_first_collection=True), purview
+
+
+@benchmark("extract_collections")
+def extract_collections(config: Dict) -> Tuple[Callable, FakePurview]:
+    client, purview, _ = make_client(config)
+    return lambda: client.extract_collections("account"), purview
+
+
+@benchmark("export_collections")
+def export_collections(config: Dict) -> Tuple[Callable, FakePurview]:
+    client, purview, _ = make_client(config)
+    return lambda: client.export_collections("account"), purview
+
+
+@benchmark("import_collections")
+def import_collections(config: Dict) -> Tuple[Callable, FakePurview]:
+    client, purview, names = make_client(config)
+    records = client.export_collections(names[0])
+    client.delete_collections_recursively(names[0], also_delete_first_collection=True)
+    return lambda: client.import_collections(records), purview
+
+
+@benchmark("iter_collection_assets")
+def iter_collection_assets(config: Dict) -> Tuple[Callable, FakePurview]:
+    client, purview, names = make_client(config)
+    purview.add_assets(names[0], config["assets"])
+
+    def run():
+        for _ in client.iter_collection_assets(names[0], fields=["id"], prefetch=True):
+            pass
+
+    return run, purview
+
+
+@benchmark("delete_collection_assets")
+def delete_collection_assets(config: Dict) -> Tuple[Callable, FakePurview]:
+    client, purview, names = make_client(config)
+    purview.add_assets(names[0], config["assets"])
+    return lambda: client.delete_collection_assets(names[0]), purview
+
+
+@benchmark("move_collection_assets")
+def move_collection_assets(config: Dict) -> Tuple[Callable, FakePurview]:
+    client, purview, names = make_client(config)
+    purview.add_assets(names[0], config["assets"])
+    return lambda: client.move_collection_assets(names[0], names[1]), purview
+
+
+def measure(name: str, config: Dict, memory: bool) -> Dict:
+    """Runs one benchmark once and returns the measurements.
+
+    Setup and run print to a buffer, so only the results go to stdout.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        run, purview = BENCHMARKS[name](config)
+    requests_before = len(purview.calls)
+    if memory:
+        tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        run()
+        seconds = time.perf_counter() - start
+    peak_memory = None
+    if memory:
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {"seconds": seconds, "requests": len(purview.calls) - requests_before, "peak_memory_bytes": peak_memory}
+
+
+def run_benchmarks(names: List[str], configs: List[Dict], repeat: int) -> List[Dict]:
+    """Runs every benchmark with every config.
+
+    Times are measured without tracemalloc. Peak memory is measured
+    in one extra run with tracemalloc on.
+    """
+    results = []
+    for config in configs:
+        collections = sum(config["breadth"] ** level for level in range(1, config["depth"] + 1))
+        for name in names:
+            runs = [measure(name, config, memory=False) for _ in range(repeat)]
+            seconds = [result["seconds"] for result in runs]
+            result = {
+                "benchmark": name,
+                **config,
+                "collections": collections,
+                "min_seconds": round(min(seconds), 6),
+                "median_seconds": round(statistics.median(seconds), 6),
+                "requests": runs[0]["requests"],
+                "peak_memory_bytes": measure(name, config, memory=True)["peak_memory_bytes"],
+            }
+            results.append(result)
+            print(
+                f"{name:32} depth={config['depth']} breadth={config['breadth']} latency={config['latency']} "
+                f"{result['median_seconds']:.4f}s {result['requests']} requests",
+                file=sys.stderr,
+            )
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the PurviewCollections hot paths.")
+    parser.add_argument("--benchmarks", nargs="+", choices=sorted(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--depth", nargs="+", type=int, default=[2, 3])
+    parser.add_argument("--breadth", nargs="+", type=int, default=[5, 10])
+    parser.add_argument("--latency", nargs="+", type=float, default=[0.0], help="Seconds per request.")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--paths", type=int, default=50, help="Paths created by the create benchmarks.")
+    parser.add_argument("--lookups", type=int, default=1000, help="Names resolved by get_real_collection_name.")
+    parser.add_argument("--assets", type=int, default=10000, help="Assets deleted by delete_collection_assets.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="JSON file to write the results to. Defaults to stdout.")
+    args = parser.parse_args(argv)
+
+    configs = [
+        {
+            "depth": depth,
+            "breadth": breadth,
+            "latency": latency,
+            "workers": args.workers,
+            "paths": args.paths,
+            "lookups": args.lookups,
+            "assets": args.assets,
+            "seed": args.seed,
+        }
+        for depth, breadth, latency in product(args.depth, args.breadth, args.latency)
+    ]
+    try:
+        version = importlib.metadata.version("purviewautomation")
+    except importlib.metadata.PackageNotFoundError:
+        version = None
+    report = {
+        "version": version,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": run_benchmarks(args.benchmarks, configs, args.repeat),
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            output_file.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
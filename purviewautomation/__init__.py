@@ -1,2 +1,22 @@
-from .auth import AzIdentityAuthentication, ServicePrincipalAuthentication
+from .aio import AsyncHttpTransport, AsyncPurviewCollections
+from .auth import (
+    AsyncAzIdentityAuthentication,
+    AzIdentityAuthentication,
+    ServicePrincipalAuthentication,
+)
+from .checkpoint import DeleteCheckpoint
 from .collections import PurviewCollections
+from .instrumentation import (
+    Instrumentation,
+    MetricsCollector,
+    MultiInstrumentation,
+    OperationEvent,
+    RequestEvent,
+)
+from .multi import MultiAccountExecutor
+from .planning import CollectionAction, CollectionPlan
+from .snapshot import SnapshotCache
+from .sync import load_hierarchy
+from .token_cache import FileTokenCache
+from .transport import AdaptiveRateLimiter, HttpTransport, RetryPolicy
+from .tree import CollectionNode, CollectionTree
@@ -0,0 +1,1529 @@
+import asyncio
+import inspect
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+import requests
+
+from .checkpoint import DeleteCheckpoint
+from .collections import _AssetDrain, _PurviewCollectionsBase
+from .export import export_tree, read_export, write_export
+from .instrumentation import Instrumentation, instrumented, record_request
+from .planning import CollectionAction, CollectionPlan
+from .singleflight import AsyncSingleFlight
+from .snapshot import SnapshotCache
+from .sync import load_hierarchy
+from .transport import AdaptiveRateLimiter, RetryPolicy
+from .tree import CollectionTree
+
+try:
+    import aiohttp
+except ImportError:  # optional dependency: pip install purviewautomation[async]
+    aiohttp = None
+
+
+class AsyncResponse:
+    """Response returned by AsyncHttpTransport (the body is already read).
+
+    Attributes:
+        status_code: HTTP status code.
+        headers: Response headers.
+        content: Response body.
+        url: The url that was called.
+        retries: Number of retries made by the transport.
+    """
+
+    def __init__(self, status_code: int, headers: Dict[str, str], content: bytes, url: str) -> None:
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+        self.retries = 0
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+
+class AsyncHttpTransport:
+    """Non-blocking, pooled HTTP transport used by AsyncPurviewCollections.
+
+    Needs aiohttp (pip install purviewautomation[async]). Retries and rate
+    limits requests the same way as HttpTransport. One transport can be
+    shared by multiple clients on the same event loop.
+
+    A custom transport can be passed into AsyncPurviewCollections (ex: for
+    testing). It only needs an async request(method, url, headers, data,
+    timeout) method that returns an AsyncResponse like object.
+
+    Attributes:
+        limit: Max number of open connections.
+        limit_per_host: Max number of open connections per host.
+        timeout: Default total timeout in seconds per request.
+        retry_policy: When and how long to wait before retrying.
+            If None, uses the default RetryPolicy.
+        max_rate: Max requests per second per host. The rate adapts
+            between 1 and max_rate. If None, requests aren't rate limited.
+
+    Returns:
+        AsyncHttpTransport object
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 10,
+        timeout: float = 120,
+        retry_policy: Optional[RetryPolicy] = None,
+        max_rate: Optional[float] = 100,
+    ) -> None:
+        if aiohttp is None:
+            raise ImportError(
+                "AsyncHttpTransport needs the aiohttp package. Install it with: pip install purviewautomation[async]"
+            )
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.max_rate = max_rate
+        self._session = None
+        self._rate_limiters = {}
+        self._rate_limiters_lock = threading.Lock()
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """
+        Internal helper function. Do not call directly.
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    def rate_limiter(self, url: str) -> Optional[AdaptiveRateLimiter]:
+        """Returns the rate limiter for the url's host.
+
+        Returns None if max_rate is None.
+        """
+        if self.max_rate is None:
+            return None
+        host = urlparse(url).netloc
+        with self._rate_limiters_lock:
+            if host not in self._rate_limiters:
+                self._rate_limiters[host] = AdaptiveRateLimiter(max_rate=self.max_rate)
+            return self._rate_limiters[host]
+
+    async def _send(
+        self, method: str, url: str, headers: Optional[Dict[str, str]], data: Optional[str], timeout: float
+    ) -> AsyncResponse:
+        """
+        Internal helper function. Do not call directly.
+        """
+        session = self._get_session()
+        client_timeout = aiohttp.ClientTimeout(total=timeout)
+        async with session.request(method, url, headers=headers, data=data, timeout=client_timeout) as response:
+            content = await response.read()
+            return AsyncResponse(response.status, dict(response.headers), content, url)
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        data: Optional[Union[str, bytes]] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncResponse:
+        """Sends a request using the pooled session.
+
+        Retries the request based on the retry policy.
+
+        Args:
+            method: HTTP method. Ex: "GET".
+            url: Full url to call.
+            headers: Headers to send.
+            data: Request body.
+            timeout: If None, uses the transport's default timeout.
+
+        Returns:
+            AsyncResponse object.
+        """
+        if timeout is None:
+            timeout = self.timeout
+        rate_limiter = self.rate_limiter(url)
+
+        retries = 0
+        while True:
+            if rate_limiter is not None:
+                wait = rate_limiter.reserve()
+                if wait:
+                    await asyncio.sleep(wait)
+            try:
+                response = await self._send(method, url, headers, data, timeout)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if not self.retry_policy.should_retry(retries):
+                    raise
+                await asyncio.sleep(self.retry_policy.get_backoff(retries))
+                retries += 1
+                continue
+
+            if rate_limiter is not None:
+                if response.status_code == 429:
+                    rate_limiter.on_throttle()
+                elif response.status_code < 500:
+                    rate_limiter.on_success()
+
+            if not self.retry_policy.should_retry(retries, response):
+                response.retries = retries
+                return response
+            await asyncio.sleep(self.retry_policy.get_backoff(retries, response))
+            retries += 1
+
+    async def close(self) -> None:
+        """Closes all of the pooled connections."""
+        if self._session is not None:
+            await self._session.close()
+
+    async def __aenter__(self) -> "AsyncHttpTransport":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+
+class AsyncPurviewCollections(_PurviewCollectionsBase):
+    """Interact with Purview Collections using asyncio.
+
+    Same methods as PurviewCollections, but every method that calls
+    Purview is a coroutine. Concurrent operations run on the event loop
+    instead of a thread per request.
+
+    Attributes:
+        purview_account_name: Name of the Purview account.
+        authentication: Any of the authentication classes. If it has an async
+            get_access_token (ex: AsyncAzIdentityAuthentication),
+            it's awaited. Otherwise it's called in a worker thread.
+        collections_endpoint: The endpoint when calling collection APIs.
+        collections_api_version: API version for the collection APIs.
+        catalog_endpoint: The endpoint when calling the catalog APIs.
+        catalog_api_version: API version for the catalog APIs.
+        transport: HTTP transport used for every API call. If None,
+            an AsyncHttpTransport with 2 * max_workers connections per
+            host (at least 10) is created.
+        cache_ttl: How long in seconds a collection listing is reused
+            before it's fetched again. If 0, every call fetches the collections.
+        max_workers: Default max number of concurrent requests
+            for concurrent operations.
+        instrumentation: Receives the timing, status and size of every
+            API call and of every public method call (ex: MetricsCollector).
+            If None, nothing is recorded.
+        snapshot_cache: Saves the collection listing on disk so new
+            processes start without listing the collections (see
+            SnapshotCache). If None, nothing is saved. Snapshot and
+            checkpoint files are read and written in a worker thread.
+            close() waits for the queued snapshot writes.
+
+    Returns:
+        AsyncPurviewCollections object
+    """
+
+    def __init__(
+        self,
+        purview_account_name: str,
+        auth,
+        transport: Optional[AsyncHttpTransport] = None,
+        cache_ttl: float = 30,
+        max_workers: int = 8,
+        instrumentation: Optional[Instrumentation] = None,
+        snapshot_cache: Optional[SnapshotCache] = None,
+    ) -> None:
+        super().__init__(purview_account_name, cache_ttl, max_workers, instrumentation, snapshot_cache)
+        self.authentication = auth
+        if transport is None:
+            transport = AsyncHttpTransport(limit_per_host=max(10, 2 * max_workers))
+        self.transport = transport
+        self._reads = AsyncSingleFlight()
+        self._file_executor = None
+
+    def _file_thread(self) -> ThreadPoolExecutor:
+        """Internal helper function. Do not call directly.
+
+        Returns the thread that does the snapshot, checkpoint, export and
+            hierarchy file I/O. One thread keeps the writes in order.
+        """
+        if self._file_executor is None:
+            self._file_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="purviewautomation-files")
+        return self._file_executor
+
+    async def _run_file_io(self, function: Callable, *args):
+        """Internal helper function. Do not call directly.
+
+        Runs blocking file I/O (snapshot, checkpoint, export and hierarchy
+            files) in the file thread so it doesn't block the event loop.
+        """
+        return await asyncio.get_running_loop().run_in_executor(self._file_thread(), function, *args)
+
+    def _write_snapshot(self, function: Callable, *args) -> None:
+        """Internal helper function. Do not call directly.
+
+        Queues a change to the snapshot file in the file thread. It's
+            called while holding the cache lock, so it doesn't wait for it.
+        """
+        self._file_thread().submit(function, *args)
+
+    async def _get_access_token(self) -> str:
+        """
+        Internal helper function. Do not call directly.
+        """
+        if inspect.iscoroutinefunction(self.authentication.get_access_token):
+            return await self.authentication.get_access_token()
+        return await asyncio.get_running_loop().run_in_executor(None, self.authentication.get_access_token)
+
+    async def _request(
+        self, method: str, url: str, data: Optional[str] = None, headers: Optional[Dict[str, str]] = None
+    ) -> AsyncResponse:
+        """
+        Internal helper function. Do not call directly.
+        """
+        access_token = await self._get_access_token()
+        header = {"Authorization": f"Bearer {access_token}", "Content-Type": "application/json", **(headers or {})}
+        if self.instrumentation is None:
+            return await self.transport.request(method, url, headers=header, data=data)
+
+        start = time.perf_counter()
+        try:
+            response = await self.transport.request(method, url, headers=header, data=data)
+        except Exception as e:
+            record_request(self.instrumentation, method, url, data, None, time.perf_counter() - start, e)
+            raise
+        record_request(self.instrumentation, method, url, data, response, time.perf_counter() - start)
+        return response
+
+    async def _get_collections_page(self, url: str) -> Dict:
+        """
+        Internal helper function. Do not call directly.
+        """
+        return (await self._get_collections_response(url)).json()
+
+    async def _get_collections_response(self, url: str, headers: Optional[Dict[str, str]] = None) -> AsyncResponse:
+        """
+        Internal helper function. Do not call directly.
+        """
+        collection_request = await self._request("GET", url, headers=headers)
+        self._check_collections_response(collection_request)
+        return collection_request
+
+    async def _get_tree(self, api_version: Optional[str] = None) -> CollectionTree:
+        """Internal helper function. Do not call directly.
+
+        Returns the cached collection tree or fetches the collections
+            if the cache is empty or older than cache_ttl. Concurrent
+            callers share one fetch.
+        """
+        if not api_version:
+            api_version = self.collections_api_version
+
+        tree = self._cached_tree(api_version)
+        if tree is not None:
+            return tree
+        return await self._reads.do(("tree", api_version), lambda: self._fetch_tree(api_version))
+
+    async def _fetch_tree(self, api_version: str) -> CollectionTree:
+        """
+        Internal helper function. Do not call directly.
+        """
+        generation, changes = self._start_tree_fetch()
+        tree = validators = None
+        try:
+            if self.snapshot_cache is None:
+                tree = CollectionTree([coll async for coll in self._iter_collections(api_version=api_version)])
+            else:
+                collections, validators = await self._fetch_snapshot_collections(api_version)
+                tree = CollectionTree(collections)
+        finally:
+            self._end_tree_fetch(api_version, generation, changes, tree, validators)
+        return tree
+
+    async def _fetch_snapshot_collections(self, api_version: str) -> Tuple[List[Dict], Optional[Tuple]]:
+        """Internal helper function. Do not call directly.
+
+        Returns the collections from the snapshot cache, revalidating or
+            listing them again when the snapshot is too old, and the
+            validators to save (None if the snapshot is still current).
+        """
+        snapshot = await self._run_file_io(self._load_snapshot, api_version)
+        if snapshot is not None and self.snapshot_cache.is_fresh(snapshot):
+            return snapshot.collections, None
+
+        response = await self._get_collections_response(
+            self._collections_url(api_version), self._snapshot_headers(snapshot)
+        )
+        if response.status_code == 304 and snapshot is not None:
+            self._write_snapshot(self.snapshot_cache.touch, self.purview_account_name, api_version)
+            return snapshot.collections, None
+
+        page = response.json()
+        collections = list(page["value"])
+        while page.get("nextLink"):
+            page = await self._get_collections_page(page["nextLink"])
+            collections.extend(page["value"])
+        return collections, self._response_validators(response)
+
+    @instrumented
+    async def iter_collections(self, api_version: Optional[str] = None) -> AsyncIterator[Dict]:
+        """Yields the Purview collections one page at a time.
+
+        Follows the nextLink of every page until all of the collections
+        are returned. Always calls Purview (doesn't use the cached collections).
+
+        Args:
+            api_version: If None, default is "2019-11-01-preview".
+
+        Returns:
+            Async iterator of dictionaries containing the collection info.
+        """
+        async for collection in self._iter_collections(api_version):
+            yield collection
+
+    async def _iter_collections(self, api_version: Optional[str] = None) -> AsyncIterator[Dict]:
+        """Internal helper function. Do not call directly.
+
+        Used by iter_collections and to load the cached listing (which is
+        part of the calling operation).
+        """
+        if not api_version:
+            api_version = self.collections_api_version
+
+        url = self._collections_url(api_version)
+        while url:
+            page = await self._get_collections_page(url)
+            url = page.get("nextLink")
+            for collection in page["value"]:
+                yield collection
+
+    @instrumented
+    async def list_collections(
+        self, only_names: bool = False, pprint: bool = False, api_version: Optional[str] = None
+    ) -> Union[List[Dict], Dict[str, Dict]]:
+        """Returns the Purview collections.
+
+        Args:
+            only_names: If True, will return only the actual, friendly,
+                and parent collection names.
+            pprint: If True, will pretty print the collections.
+            api_version: If None, default is "2019-11-01-preview".
+
+        Returns:
+            List of dictionaries containing the collection info.
+                If only_names is True, will return a dictionary
+                    of only_names items.
+        """
+        return self._list_collections(await self._get_tree(api_version), only_names, pprint)
+
+    @instrumented
+    async def get_real_collection_name(
+        self, collection_name: str, api_version: Optional[str] = None, force_actual_name: bool = False
+    ) -> str:
+        """Returns the actual under the hood collection name.
+
+        Args:
+            collection_name: Name to check.
+            api_version: If None, default is "2019-11-01-preview".
+            force_actual_name: Edge case. If True, will check if the
+                actual name is the name passed in. Useful if there
+                are multiple friendly names.
+
+        Returns:
+            The actual name of the collection.
+        """
+        return (await self._get_tree(api_version)).resolve(collection_name, force_actual_name)
+
+    @instrumented
+    async def get_child_collection_names(self, collection_name: str, api_version: Optional[str] = None) -> Dict:
+        if not api_version:
+            api_version = self.collections_api_version
+
+        url = self._child_names_url(collection_name, api_version)
+
+        async def get() -> Dict:
+            return (await self._request("GET", url)).json()
+
+        # concurrent calls for the same collection share one request
+        return await self._reads.do(("GET", url), get)
+
+    async def _return_request_info(
+        self, name: str, friendly_name: str, parent_collection: str, api_version: str
+    ) -> AsyncResponse:
+        """
+        Internal helper function. Do not call directly.
+        """
+        request = await self._request(
+            "PUT", self._collection_url(name, api_version), data=self._collection_data(friendly_name, parent_collection)
+        )
+        self._collection_saved(request)
+        return request
+
+    async def _create_planned_collection(self, action: CollectionAction, api_version: str) -> Dict:
+        """
+        Internal helper function. Do not call directly.
+        """
+        request = await self._return_request_info(
+            action.name, action.friendly_name, action.parent_collection, api_version
+        )
+        return self._planned_collection_result(action, request)
+
+    async def _execute_action(
+        self,
+        action: CollectionAction,
+        api_version: str,
+        semaphore,
+        delete_assets: bool = False,
+        delete_assets_timeout: int = 30,
+        checkpoint: Optional[DeleteCheckpoint] = None,
+        asset_semaphore: Optional[asyncio.Semaphore] = None,
+        max_in_flight: Optional[int] = None,
+    ) -> Dict:
+        """
+        Internal helper function. Do not call directly.
+        """
+        async with semaphore:
+            try:
+                if action.action in ("create", "update"):
+                    return await self._create_planned_collection(action, api_version)
+                result = await self._delete_collection(
+                    action.name,
+                    action.friendly_name,
+                    api_version,
+                    delete_assets,
+                    delete_assets_timeout,
+                    checkpoint,
+                    asset_semaphore,
+                    max_in_flight,
+                )
+                if checkpoint is not None and result["error"] is None:
+                    await self._run_file_io(checkpoint.mark_completed, action.name)
+                return {**action.to_dict(), **result}
+            except Exception as e:
+                return self._action_error(action, e)
+
+    async def _execute_plan(
+        self,
+        plan: CollectionPlan,
+        api_version: str,
+        max_workers: int,
+        delete_assets: bool = False,
+        delete_assets_timeout: int = 30,
+        checkpoint: Optional[DeleteCheckpoint] = None,
+    ) -> List[Dict]:
+        """Internal method. Do not call directly.
+
+        Runs every level of the plan concurrently, lowest level first.
+        Actions that depend on a failed action are skipped. When assets
+        are deleted, every collection shares one limit of max_workers bulk
+        deletes, so at most 2 * max_workers requests run at the same time.
+        """
+        semaphore = asyncio.Semaphore(max_workers)
+        asset_semaphore = asyncio.Semaphore(max_workers)
+        results = []
+        failed = set()
+        for level in plan.levels:
+            coroutines = [
+                self._execute_action(
+                    action,
+                    api_version,
+                    semaphore,
+                    delete_assets,
+                    delete_assets_timeout,
+                    checkpoint,
+                    asset_semaphore,
+                    max_workers * 2,
+                )
+                for action in self._runnable_actions(level, failed, results)
+            ]
+
+            for result in await asyncio.gather(*coroutines):
+                if result["error"] is not None:
+                    failed.add(result["name"])
+                results.append(result)
+        return results
+
+    @instrumented
+    async def plan_create_collections(
+        self,
+        start_collection: str,
+        collection_names: Union[str, List[str]],
+        force_actual_name: bool = False,
+        api_version: Optional[str] = None,
+        **kwargs,
+    ) -> CollectionPlan:
+        """Plans the collections create_collections would create.
+
+        Only lists the collections (or uses the cached listing).
+        Nothing is created. Run the plan with execute_plan.
+
+        Args:
+            start_collection: Existing collection name. Accepts friendly
+                and actual names.
+            collection_names: collection name or names.
+            force_actual_name: Edge Case. If multiple duplicate friendly names
+                and one of the actual names is the name passed in.
+            api_version: If None, default is "2019-11-01-preview".
+            **kwargs:
+                safe_delete_friendly_name: Used during the safe delete
+                functionality. Don't call directly.
+
+        Returns:
+            CollectionPlan with one create action per new collection.
+        """
+        tree = await self._get_tree(api_version)
+        start_collection = tree.resolve(start_collection, force_actual_name)
+        collection_list = self._return_collection_paths(collection_names)
+        return self._plan_create_collections(
+            start_collection, collection_list, tree, kwargs.get("safe_delete_friendly_name")
+        )
+
+    @instrumented
+    async def plan_delete_collections(
+        self,
+        collection_names: Union[str, List[str]],
+        force_actual_name: bool = False,
+        api_version: Optional[str] = None,
+    ) -> CollectionPlan:
+        """Plans the collections delete_collections would delete.
+
+        Only lists the collections (or uses the cached listing).
+        Nothing is deleted. Run the plan with execute_plan.
+
+        Args:
+            collection_names: Collections to be deleted.
+            force_actual_name: Edge Case. If multiple duplicate friendly names
+                and one of the actual names is the name passed in.
+            api_version: If None, default is "2019-11-01-preview".
+
+        Returns:
+            CollectionPlan with one delete action per collection.
+
+        Raises:
+            ValueError if any of the collections has children.
+        """
+        collection_names = self._collection_names_list(collection_names)
+
+        return self._plan_delete_collections(collection_names, await self._get_tree(api_version), force_actual_name)
+
+    @instrumented
+    async def plan_delete_collections_recursively(
+        self,
+        collection_names: Union[str, List[str]],
+        also_delete_first_collection: bool = False,
+        force_actual_name: bool = False,
+        api_version: Optional[str] = None,
+    ) -> CollectionPlan:
+        """Plans the collections delete_collections_recursively would delete.
+
+        Only lists the collections (or uses the cached listing).
+        Nothing is deleted. Run the plan with execute_plan.
+
+        Args:
+            collection_names: One or multiple names.
+            also_delete_first_collection: Deletes the start collection
+                along with the children collections.
+            force_actual_name: Edge Case. If multiple duplicate friendly names
+                and one of the actual names is the name passed in.
+            api_version: If None, default is "2019-11-01-preview".
+
+        Returns:
+            CollectionPlan with one delete action per collection
+                (leaf collections in the first level).
+
+        Raises:
+            ValueError if any of the collections has no children.
+        """
+        collection_names = self._collection_names_list(collection_names)
+
+        return self._plan_delete_collections_recursively(
+            collection_names, await self._get_tree(api_version), also_delete_first_collection, force_actual_name
+        )
+
+    @instrumented
+    async def execute_plan(
+        self,
+        plan: CollectionPlan,
+        max_workers: Optional[int] = None,
+        delete_assets: bool = False,
+        delete_assets_timeout: int = 30,
+        api_version: Optional[str] = None,
+    ) -> List[Dict]:
+        """Runs a plan from one of the plan methods.
+
+        Every level of the plan runs concurrently, lowest level first.
+        Actions that depend on a failed action are skipped.
+
+        Args:
+            plan: The CollectionPlan to run.
+            max_workers: Max number of concurrent requests.
+                If None, uses the client's max_workers.
+            delete_assets: if True, deletes the assets of every collection
+                before it's deleted.
+            delete_assets_timeout: If delete_assets is True,
+                this is the timeout in minutes for deleting the assets.
+            api_version: If None, default is "2019-11-01-preview".
+
+        Returns:
+            List of dictionaries with the action and result of every
+                collection (action, name, friendlyName, parentCollection,
+                level, dependsOn, status_code and error).
+        """
+        if not api_version:
+            api_version = self.collections_api_version
+
+        return await self._execute_plan(
+            plan, api_version, max_workers or self.max_workers, delete_assets, delete_assets_timeout
+        )
+
+    @instrumented
+    async def plan_sync_collections(
+        self,
+        hierarchy: Union[str, Dict],
+        prune: bool = False,
+        force_actual_name: bool = False,
+        api_version: Optional[str] = None,
+    ) -> CollectionPlan:
+        """Plans the changes that make Purview match a desired hierarchy.
+
+        Only lists the collections (or uses the cached listing).
+        Nothing is changed. Run the plan with execute_plan.
+
+        Args:
+            hierarchy: Path to a .json, .yaml or .yml file, or a dictionary
+                with the desired collections. See load_hierarchy.
+            prune: If True, collections under the start collection that
+                aren't in the hierarchy are deleted.
+            force_actual_name: Edge Case. If multiple duplicate friendly names
+                and one of the actual names is the start collection.
+            api_version: If None, default is "2019-11-01-preview".
+
+        Returns:
+            CollectionPlan with create, update (rename or move) and delete
+                actions. Empty if Purview already matches the hierarchy.
+        """
+        if not api_version:
+            api_version = self.collections_api_version
+
+        hierarchy = await self._run_file_io(load_hierarchy, hierarchy)
+        return self._plan_sync_collections(hierarchy, await self._get_tree(api_version), prune, force_actual_name)
+
+    @instrumented
+    async def sync_collections(
+        self,
+        hierarchy: Union[str, Dict],
+        prune: bool = False,
+        force_actual_name: bool = False,
+        api_version: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ) -> List[Dict]:
+        """Creates, renames, moves and (optionally) deletes collections to match a desired hierarchy.
+
+        Only the differences are sent to Purview. Running it again on
+        an account that already matches makes no changes.
+
+        Args:
+            hierarchy: Path to a .json, .yaml or .yml file, or a dictionary
+                with the desired collections. See load_hierarchy.
+            prune: If True, collections under the start collection that
+                aren't in the hierarchy are deleted. Collections with
+                assets can't be deleted.
+            force_actual_name: Edge Case. If multiple duplicate friendly names
+                and one of the actual names is the start collection.
+            api_version: If None, default is "2019-11-01-preview".
+            max_workers: Max number of concurrent requests.
+                If None, uses the client's max_workers.
+
+        Returns:
+            List of dictionaries with the action and result of every
+                changed collection (see execute_plan).
+        """
+        if not api_version:
+            api_version = self.collections_api_version
+
+        plan = await self.plan_sync_collections(hierarchy, prune, force_actual_name, api_version)
+        return await self._execute_plan(plan, api_version, max_workers or self.max_workers)
+
+    @instrumented
+    async def create_collections(
+        self,
+        start_collection: str,
+        collection_names: Union[str, List[str]],
+        force_actual_name: bool = False,
+        api_version: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        **kwargs,
+    ) -> List[Dict]:
+        """Create collections.
+
+        Every level of the new collections is created concurrently
+        (parents are always created before their children).
+
+        Args:
+            start_collection: Existing collection name. Accepts friendly
+                and actual names.
+            collection_names: collection name or names.
+            force_actual_name: Edge Case. If multiple duplicate friendly names
+                and one of the actual names is the name passed in.
+            api_version: If None, default is "2019-11-01-preview".
+            max_workers: Max number of concurrent requests.
+                If None, uses the client's max_workers.
+            **kwargs:
+                safe_delete_friendly_name: Used during the safe delete
+                functionality. Don't call directly.
+
+        Returns:
+            List of dictionaries with the result of every collection
+                that was created (name, friendlyName, parentCollection,
+                level, status_code and error).
+        """
+        if not api_version:
+            api_version = self.collections_api_version
+
+        plan = await self.plan_create_collections(
+            start_collection, collection_names, force_actual_name, api_version, **kwargs
+        )
+        return await self._execute_plan(plan, api_version, max_workers or self.max_workers)
+
+    async def _search_collection_assets(
+        self,
+        collection: str,
+        friendly_name: str,
+        api_version: str,
+        limit: int,
+        filters: Optional[Dict] = None,
+        continuation_token: Optional[str] = None,
+        offset: Optional[int] = None,
+    ) -> Dict:
+        """
+        Internal helper function. Do not call directly.
+        """
+        data = self._asset_search_data(collection, limit, filters, continuation_token, offset)
+        asset_request = await self._request("POST", self._search_url(api_version), data=data)
+        return self._check_search_response(asset_request, friendly_name)
+
+    async def _count_assets(
+        self, collections: List[str], api_version: str, semaphore, filters: Optional[Dict] = None
+    ) -> Dict[str, int]:
+        """
+        Internal helper function. Do not call directly.
+        """
+        async with semaphore:
+            count_request = await self._request(
+                "POST", self._search_url(api_version), data=self._asset_count_data(collections, filters)
+            )
+        counts = self._check_count_response(count_request, collections)
+        if counts is None:
+            counts = {}
+            for collection in collections:
+                counts.update(await self._count_assets([collection], api_version, semaphore, filters))
+        return counts
+
+    @instrumented
+    async def count_collection_assets(
+        self,
+        collection_name: str,
+        include_children: bool = True,
+        filters: Optional[Dict] = None,
+        batch_size: int = 50,
+        max_workers: Optional[int] = None,
+        force_actual_name: bool = False,
+        api_version: Optional[str] = None,
+    ) -> Dict[str, Dict]:
+        """Counts the assets in a collection and every collection under it.
+
+        Collections are counted in batches (one search per batch with the
+        counts in the collectionId facet) and the batches run concurrently.
+        The counts are then added up the hierarchy.
+
+        Args:
+            collection_name: Collection to start on. Accepts friendly
+                and actual names.
+            include_children: If False, only the collection is counted.
+            filters: Extra search filter combined (and) with the collections.
+                Ex: {"entityType": "azure_datalake_gen2_path"}.
+            batch_size: Number of collections counted per search.
+            max_workers: Max number of concurrent searches.
+                If None, uses the client's max_workers.
+            force_actual_name: Edge Case. If multiple duplicate friendly names
+                and one of the actual names is the name passed in.
+            api_version: Catalog API version.
+                If None, default is "2022-03-01-preview".
+
+        Returns:
+            Dictionary with the actual collection name as the key (parents
+                before children) and the friendlyName, assets (in the
+                collection) and total (in the collection and every collection
+                under it) as the values.
+        """
+        if not api_version:
+            api_version = self.catalog_api_version
+
+        tree, start_collection, batches = self._count_batches(
+            await self._get_tree(), collection_name, include_children, force_actual_name, batch_size
+        )
+        semaphore = asyncio.Semaphore(max_workers or self.max_workers)
+        counts = {}
+        for batch_counts in await asyncio.gather(
+            *(self._count_assets(batch, api_version, semaphore, filters) for batch in batches)
+        ):
+            counts.update(batch_counts)
+        return self._rollup_asset_counts(tree, start_collection, counts)
+
+    @instrumented
+    async def iter_collection_assets(
+        self,
+        collection_name: str,
+        filters: Optional[Dict] = None,
+        page_size: int = 1000,
+        fields: Optional[List[str]] = None,
+        prefetch: bool = False,
+        force_actual_name: bool = False,
+        api_version: Optional[str] = None,
+    ) -> AsyncIterator[Dict]:
+        """Yields the assets in a collection one search page at a time.
+
+        Pages with the continuationToken Purview returns (or the offset
+        if there's none), so only one page is in memory at a time.
+
+        Args:
+            collection_name: Collection to list the assets of. Accepts
+                friendly and actual names.
+            filters: Extra search filter combined (and) with the collection.
+                Ex: {"entityType": "azure_datalake_gen2_path"}.
+            page_size: Number of assets returned per search. Max is 1000.
+            fields: If given, only these fields of every asset are yielded.
+                Ex: ["id", "qualifiedName"].
+            prefetch: If True, the next page is requested while the
+                current page is being processed.
+            force_actual_name: Edge Case. If multiple duplicate friendly names
+                and one of the actual names is the name passed in.
+            api_version: Catalog API version.
+                If None, default is "2022-03-01-preview".
+
+        Returns:
+            Async iterator of dictionaries with the asset search results.
+        """
+        if not api_version:
+            api_version = self.catalog_api_version
+
+        tree = await self._get_tree()
+        collection = tree.resolve(collection_name, force_actual_name)
+        friendly_name = tree[collection].friendly_name
+
+        def search(paging: Dict):
+            return self._search_collection_assets(collection, friendly_name, api_version, page_size, filters, **paging)
+
+        offset = 0
+        next_page = asyncio.ensure_future(search({}))
+        try:
+            while next_page is not None:
+                page = await next_page
+                offset += len(page["value"])
+                paging = self._next_asset_paging(page, page_size, offset)
+                next_page = None
+                if paging is not None:
+                    next_page = search(paging)
+                    if prefetch:
+                        next_page = asyncio.ensure_future(next_page)
+                for item in page["value"]:
+                    yield self._project_asset(item, fields)
+        finally:
+            if next_page is not None:
+                if isinstance(next_page, asyncio.Future):
+                    next_page.cancel()
+                else:
+                    next_page.close()
+
+    async def _bulk_delete_assets(self, guids: List[str], semaphore) -> Tuple[List[str], List[str]]:
+        """Internal helper function. Do not call directly.
+
+        Returns the deleted guids and the guids that weren't deleted.
+        """
+        async with semaphore:
+            delete_request = await self._request("DELETE", self._bulk_delete_url(guids))
+        return self._bulk_result(delete_request, guids, "DELETE")
+
+    async def _drain_collection_assets(
+        self,
+        collection: str,
+        friendly_name: str,
+        timeout: int,
+        api_version: str,
+        max_in_flight: int,
+        batch_size: int,
+        page_size: int,
+        max_retries: int,
+        operation: Callable,
+        checkpoint: Optional[DeleteCheckpoint] = None,
+        filters: Optional[Dict] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> Tuple[int, int, bool]:
+        """Internal method. Do not call directly.
+
+        Runs the bulk operation (delete or move) on batches of guids until
+        the search finds no more assets in the collection. Searches for the
+        next page of assets while the previous batches are still running.
+        Guids that fail are retried up to max_retries times. Batches that
+        were in flight when a checkpointed job stopped are sent again first.
+        Their guids aren't retried (the search finds them again if they
+        still exist).
+
+        Returns the number of guids done, failed and if every asset was found.
+        """
+        drain = _AssetDrain(timeout, batch_size, max_retries, progress)
+
+        async def send(batches: List[List[str]]) -> None:
+            for guids in batches:
+                if checkpoint is not None:
+                    await self._run_file_io(checkpoint.add_batch, collection, guids)
+                drain.in_flight[asyncio.ensure_future(operation(guids))] = guids
+
+        async def collect(tasks) -> None:
+            retry = []
+            for task in tasks:
+                guids, retry_guids = drain.finished(task)
+                if checkpoint is not None:
+                    await self._run_file_io(checkpoint.remove_batch, collection, guids)
+                retry.extend(retry_guids)
+            await send(drain.batches(retry))
+
+        async def wait_first() -> None:
+            done, _ = await asyncio.wait(list(drain.in_flight), return_when=asyncio.FIRST_COMPLETED)
+            await collect(done)
+
+        if checkpoint is not None:
+            await send(drain.resume(checkpoint.batches(collection)))
+
+        try:
+            while drain.running():
+                results = await self._search_collection_assets(
+                    collection, friendly_name, api_version, page_size, filters
+                )
+                step, batches = drain.next_step([item["id"] for item in results["value"]])
+                await send(batches)
+                if step == "wait":
+                    await wait_first()
+                elif step == "sleep":
+                    await asyncio.sleep(1)
+
+                while len(drain.in_flight) >= max_in_flight:
+                    await wait_first()
+                await collect(drain.finished_handles())
+
+            while drain.in_flight:
+                done, _ = await asyncio.wait(list(drain.in_flight))
+                await collect(done)
+        finally:
+            for task in drain.in_flight:
+                task.cancel()
+
+        return drain.result()
+
+    async def _purge_collection_assets(
+        self,
+        collection: str,
+        friendly_name: str,
+        timeout: int,
+        api_version: str,
+        semaphore,
+        max_in_flight: int,
+        batch_size: int,
+        page_size: int,
+        max_retries: int,
+        checkpoint: Optional[DeleteCheckpoint] = None,
+    ) -> Dict:
+        """
+        Internal helper function. Do not call directly.
+        """
+        start_time = self._start_purge(friendly_name)
+        deleted, failed, final = await self._drain_collection_assets(
+            collection,
+            friendly_name,
+            timeout,
+            api_version,
+            max_in_flight,
+            batch_size,
+            page_size,
+            max_retries,
+            lambda guids: self._bulk_delete_assets(guids, semaphore),
+            checkpoint,
+        )
+        if final and checkpoint is not None:
+            await self._run_file_io(checkpoint.mark_assets_completed, collection)
+        return self._purge_stats(friendly_name, deleted, failed, final, start_time)
+
+    @instrumented
+    async def delete_collection_assets(
+        self,
+        collection_names: Union[str, List[str]],
+        timeout: int = 30,
+        force_actual_name: bool = False,
+        api_version: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        max_collections: int = 4,
+        batch_size: int = 100,
+        page_size: int = 1000,
+        max_retries: int = 3,
+        checkpoint: Union[str, DeleteCheckpoint, None] = None,
+    ) -> Dict[str, Dict]:
+        """Delete all assets in one or multiple collections.
+
+        Args:
+            collection_names: Collection name or names to delete assets.
+            timeout: How long in minutes before the code times out.
+                Default is 30 minutes.
+            force_actual_name: Edge Case. If multiple duplicate friendly names
+                and one of the actual names is the name passed in.
+            api_version: Catalog API version.
+                If None, default is "2022-03-01-preview".
+            max_workers: Max number of concurrent bulk delete requests
+                (shared by all of the collections). If None, uses the
+                client's max_workers.
+            max_collections: Max number of collections purged at the same time.
+            batch_size: Number of assets deleted per bulk delete request.
+            page_size: Number of assets returned per search. Max is 1000.
+            max_retries: How many times assets that fail to delete are retried.
+            checkpoint: Path of a checkpoint file. Progress is saved to it
+                and running the same call again resumes the purge
+                (collections that were fully purged are skipped). The file
+                is deleted once every asset is deleted.
+
+        Returns:
+            Dictionary with the actual collection name as the key and
+                the number of deleted and failed assets, seconds and
+                assets_per_second as the values.
+        """
+        if not api_version:
+            api_version = self.catalog_api_version
+
+        collection_names = self._collection_names_list(
+            collection_names, "The collection_names parameter has to be a string or list type."
+        )
+        collections = self._purge_targets(await self._get_tree(), collection_names, force_actual_name)
+
+        job_checkpoint, checkpoint, collections = await self._run_file_io(
+            self._purge_checkpoint, checkpoint, collections
+        )
+
+        max_workers = max_workers or self.max_workers
+        semaphore = asyncio.Semaphore(max_workers)
+        collection_semaphore = asyncio.Semaphore(max_collections)
+
+        async def purge(collection: str, friendly_name: str) -> Dict:
+            async with collection_semaphore:
+                return await self._purge_collection_assets(
+                    collection,
+                    friendly_name,
+                    timeout,
+                    api_version,
+                    semaphore,
+                    max_workers * 2,
+                    batch_size,
+                    page_size,
+                    max_retries,
+                    checkpoint,
+                )
+
+        results = await asyncio.gather(*(purge(collection, name) for collection, name in collections.items()))
+        results = dict(zip(collections, results))
+        if job_checkpoint is not None and all(result["completed"] for result in results.values()):
+            await self._run_file_io(job_checkpoint.remove)
+        return results
+
+    async def _bulk_move_assets(
+        self, guids: List[str], target_collection: str, api_version: str, semaphore
+    ) -> Tuple[List[str], List[str]]:
+        """Internal helper function. Do not call directly.
+
+        Returns the moved guids and the guids that weren't moved.
+        """
+        url = self._move_url(target_collection, api_version)
+        async with semaphore:
+            move_request = await self._request("POST", url, data=json.dumps({"entityGuids": guids}))
+        return self._bulk_result(move_request, guids, "UPDATE")
+
+    @instrumented
+    async def move_collection_assets(
+        self,
+        source_collection: str,
+        target_collection: str,
+        filters: Optional[Dict] = None,
+        timeout: int = 30,
+        force_actual_name: bool = False,
+        api_version: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        batch_size: int = 50,
+        page_size: int = 1000,
+        max_retries: int = 3,
+        progress: Optional[Callable[[Dict], None]] = None,
+    ) -> Dict:
+        """Move all assets from one collection to another.
+
+        Args:
+            source_collection: Collection to move the assets from.
+                Accepts friendly and actual names.
+            target_collection: Collection to move the assets to.
+                Accepts friendly and actual names.
+            filters: Extra search filter to only move some of the assets.
+                Ex: {"entityType": "azure_datalake_gen2_path"}.
+            timeout: How long in minutes before the code times out.
+                Default is 30 minutes.
+            force_actual_name: Edge Case. If multiple duplicate friendly names
+                and one of the actual names is the name passed in.
+            api_version: Catalog API version.
+                If None, default is "2022-03-01-preview".
+            max_workers: Max number of concurrent move requests.
+                If None, uses the client's max_workers.
+            batch_size: Number of assets moved per request. Max is 50.
+            page_size: Number of assets returned per search. Max is 1000.
+            max_retries: How many times assets that fail to move are retried.
+            progress: Called after every finished batch with a dictionary
+                with the number of moved and failed assets, seconds and
+                assets_per_second so far.
+
+        Returns:
+            Dictionary with the friendlyName of the source and target
+                collections, the number of moved and failed assets, seconds,
+                assets_per_second and completed (True if every asset was moved).
+
+        Raises:
+            ValueError if batch_size is more than 50.
+        """
+        if not api_version:
+            api_version = self.catalog_api_version
+        if batch_size > 50:
+            raise ValueError("The batch_size can't be more than 50 (the max number of assets per move request).")
+
+        source, target, friendly_name, target_friendly_name, start_time = self._start_move(
+            await self._get_tree(), source_collection, target_collection, force_actual_name
+        )
+        max_workers = max_workers or self.max_workers
+        semaphore = asyncio.Semaphore(max_workers)
+        moved, failed, final = await self._drain_collection_assets(
+            source,
+            friendly_name,
+            timeout,
+            api_version,
+            max_workers * 2,
+            batch_size,
+            page_size,
+            max_retries,
+            lambda guids: self._bulk_move_assets(guids, target, api_version, semaphore),
+            filters=filters,
+            progress=self._move_progress(progress, start_time),
+        )
+        return self._move_stats(friendly_name, target_friendly_name, moved, failed, final, start_time)
+
+    async def _delete_collection(
+        self,
+        name: str,
+        friendly_name: str,
+        api_version: str,
+        delete_assets: bool = False,
+        delete_assets_timeout: int = 30,
+        checkpoint: Optional[DeleteCheckpoint] = None,
+        asset_semaphore: Optional[asyncio.Semaphore] = None,
+        max_in_flight: Optional[int] = None,
+    ) -> Dict:
+        """Internal helper function. Do not call directly.
+
+        Plans pass in the asset_semaphore shared by all of their collections.
+        """
+        if delete_assets and (checkpoint is None or name not in checkpoint.assets_completed):
+            if asset_semaphore is None:
+                await self.delete_collection_assets(
+                    collection_names=name, timeout=delete_assets_timeout, force_actual_name=True, checkpoint=checkpoint
+                )
+            else:
+                await self._purge_collection_assets(
+                    name,
+                    friendly_name,
+                    delete_assets_timeout,
+                    self.catalog_api_version,
+                    asset_semaphore,
+                    max_in_flight,
+                    100,
+                    1000,
+                    3,
+                    checkpoint,
+                )
+
+        delete_collections_request = await self._request("DELETE", self._collection_url(name, api_version))
+        return self._deleted_collection_result(
+            name, friendly_name, delete_collections_request, missing_ok=checkpoint is not None
+        )
+
+    @instrumented
+    async def delete_collections(
+        self,
+        collection_names: Union[str, list],
+        safe_delete: Optional[str] = None,
+        delete_assets: bool = False,
+        delete_assets_timeout: int = 30,
+        force_actual_name: bool = False,
+        api_version: Optional[str] = None,
+    ) -> List[Dict]:
+        """Delete one or more collections.
+
+            Pass in either the actual or friendly collection name.
+            Can't pass in collections that have chidren.
+            Use delete_collection_recursively instead.
+            Nothing is deleted if any of the collections has children.
+
+        Args:
+            collection_names: Collections to be deleted.
+            safe_delete: The client name to be used when printing the safe delete commands.
+            delete_assets: if True, will delete all of the assets from the collection.
+            delete_assets_timeout: If delete_assets is True, this is the timeout for deleting the assets.
+            force_actual_name: Edge Case. If multiple duplicate friendly names
+                and one of the actual names is the name passed in.
+            api_version: If None, default is "2019-11-01-preview".
+
+        Returns:
+            List of dictionaries with the result of every collection
+                (name, friendlyName, status_code and error).
+        """
+        if not api_version:
+            api_version = self.collections_api_version
+
+        collection_names = self._collection_names_list(collection_names)
+
+        plan = await self.plan_delete_collections(collection_names, force_actual_name)
+        if safe_delete:
+            self._safe_delete(
+                collection_names=collection_names, safe_delete_name=safe_delete, tree=await self._get_tree()
+            )
+
+        results = []
+        for action in plan:
+            result = await self._delete_collection(
+                action.name, action.friendly_name, api_version, delete_assets, delete_assets_timeout
+            )
+            results.append({**action.to_dict(), **result})
+        return results
+
+    @instrumented
+    async def delete_collections_recursively(
+        self,
+        collection_names: Union[str, List[str]],
+        safe_delete: Optional[str] = None,
+        also_delete_first_collection: bool = False,
+        delete_assets: bool = False,
+        delete_assets_timeout: int = 30,
+        force_actual_name: bool = False,
+        api_version: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        checkpoint: Optional[str] = None,
+    ) -> List[Dict]:
+        """Delete one or multiple collection hierarchies.
+
+        The hierarchy is worked out once (see plan_delete_collections_recursively)
+        and nothing is deleted if any of the collections has no children.
+        All of the collections without children are deleted concurrently,
+        then their parents and so on up to the start collection.
+
+        Args:
+            collection_names: One or multiple names.
+            safe_delete: Client name to be used when printing
+                the safe delete commands.
+            also_delete_first_collection: Deletes the start collection
+                along with the children collections.
+            delete_assets: if True, will delete all assets from every
+                collection in the hierarchy.
+            delete_assets_timeout: If delete_assets is True,
+                this is the timeout for deleting the assets.
+            force_actual_name: Edge Case. If multiple duplicate
+                friendly names and one of the actual names is the
+                    name passed in.
+            api_version: If None, default is "2019-11-01-preview".
+            max_workers: Max number of collections deleted at the same time.
+                If None, uses the client's max_workers.
+            checkpoint: Path of a checkpoint file. The plan and progress
+                (deleted collections, purged collections and asset batches)
+                are saved to it. Running the same call again resumes the job
+                with the saved plan and settings instead of listing and
+                searching again. The file is deleted once every collection
+                is deleted.
+
+        Returns:
+            List of dictionaries with the result of every collection
+                (name, friendlyName, status_code and error).
+        """
+        if not api_version:
+            api_version = self.collections_api_version
+
+        collection_names = self._collection_names_list(collection_names)
+
+        job, job_checkpoint, saved = await self._run_file_io(
+            self._load_recursive_delete_job, checkpoint, collection_names, also_delete_first_collection
+        )
+        if saved is not None:
+            plan, saved_job = saved
+            delete_assets = saved_job["delete_assets"]
+            delete_assets_timeout = saved_job["delete_assets_timeout"]
+            max_workers = saved_job["max_workers"]
+        else:
+            plan = await self.plan_delete_collections_recursively(
+                collection_names, also_delete_first_collection, force_actual_name
+            )
+            if job_checkpoint is not None:
+                job_settings = {
+                    "delete_assets": delete_assets,
+                    "delete_assets_timeout": delete_assets_timeout,
+                    "max_workers": max_workers or self.max_workers,
+                }
+                await self._run_file_io(job_checkpoint.start, {**job, **job_settings}, plan)
+            if safe_delete:
+                self._print_recursive_safe_delete(
+                    await self._get_tree(),
+                    collection_names,
+                    safe_delete,
+                    also_delete_first_collection,
+                    force_actual_name,
+                )
+
+        results = await self._execute_plan(
+            plan, api_version, max_workers or self.max_workers, delete_assets, delete_assets_timeout, job_checkpoint
+        )
+        if job_checkpoint is not None and all(result["error"] is None for result in results):
+            await self._run_file_io(job_checkpoint.remove)
+        return results
+
+    @instrumented
+    async def extract_collections(
+        self, start_collection_name: str, safe_delete_name: str = "client", api_version: Optional[str] = None
+    ) -> List[str]:
+        """Extract and outputs the collection hierarchy structure.
+
+        Args:
+            start_collection_name: Collection to start on.
+            safe_delete_name:  The client name to be used when printing
+                the safe delete commands. Default is 'client'.
+            api_version: API version to use. If None, default is "2019-11-01-preview".
+
+        Returns:
+            Prints and returns the code to create the collection hierarchy
+                structure starting at the start_collection_name.
+        """
+        return self._extract_collections(await self._get_tree(api_version), start_collection_name, safe_delete_name)
+
+    @instrumented
+    async def export_collections(
+        self, start_collection_name: str, path: Optional[str] = None, api_version: Optional[str] = None
+    ) -> List[Dict]:
+        """Exports the collection and everything under it from one listing.
+
+        Args:
+            start_collection_name: Collection to start on. Accepts friendly
+                and actual names.
+            path: If given, the export is also written to the file.
+                .jsonl files get one collection per line, any other
+                extension gets one JSON list.
+            api_version: API version to use. If None, default is "2019-11-01-preview".
+
+        Returns:
+            List of dictionaries (parents before children) with the name,
+                friendlyName, parentCollection and depth (0 for the
+                start collection) of every collection.
+        """
+        tree = await self._get_tree(api_version)
+        records = export_tree(tree, tree.resolve(start_collection_name))
+        if path is not None:
+            await self._run_file_io(write_export, records, path)
+        return records
+
+    @instrumented
+    async def plan_import_collections(
+        self,
+        source: Union[str, List[Dict]],
+        parent_collection: Optional[str] = None,
+        force_actual_name: bool = False,
+        api_version: Optional[str] = None,
+    ) -> CollectionPlan:
+        """Plans the changes import_collections would make.
+
+        Only lists the collections (or uses the cached listing).
+        Nothing is changed. Run the plan with execute_plan.
+
+        Args:
+            source: Path to a .json or .jsonl export, or the records
+                returned by export_collections.
+            parent_collection: Collection to put the exported start
+                collection under. If None, it keeps its exported parent.
+                Accepts friendly and actual names.
+            force_actual_name: Edge Case. If multiple duplicate friendly names
+                and one of the actual names is the parent_collection.
+            api_version: If None, default is "2019-11-01-preview".
+
+        Returns:
+            CollectionPlan with create and update actions. Empty if every
+                exported collection already exists as exported.
+        """
+        records = await self._run_file_io(read_export, source)
+        tree = await self._get_tree(api_version)
+        return self._plan_import_collections(records, tree, parent_collection, force_actual_name)
+
+    @instrumented
+    async def import_collections(
+        self,
+        source: Union[str, List[Dict]],
+        parent_collection: Optional[str] = None,
+        force_actual_name: bool = False,
+        api_version: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ) -> List[Dict]:
+        """Recreates the collections from export_collections.
+
+        Every depth of the export is created concurrently, parents first.
+        Collections keep their exported actual names. Collections that
+        already exist as exported are skipped.
+
+        Args:
+            source: Path to a .json or .jsonl export, or the records
+                returned by export_collections.
+            parent_collection: Collection to put the exported start
+                collection under. If None, it keeps its exported parent.
+                Accepts friendly and actual names.
+            force_actual_name: Edge Case. If multiple duplicate friendly names
+                and one of the actual names is the parent_collection.
+            api_version: If None, default is "2019-11-01-preview".
+            max_workers: Max number of concurrent requests.
+                If None, uses the client's max_workers.
+
+        Returns:
+            List of dictionaries with the action and result of every
+                created or updated collection (see execute_plan).
+        """
+        if not api_version:
+            api_version = self.collections_api_version
+
+        plan = await self.plan_import_collections(source, parent_collection, force_actual_name, api_version)
+        return await self._execute_plan(plan, api_version, max_workers or self.max_workers)
+
+    async def close(self) -> None:
+        """Closes the transport's pooled connections and the file thread.
+
+        Waits for the queued snapshot file changes to finish.
+        """
+        if self._file_executor is not None:
+            file_executor, self._file_executor = self._file_executor, None
+            await asyncio.get_running_loop().run_in_executor(None, file_executor.shutdown)
+        close = getattr(self.transport, "close", None)
+        if close is not None:
+            await close()
+
+    async def __aenter__(self) -> "AsyncPurviewCollections":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
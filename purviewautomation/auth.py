@@ -1,10 +1,112 @@
-from datetime import datetime
+import abc
+import asyncio
+import threading
+from datetime import datetime, timedelta
+from typing import Optional
 
 import requests
 
+from .token_cache import FileTokenCache
 
-class ServicePrincipalAuthentication:
-    def __init__(self, tenant_id: str, client_id: str, client_secret: str):
+
+class _RefreshingAuthentication(abc.ABC):
+    """Internal base class. Do not use directly.
+
+    Refreshes the access token refresh_margin seconds before it expires.
+    Until the token actually expires, the refresh runs in a background thread
+    and callers keep getting the current token. Concurrent callers share
+    one refresh. If a token_cache is set, processes on the same host share
+    the token too. Subclasses implement _set_access_token and _cache_key.
+    """
+
+    def __init__(self, refresh_margin: float = 300, token_cache: Optional[FileTokenCache] = None) -> None:
+        self.refresh_margin = refresh_margin
+        self.token_cache = token_cache
+        self.access_token = None
+        self.access_token_expiration = datetime.now()
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._refreshing_lock = threading.Lock()
+
+    @abc.abstractmethod
+    def _set_access_token(self) -> None:
+        """Gets a new token and sets access_token and access_token_expiration."""
+
+    @abc.abstractmethod
+    def _cache_key(self) -> str:
+        """Returns the key of the token in the token_cache."""
+
+    def _needs_refresh(self) -> bool:
+        """
+        Internal helper function. Do not call directly.
+        """
+        return self.access_token_expiration - timedelta(seconds=self.refresh_margin) <= datetime.now()
+
+    def _refresh_from_cache(self) -> None:
+        """
+        Internal helper function. Do not call directly.
+        """
+        key = self._cache_key()
+        with self.token_cache.lock():
+            # another process may have already refreshed the token
+            cached = self.token_cache.get(key)
+            if cached is not None:
+                self.access_token, self.access_token_expiration = cached
+                if not self._needs_refresh():
+                    return
+            self._set_access_token()
+            self.token_cache.set(key, self.access_token, self.access_token_expiration)
+
+    def _refresh(self) -> None:
+        """
+        Internal helper function. Do not call directly.
+        """
+        with self._lock:
+            # another thread may have already refreshed the token
+            if self._needs_refresh():
+                if self.token_cache is not None:
+                    self._refresh_from_cache()
+                else:
+                    self._set_access_token()
+
+    def _background_refresh(self) -> None:
+        """
+        Internal helper function. Do not call directly.
+        """
+        try:
+            self._refresh()
+        except Exception:
+            # the token is still valid. If it expires, the next call refreshes it (and raises the error)
+            pass
+        finally:
+            with self._refreshing_lock:
+                self._refreshing = False
+
+    def get_access_token(self) -> str:
+        if self._needs_refresh():
+            if self.access_token is None or self.access_token_expiration <= datetime.now():
+                self._refresh()
+            else:
+                with self._refreshing_lock:
+                    start = not self._refreshing
+                    self._refreshing = True
+                if start:
+                    threading.Thread(target=self._background_refresh, daemon=True).start()
+        return self.access_token
+
+
+class ServicePrincipalAuthentication(_RefreshingAuthentication):
+    def __init__(
+        self,
+        tenant_id: str,
+        client_id: str,
+        client_secret: str,
+        refresh_margin: float = 300,
+        token_cache: Optional[FileTokenCache] = None,
+    ):
+        super().__init__(refresh_margin, token_cache)
+        self.tenant_id = tenant_id
+        self.client_id = client_id
         self.url = f"https://login.microsoftonline.com/{tenant_id}/oauth2/token"
         self.data = {
             "client_id": client_id,
@@ -12,8 +114,6 @@ class ServicePrincipalAuthentication:
             "grant_type": "client_credentials",
             "resource": "https://purview.azure.net",
         }
-        self.access_token = None
-        self.access_token_expiration = datetime.now()
 
     def _set_access_token(self):
         access_token_request = requests.post(url=self.url, data=self.data)
@@ -23,25 +123,97 @@ class ServicePrincipalAuthentication:
         self.access_token = access_token_request.json()["access_token"]
         self.access_token_expiration = datetime.fromtimestamp(int(access_token_request.json()["expires_on"]))
 
-    def get_access_token(self):
-        if self.access_token_expiration <= datetime.now():
-            self._set_access_token()
-        return self.access_token
+    def _cache_key(self) -> str:
+        return f"{self.tenant_id}:{self.client_id}:{self.data['resource']}"
 
 
-class AzIdentityAuthentication:
-    def __init__(self, credential):
+class AzIdentityAuthentication(_RefreshingAuthentication):
+    def __init__(
+        self,
+        credential,
+        refresh_margin: float = 300,
+        token_cache: Optional[FileTokenCache] = None,
+        cache_key: Optional[str] = None,
+    ):
+        # credentials don't expose which identity they sign in as, so a shared token_cache needs
+        # a key per identity. Otherwise another identity's token could be returned.
+        if token_cache is not None and not cache_key:
+            raise ValueError(
+                "A cache_key that identifies the signed in identity (ex: tenant and client id) is required "
+                "when a token_cache is used."
+            )
+        super().__init__(refresh_margin, token_cache)
         self.scope = "73c2949e-da2d-457a-9607-fcc665198967/.default"
         self.credential = credential
-        self.access_token = None
-        self.access_token_expiration = datetime.now()
+        self.cache_key = cache_key
 
     def _set_access_token(self):
         access_token_request = self.credential.get_token(self.scope)
         self.access_token = access_token_request.token
         self.access_token_expiration = datetime.fromtimestamp(access_token_request.expires_on)
 
-    def get_access_token(self):
-        if self.access_token_expiration <= datetime.now():
-            self._set_access_token()
+    def _cache_key(self) -> str:
+        return self.cache_key
+
+
+class AsyncAzIdentityAuthentication:
+    """Async version of AzIdentityAuthentication for AsyncPurviewCollections.
+
+    Refreshes the access token refresh_margin seconds before it expires.
+    Until the token actually expires, the refresh runs in a background task.
+    Concurrent tasks share one refresh.
+
+    Args:
+        credential: An async azure-identity credential
+            (ex: azure.identity.aio.DefaultAzureCredential).
+        refresh_margin: Seconds before the token expires to refresh it.
+    """
+
+    def __init__(self, credential, refresh_margin: float = 300):
+        self.scope = "73c2949e-da2d-457a-9607-fcc665198967/.default"
+        self.credential = credential
+        self.refresh_margin = refresh_margin
+        self.access_token = None
+        self.access_token_expiration = datetime.now()
+        self._lock = None
+        self._refresh_task = None
+
+    async def _set_access_token(self):
+        access_token_request = await self.credential.get_token(self.scope)
+        self.access_token = access_token_request.token
+        self.access_token_expiration = datetime.fromtimestamp(access_token_request.expires_on)
+
+    def _needs_refresh(self) -> bool:
+        """
+        Internal helper function. Do not call directly.
+        """
+        return self.access_token_expiration - timedelta(seconds=self.refresh_margin) <= datetime.now()
+
+    async def _refresh(self) -> None:
+        """
+        Internal helper function. Do not call directly.
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            # another task may have already refreshed the token
+            if self._needs_refresh():
+                await self._set_access_token()
+
+    async def _background_refresh(self) -> None:
+        """
+        Internal helper function. Do not call directly.
+        """
+        try:
+            await self._refresh()
+        except Exception:
+            # the token is still valid. If it expires, the next call refreshes it (and raises the error)
+            pass
+
+    async def get_access_token(self) -> str:
+        if self._needs_refresh():
+            if self.access_token is None or self.access_token_expiration <= datetime.now():
+                await self._refresh()
+            elif self._refresh_task is None or self._refresh_task.done():
+                self._refresh_task = asyncio.ensure_future(self._background_refresh())
         return self.access_token
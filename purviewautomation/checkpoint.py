@@ -0,0 +1,169 @@
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, List, Optional
+
+from .planning import CollectionPlan
+
+
+class DeleteCheckpoint:
+    """Progress of a long running delete job saved in a local file.
+
+    The first line of the file has the job and its plan. Every
+    deleted collection, purged collection and bulk delete batch is
+    appended as one JSON line, so saving progress never rewrites the
+    file. A line cut off when the process died is ignored on load.
+
+    Pass the path into delete_collections_recursively or
+    delete_collection_assets with the checkpoint parameter. Running
+    the same call again with the same path resumes the job.
+
+    Attributes:
+        path: Path of the checkpoint file.
+        job: The job the checkpoint is for (operation and parameters).
+        plan: The collections the job deletes. None for asset purges.
+        completed: Actual names of the deleted collections.
+        assets_completed: Actual names of the collections with
+            every asset deleted.
+        in_flight: Bulk delete batches that were sent but not finished,
+            by collection and first guid of the batch.
+
+    Returns:
+        DeleteCheckpoint object
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        """
+        Internal helper function. Do not call directly.
+        """
+        self.job = None
+        self.plan = None
+        self.completed = set()
+        self.assets_completed = set()
+        self.in_flight = {}
+        self._needs_newline = False
+
+    def load(self) -> bool:
+        """Reads the checkpoint file.
+
+        Returns:
+            True if there's a job to resume. False if the file doesn't exist.
+        """
+        with self._lock:
+            self._reset()
+            try:
+                with open(self.path, encoding="utf-8") as checkpoint_file:
+                    content = checkpoint_file.read()
+            except FileNotFoundError:
+                return False
+            lines = content.splitlines()
+            self._needs_newline = not content.endswith("\n")
+            if not lines:
+                return False
+
+            header = json.loads(lines[0])
+            self.job = header["job"]
+            self.plan = CollectionPlan.from_dicts(header["plan"]) if header["plan"] is not None else None
+            for line in lines[1:]:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # the process died while writing the line
+                    continue
+                self._apply(entry)
+            return True
+
+    def _apply(self, entry: Dict) -> None:
+        """
+        Internal helper function. Do not call directly.
+        """
+        event = entry["event"]
+        if event == "completed":
+            self.completed.add(entry["name"])
+        elif event == "assets_completed":
+            self.assets_completed.add(entry["name"])
+            self.in_flight.pop(entry["name"], None)
+        elif event == "batch":
+            self.in_flight.setdefault(entry["collection"], {})[entry["guids"][0]] = entry["guids"]
+        elif event == "batch_done":
+            self.in_flight.get(entry["collection"], {}).pop(entry["id"], None)
+
+    def start(self, job: Dict, plan: Optional[CollectionPlan] = None) -> None:
+        """Starts a new checkpoint file for the job (replaces any existing file)."""
+        header = {"job": job, "plan": plan.to_dicts() if plan is not None else None}
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            self._reset()
+            self.job = job
+            self.plan = plan
+            file_descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix=".checkpoint.")
+            try:
+                with os.fdopen(file_descriptor, "w", encoding="utf-8") as temp_file:
+                    temp_file.write(json.dumps(header, separators=(",", ":")))
+                    temp_file.write("\n")
+                os.replace(temp_path, self.path)
+            except BaseException:
+                os.remove(temp_path)
+                raise
+
+    def _append(self, entry: Dict) -> None:
+        """
+        Internal helper function. Do not call directly.
+        """
+        with self._lock:
+            self._apply(entry)
+            with open(self.path, "a", encoding="utf-8") as checkpoint_file:
+                if self._needs_newline:
+                    checkpoint_file.write("\n")
+                    self._needs_newline = False
+                checkpoint_file.write(json.dumps(entry, separators=(",", ":")))
+                checkpoint_file.write("\n")
+
+    def check_job(self, job: Dict) -> None:
+        """Raises a ValueError if the checkpoint is for a different job."""
+        if self.job is None or any(self.job.get(key) != value for key, value in job.items()):
+            raise ValueError(
+                f"The checkpoint '{self.path}' is for a different job: {self.job}. "
+                "Use a different checkpoint path or delete the file."
+            )
+
+    def remaining(self) -> CollectionPlan:
+        """Returns the planned collections that aren't deleted yet."""
+        return CollectionPlan(action for action in self.plan or () if action.name not in self.completed)
+
+    def mark_completed(self, name: str) -> None:
+        """Records that the collection was deleted."""
+        self._append({"event": "completed", "name": name})
+
+    def mark_assets_completed(self, name: str) -> None:
+        """Records that every asset of the collection was deleted."""
+        self._append({"event": "assets_completed", "name": name})
+
+    def add_batch(self, collection: str, guids: List[str]) -> None:
+        """Records a bulk delete batch that was sent."""
+        self._append({"event": "batch", "collection": collection, "guids": guids})
+
+    def remove_batch(self, collection: str, guids: List[str]) -> None:
+        """Records that a bulk delete batch finished."""
+        self._append({"event": "batch_done", "collection": collection, "id": guids[0]})
+
+    def batches(self, collection: str) -> List[List[str]]:
+        """Returns the batches of the collection that were sent but not finished."""
+        with self._lock:
+            return list(self.in_flight.get(collection, {}).values())
+
+    def remove(self) -> None:
+        """Deletes the checkpoint file (the job finished)."""
+        with self._lock:
+            self._reset()
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
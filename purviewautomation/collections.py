@@ -1,46 +1,1364 @@
+import json
 import random
 import re
 import string
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
 from pprint import pprint as pretty_print
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
 
 import requests
 
 from .auth import AzIdentityAuthentication, ServicePrincipalAuthentication
+from .checkpoint import DeleteCheckpoint
+from .export import export_tree, plan_import, read_export, write_export
+from .instrumentation import Instrumentation, instrumented, record_request, submit
+from .planning import CollectionAction, CollectionPlan
+from .singleflight import SingleFlight
+from .snapshot import CollectionSnapshot, SnapshotCache
+from .sync import diff_hierarchy, load_hierarchy
+from .transport import HttpTransport
+from .tree import CollectionTree
+
+
+class _AssetDrain:
+    """Bookkeeping of a bulk delete or move, shared by both clients.
+
+    Tracks the batches in flight, the retries and the failed guids and
+    decides what to do after every search. The clients only send the
+    batches, wait for them and write the checkpoint. Do not use directly.
+    """
+
+    def __init__(
+        self,
+        timeout: int,
+        batch_size: int,
+        max_retries: int,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> None:
+        self.deadline = datetime.now() + timedelta(minutes=timeout)
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.progress = progress
+        # batch handle (future or task) -> guids
+        self.in_flight = {}
+        self.attempts = {}
+        self.done = set()
+        self.failed = set()
+        self.resumed = set()
+        self.final = False
+        self.stopped = False
+
+    def running(self) -> bool:
+        """Returns True while there are assets left to search for."""
+        return not self.final and not self.stopped and datetime.now() <= self.deadline
+
+    def resume(self, batches: List[List[str]]) -> List[List[str]]:
+        """Returns the checkpointed batches to send again first.
+
+        Their guids aren't retried (the search finds them again if they
+        still exist).
+        """
+        for guids in batches:
+            self.resumed.update(guids)
+            self._count_attempts(guids)
+        return batches
+
+    def batches(self, guids: List[str]) -> List[List[str]]:
+        """Splits the guids into batches to send."""
+        batches = [guids[index : index + self.batch_size] for index in range(0, len(guids), self.batch_size)]
+        for batch in batches:
+            self._count_attempts(batch)
+        return batches
+
+    def _count_attempts(self, guids: List[str]) -> None:
+        """
+        Internal helper function. Do not call directly.
+        """
+        for guid in guids:
+            self.attempts[guid] = self.attempts.get(guid, 0) + 1
+
+    def next_step(self, guids: List[str]) -> Tuple[str, List[List[str]]]:
+        """Decides what to do with the guids of the latest search.
+
+        Returns the step ("send", "wait", "sleep" or "done") and the
+            batches to send.
+        """
+        in_flight_guids = {guid for batch in self.in_flight.values() for guid in batch}
+        new_guids = [
+            guid for guid in guids if guid not in in_flight_guids and guid not in self.done and guid not in self.failed
+        ]
+        if not guids and not self.in_flight:
+            self.final = True
+            return "done", []
+        if new_guids:
+            return "send", self.batches(new_guids)
+        if self.in_flight:
+            # every asset found is already in a batch
+            return "wait", []
+        if all(guid in self.failed for guid in guids):
+            self.stopped = True
+            return "done", []
+        # deleted or moved assets can show up in the search results for a short time
+        return "sleep", []
+
+    def finished(self, handle) -> Tuple[List[str], List[str]]:
+        """Records a finished batch.
+
+        Returns the guids of the batch and the guids to retry.
+        """
+        guids = self.in_flight.pop(handle)
+        try:
+            succeeded_guids, failed_guids = handle.result()
+        except Exception:
+            succeeded_guids, failed_guids = [], guids
+        self.done.update(succeeded_guids)
+        retry = []
+        for guid in failed_guids:
+            if guid in self.resumed:
+                self.resumed.discard(guid)
+                self.attempts.pop(guid, None)
+            elif self.attempts[guid] <= self.max_retries:
+                retry.append(guid)
+            else:
+                self.failed.add(guid)
+        if self.progress is not None:
+            self.progress(len(self.done), len(self.failed))
+        return guids, retry
+
+    def finished_handles(self) -> List:
+        """Returns the batches in flight that already finished."""
+        return [handle for handle in self.in_flight if handle.done()]
+
+    def result(self) -> Tuple[int, int, bool]:
+        """Returns the number of guids done, failed and if every asset was found."""
+        return len(self.done), len(self.failed), self.final
+
+
+class _PurviewCollectionsBase:
+    """Shared logic of PurviewCollections and AsyncPurviewCollections.
+
+    Nothing in this class calls Purview. Do not use directly.
+    """
+
+    def __init__(
+        self,
+        purview_account_name: str,
+        cache_ttl: float = 30,
+        max_workers: int = 8,
+        instrumentation: Optional[Instrumentation] = None,
+        snapshot_cache: Optional[SnapshotCache] = None,
+    ) -> None:
+        self.purview_account_name = purview_account_name
+        self.collections_endpoint = f"https://{self.purview_account_name}.purview.azure.com/account/collections"
+        self.collections_api_version = "2019-11-01-preview"
+        self.catalog_endpoint = f"https://{self.purview_account_name}.purview.azure.com/catalog"
+        self.catalog_api_version = "2022-03-01-preview"
+        self.cache_ttl = cache_ttl
+        self._cache = {}
+        # api versions whose cached tree was handed out. Those trees are never changed
+        # again: the next write copies the tree and swaps it into the cache (copy-on-write).
+        self._shared_trees = set()
+        self._cache_lock = threading.RLock()
+        self._cache_generation = 0
+        self._tree_fetches = {}
+        self.snapshot_cache = snapshot_cache
+        self._snapshot_saved = False
+        self.max_workers = max_workers
+        self.instrumentation = instrumentation
+
+    def _cache_update(self, collection: Dict) -> None:
+        """
+        Internal helper function. Do not call directly.
+        """
+        with self._cache_lock:
+            for api_version in self._cache:
+                self._writable_tree(api_version).add(collection)
+            for changes in self._tree_fetches.values():
+                changes.append((True, collection))
+            self._drop_snapshot()
+
+    def _cache_remove(self, collection_name: str) -> None:
+        """
+        Internal helper function. Do not call directly.
+        """
+        with self._cache_lock:
+            for api_version in self._cache:
+                self._writable_tree(api_version).remove(collection_name)
+            for changes in self._tree_fetches.values():
+                changes.append((False, collection_name))
+            self._drop_snapshot()
+
+    def _writable_tree(self, api_version: str) -> CollectionTree:
+        """Internal helper function. Do not call directly.
+
+        Returns the cached tree of the api version, copied first if it was
+            handed out to a reader. Call it while holding the cache lock.
+        """
+        loaded_at, tree = self._cache[api_version]
+        if api_version in self._shared_trees:
+            tree = tree.copy()
+            self._cache[api_version] = (loaded_at, tree)
+            self._shared_trees.discard(api_version)
+        return tree
+
+    def refresh(self) -> None:
+        """Clears the cached collections (including the saved snapshot).
+
+        The next call that needs the collections will fetch them
+            from Purview.
+        """
+        with self._cache_lock:
+            self._cache.clear()
+            self._shared_trees.clear()
+            self._cache_generation += 1
+            if self.snapshot_cache is not None:
+                self._write_snapshot(self.snapshot_cache.remove, self.purview_account_name)
+            self._snapshot_saved = False
+
+    def _write_snapshot(self, function: Callable, *args) -> None:
+        """Internal helper function. Do not call directly.
+
+        Runs a change to the snapshot file (set, touch or remove).
+            AsyncPurviewCollections runs it in its file thread instead.
+        """
+        function(*args)
+
+    def _drop_snapshot(self) -> None:
+        """Internal helper function. Do not call directly.
+
+        Deletes the saved snapshot once it no longer matches Purview.
+            Call it while holding the cache lock.
+        """
+        if self.snapshot_cache is not None and self._snapshot_saved:
+            self._write_snapshot(self.snapshot_cache.remove, self.purview_account_name)
+            self._snapshot_saved = False
+
+    def _load_snapshot(self, api_version: str) -> Optional[CollectionSnapshot]:
+        """
+        Internal helper function. Do not call directly.
+        """
+        if self.snapshot_cache is None:
+            return None
+        snapshot = self.snapshot_cache.get(self.purview_account_name, api_version)
+        if snapshot is not None:
+            with self._cache_lock:
+                self._snapshot_saved = True
+        return snapshot
+
+    def _snapshot_headers(self, snapshot: Optional[CollectionSnapshot]) -> Dict[str, str]:
+        """Internal helper function. Do not call directly.
+
+        Returns the headers that make the listing conditional on the snapshot.
+        """
+        headers = {}
+        if snapshot is not None and snapshot.etag:
+            headers["If-None-Match"] = snapshot.etag
+        if snapshot is not None and snapshot.last_modified:
+            headers["If-Modified-Since"] = snapshot.last_modified
+        return headers
+
+    def _response_validators(self, response) -> Tuple[Optional[str], Optional[str]]:
+        """Internal helper function. Do not call directly.
+
+        Returns the ETag and Last-Modified headers of the response.
+        """
+        headers = {key.lower(): value for key, value in response.headers.items()}
+        return headers.get("etag"), headers.get("last-modified")
+
+    def _cached_tree(self, api_version: str) -> Optional[CollectionTree]:
+        """
+        Internal helper function. Do not call directly.
+        """
+        with self._cache_lock:
+            cached = self._cache.get(api_version)
+            if cached is not None and time.monotonic() - cached[0] < self.cache_ttl:
+                self._shared_trees.add(api_version)
+                return cached[1]
+            return None
+
+    def _start_tree_fetch(self) -> Tuple[int, List]:
+        """Internal helper function. Do not call directly.
+
+        Returns the cache generation and the list that collects the
+            collections created or deleted while the fetch is running.
+        """
+        changes = []
+        with self._cache_lock:
+            self._tree_fetches[id(changes)] = changes
+            return self._cache_generation, changes
+
+    def _end_tree_fetch(
+        self,
+        api_version: str,
+        generation: int,
+        changes: List,
+        tree: Optional[CollectionTree],
+        validators: Optional[Tuple[Optional[str], Optional[str]]] = None,
+    ) -> Optional[CollectionTree]:
+        """Internal helper function. Do not call directly.
+
+        Applies the changes made while the collections were fetched and
+            caches the tree unless refresh was called in the meantime.
+            tree is None if the fetch failed. If validators (ETag and
+            Last-Modified) are passed, the listing is saved in the
+            snapshot cache.
+        """
+        with self._cache_lock:
+            del self._tree_fetches[id(changes)]
+            if tree is None:
+                return None
+            if validators is not None and not changes and generation == self._cache_generation:
+                self._write_snapshot(
+                    self.snapshot_cache.set, self.purview_account_name, api_version, tree.collections(), *validators
+                )
+                self._snapshot_saved = True
+            for added, value in changes:
+                if added:
+                    tree.add(value)
+                else:
+                    tree.remove(value)
+            if self.cache_ttl > 0 and generation == self._cache_generation:
+                self._cache[api_version] = (time.monotonic(), tree)
+                self._shared_trees.add(api_version)
+            return tree
+
+    def _verify_collection_name(self, collection_name: str) -> str:
+        """Checks if the collection_name meets the Purview naming requirements.
+
+        Args:
+            collection_name: Name to check.
+
+        Returns:
+            The original collection_name or a random six character
+                lowercase string if requirements are not met.
+        """
+        pattern = "[a-zA-Z0-9]+"
+        collection_check_pattern = re.search(pattern, collection_name)
+        if collection_check_pattern:
+            # returns the name the pattern matched.
+            collection_name_check = collection_check_pattern.group()
+            if len(collection_name) < 3 or len(collection_name) > 36 or (collection_name_check != collection_name):
+                collection_name = "".join(random.choices(string.ascii_lowercase, k=6))
+        else:
+            collection_name = "".join(random.choices(string.ascii_lowercase, k=6))
+        return collection_name
+
+    def _return_updated_collection_name(self, name: str, tree: CollectionTree, parent_collection: str) -> str:
+        """Internal helper function. Do not call directly.
+
+        Returns one of the following:
+        -Actual name if the collection exists in Purview and
+            the parent collection names match.
+        -If the name doesn't exist but meets the Purview naming
+            requirements, returns the name.
+        -If none of the above are returned, returns a random
+            six character lowercase string.
+        """
+        node = tree.get(name)
+        if node is not None and node.parent_name == parent_collection.lower():
+            return name
+
+        friendly_list = tree.find_by_friendly_name(name)
+        if len(friendly_list) == 1 and friendly_list[0].parent_name == parent_collection.lower():
+            name = friendly_list[0].name
+        elif len(friendly_list) == 1 and node is not None:
+            name = "".join(random.choices(string.ascii_lowercase, k=6))
+        elif len(friendly_list) > 1:
+            for friendly_node in friendly_list:
+                if friendly_node.parent_name == parent_collection.lower():
+                    name = friendly_node.name
+                elif friendly_node.name == name:
+                    name = "".join(random.choices(string.ascii_lowercase, k=6))
+        else:
+            name = self._verify_collection_name(name)
+        return name
+
+    def _return_updated_collection_list(
+        self, start_collection: str, collection_list: List[str], tree: CollectionTree
+    ) -> List[str]:
+        """Internal method. Do not call directly.
+
+        Returns a collection list with the collection names
+            used to call other methods.
+        """
+        updated_list = []
+        for index, name in enumerate(collection_list):
+            parent_collection = start_collection if index == 0 else updated_list[index - 1]
+            updated_list.append(self._return_updated_collection_name(name, tree, parent_collection))
+        return updated_list
+
+    def _return_collection_paths(self, collection_names: Union[str, List[str]]) -> List[List[str]]:
+        """Internal method. Do not call directly.
+
+        Splits the collection names into lists of names (one list per path).
+        """
+        if not isinstance(collection_names, (str, list)):
+            err = """The collection_names parameter has
+                     to be a string or list type.
+                  """
+            raise ValueError(err)
+        elif isinstance(collection_names, str):
+            collection_names = [collection_names]
+
+        return [[name.strip() for name in names.split("/")] for names in collection_names]
+
+    def _plan_create_collections(
+        self,
+        start_collection: str,
+        collection_list: List[List[str]],
+        tree: CollectionTree,
+        safe_delete_friendly_name: Optional[str] = None,
+    ) -> CollectionPlan:
+        """Internal method. Do not call directly.
+
+        Returns the collections that need to be created, parents before
+        children. The level is the number of new or existing collections
+        between the collection and the start collection. Every collection's
+        parent is in an earlier level.
+        """
+        with self._cache_lock:
+            planning_tree = tree.copy()
+
+        actions = []
+        planned_names = set()
+        for colls in collection_list:
+            updated_collection_list = self._return_updated_collection_list(start_collection, colls, planning_tree)
+            for index, name in enumerate(updated_collection_list):
+                parent_collection = start_collection if index == 0 else updated_collection_list[index - 1]
+                node = planning_tree.get(name)
+                if node is not None and (node.parent_name or "").lower() == parent_collection.lower():
+                    continue
+
+                friendly_name = colls[index]
+                if index == 0 and safe_delete_friendly_name is not None:
+                    friendly_name = safe_delete_friendly_name
+
+                # later paths resolve their names against the collections planned so far
+                planning_tree.add(
+                    {
+                        "name": name,
+                        "friendlyName": friendly_name,
+                        "parentCollection": {"type": "CollectionReference", "referenceName": parent_collection},
+                    }
+                )
+                depends_on = [parent_collection] if parent_collection in planned_names else []
+                actions.append(CollectionAction("create", name, friendly_name, parent_collection, index, depends_on))
+                planned_names.add(name)
+        return CollectionPlan(actions)
+
+    def _plan_delete_collections(
+        self, collection_names: List[str], tree: CollectionTree, force_actual_name: bool = False
+    ) -> CollectionPlan:
+        """Internal method. Do not call directly.
+
+        Raises an error before anything is deleted if any of the
+        collections has children.
+        """
+        actions = []
+        planned_names = set()
+        for name in collection_names:
+            coll_name = tree.resolve(name, force_actual_name)
+            if tree.children(coll_name):
+                err_msg = (
+                    f"The collection '{name}' has child collections. Can only delete collections that have no children. "
+                    "To delete collections and all of their children recursively, "
+                    f"use: delete_collections_recursively('{name}')"
+                )
+                raise ValueError(err_msg)
+            if coll_name not in planned_names:
+                node = tree[coll_name]
+                actions.append(CollectionAction("delete", coll_name, node.friendly_name, node.parent_name, 0))
+                planned_names.add(coll_name)
+        return CollectionPlan(actions)
+
+    def _plan_delete_collections_recursively(
+        self,
+        collection_names: List[str],
+        tree: CollectionTree,
+        also_delete_first_collection: bool = False,
+        force_actual_name: bool = False,
+    ) -> CollectionPlan:
+        """Internal method. Do not call directly.
+
+        Leaf collections are in level 0, then their parents and so on.
+        Raises an error before anything is deleted if any of the
+        collections has no children.
+        """
+        actions = []
+        planned_names = set()
+        for name in collection_names:
+            coll_name = tree.resolve(name, force_actual_name)
+            if not tree.children(coll_name):
+                err_msg = (
+                    f"The collection '{name}' has no child collections. Can only delete collections that have children. "
+                    "To delete collections with no children, "
+                    f"use: delete_collections('{name}')"
+                )
+                raise ValueError(err_msg)
+
+            levels = tree.leaf_first_levels(coll_name, include_start=also_delete_first_collection)
+            for level, nodes in enumerate(levels):
+                for node in nodes:
+                    if node.name in planned_names:
+                        continue
+                    depends_on = [child.name for child in node.children]
+                    actions.append(
+                        CollectionAction("delete", node.name, node.friendly_name, node.parent_name, level, depends_on)
+                    )
+                    planned_names.add(node.name)
+        actions.sort(key=lambda action: action.level)
+        return CollectionPlan(actions)
+
+    def _plan_sync_collections(
+        self, hierarchy: Dict, tree: CollectionTree, prune: bool = False, force_actual_name: bool = False
+    ) -> CollectionPlan:
+        """Internal method. Do not call directly.
+
+        New collections get their friendly name as the actual name if it
+        meets the Purview naming requirements and isn't taken, otherwise
+        a random six character lowercase string.
+        """
+
+        def new_name(friendly_name: str, taken_names: Set[str]) -> str:
+            name = self._verify_collection_name(friendly_name)
+            while name in taken_names:
+                name = "".join(random.choices(string.ascii_lowercase, k=6))
+            return name
+
+        with self._cache_lock:
+            tree = tree.copy()
+        start_collection = tree.resolve(hierarchy["start_collection"], force_actual_name)
+        return diff_hierarchy(tree, start_collection, hierarchy.get("collections") or [], new_name, prune)
+
+    def _plan_import_collections(
+        self,
+        source: Union[str, List[Dict]],
+        tree: CollectionTree,
+        parent_collection: Optional[str] = None,
+        force_actual_name: bool = False,
+    ) -> CollectionPlan:
+        """
+        Internal helper function. Do not call directly.
+        """
+        records = read_export(source)
+        if parent_collection is not None:
+            parent_collection = tree.resolve(parent_collection, force_actual_name)
+        with self._cache_lock:
+            tree = tree.copy()
+        return plan_import(records, tree, parent_collection)
+
+    def _asset_search_data(
+        self,
+        collection: str,
+        limit: int,
+        filters: Optional[Dict] = None,
+        continuation_token: Optional[str] = None,
+        offset: Optional[int] = None,
+    ) -> str:
+        """
+        Internal helper function. Do not call directly.
+        """
+        search_filter = {"collectionId": collection}
+        if filters:
+            search_filter = {"and": [search_filter, filters]}
+        body = {"keywords": None, "limit": limit, "filter": search_filter}
+        if continuation_token:
+            body["continuationToken"] = continuation_token
+        elif offset:
+            body["offset"] = offset
+        return json.dumps(body)
+
+    def _next_asset_paging(self, page: Dict, page_size: int, offset: int) -> Optional[Dict]:
+        """Internal helper function. Do not call directly.
+
+        Returns the paging parameters of the next search or None after
+        the last page. Uses the continuationToken when Purview returns
+        one, otherwise the offset (offset is the number of assets
+        returned so far).
+        """
+        returned = len(page.get("value") or [])
+        if page.get("continuationToken"):
+            return {"continuation_token": page["continuationToken"]}
+        if returned < page_size or offset >= page.get("@search.count", offset + 1):
+            return None
+        return {"offset": offset}
+
+    def _asset_count_data(self, collections: List[str], filters: Optional[Dict] = None) -> str:
+        """Internal helper function. Do not call directly.
+
+        One search for multiple collections. The count of every collection
+        comes back in the collectionId facet.
+        """
+        if len(collections) == 1:
+            search_filter = {"collectionId": collections[0]}
+        else:
+            search_filter = {"or": [{"collectionId": collection} for collection in collections]}
+        if filters:
+            search_filter = {"and": [search_filter, filters]}
+        body = {
+            "keywords": None,
+            "limit": 1,
+            "filter": search_filter,
+            "facets": [{"facet": "collectionId", "count": len(collections)}],
+        }
+        return json.dumps(body)
+
+    def _asset_counts_from_page(self, collections: List[str], page: Dict) -> Optional[Dict[str, int]]:
+        """Internal helper function. Do not call directly.
+
+        Returns None if the counts can't be read from the facets
+        (then every collection has to be counted on its own).
+        """
+        if len(collections) == 1:
+            return {collections[0]: page.get("@search.count", 0)}
+        facets = (page.get("@search.facets") or {}).get("collectionId")
+        if facets is None:
+            return None
+        names = {collection.lower(): collection for collection in collections}
+        counts = dict.fromkeys(collections, 0)
+        for facet in facets:
+            name = names.get(str(facet.get("value")).lower())
+            if name is not None:
+                counts[name] = facet["count"]
+        return counts
+
+    def _rollup_asset_counts(self, tree: CollectionTree, start_collection: str, counts: Dict[str, int]) -> Dict:
+        """Internal helper function. Do not call directly.
+
+        Adds the subtree total (the collection and every collection
+        under it) to the asset count of every collection.
+        """
+        nodes = list(tree.iter_bfs(start_collection, include_start=True))
+        totals = {}
+        for node in reversed(nodes):
+            totals[node.name] = counts.get(node.name, 0) + sum(totals[child.name] for child in node.children)
+        return {
+            node.name: {
+                "friendlyName": node.friendly_name,
+                "assets": counts.get(node.name, 0),
+                "total": totals[node.name],
+            }
+            for node in nodes
+        }
+
+    def _start_checkpoint(self, path: str, job: Dict) -> DeleteCheckpoint:
+        """Internal helper function. Do not call directly.
+
+        Loads the job saved in the checkpoint file or starts a new one.
+        """
+        checkpoint = DeleteCheckpoint(path)
+        if checkpoint.load():
+            checkpoint.check_job(job)
+        else:
+            checkpoint.start(job)
+        return checkpoint
+
+    def _collection_names_list(
+        self,
+        collection_names: Union[str, List[str]],
+        err: str = "The collection_names parameter has to either be a string or a list.",
+    ) -> List[str]:
+        """
+        Internal helper function. Do not call directly.
+        """
+        if not isinstance(collection_names, (str, list)):
+            raise ValueError(err)
+        elif isinstance(collection_names, str):
+            collection_names = [collection_names]
+        return collection_names
+
+    def _check_collections_response(self, response) -> None:
+        """
+        Internal helper function. Do not call directly.
+        """
+        if response.status_code not in (200, 304):
+            if response.status_code == 403:
+                err_msg = (
+                    "Not authorized. The Service Principal or user would need to be added as a Collection Admin on at "
+                    "least one collection. For more info see: "
+                    "https://learn.microsoft.com/en-us/azure/purview/catalog-permissions"
+                )
+                raise ValueError(err_msg)
+            else:
+                response.raise_for_status()
+
+    def _collections_url(self, api_version: str) -> str:
+        """
+        Internal helper function. Do not call directly.
+        """
+        return f"{self.collections_endpoint}?api-version={api_version}"
+
+    def _collection_url(self, name: str, api_version: str) -> str:
+        """
+        Internal helper function. Do not call directly.
+        """
+        return f"{self.collections_endpoint}/{name}?api-version={api_version}"
+
+    def _child_names_url(self, collection_name: str, api_version: str) -> str:
+        """
+        Internal helper function. Do not call directly.
+        """
+        return f"{self.collections_endpoint}/{collection_name}/getChildCollectionNames?api-version={api_version}"
+
+    def _collection_data(self, friendly_name: str, parent_collection: str) -> str:
+        """
+        Internal helper function. Do not call directly.
+        """
+        return json.dumps({"parentCollection": {"referenceName": parent_collection}, "friendlyName": friendly_name})
+
+    def _list_collections(self, tree: CollectionTree, only_names: bool, pprint: bool) -> Union[List[Dict], Dict]:
+        """
+        Internal helper function. Do not call directly.
+        """
+        collections = tree.names() if only_names else tree.collections()
+        if pprint:
+            pretty_print(collections, sort_dicts=False)
+        return collections
+
+    def _collection_saved(self, response) -> None:
+        """Internal helper function. Do not call directly.
+
+        Adds a created or updated collection to the cache.
+        """
+        if response.status_code in (200, 201):
+            try:
+                self._cache_update(response.json())
+            except (ValueError, KeyError):
+                self.refresh()
+
+    def _print_lines(self, *lines) -> None:
+        """Internal helper function. Do not call directly.
+
+        Prints the lines with one write, so the output of concurrent
+            workers doesn't interleave.
+        """
+        print("".join(f"{line}\n" for line in lines), end="")
+
+    def _planned_collection_result(self, action: CollectionAction, response) -> Dict:
+        """
+        Internal helper function. Do not call directly.
+        """
+        self._print_lines(response.content, "\n")
+        error = None if response.status_code in (200, 201) else response.content.decode(errors="replace")
+        return {**action.to_dict(), "status_code": response.status_code, "error": error}
+
+    def _deleted_collection_result(self, name: str, friendly_name: str, response, missing_ok: bool = False) -> Dict:
+        """Internal helper function. Do not call directly.
+
+        Removes a deleted collection from the cache and returns the result.
+        With missing_ok (resumed checkpoint jobs), a 404 means the collection
+        was deleted before the checkpoint recorded it.
+        """
+        deleted = response.status_code in (200, 204) or (missing_ok and response.status_code == 404)
+        if deleted:
+            self._cache_remove(name)
+        if response.status_code == 404 and deleted:
+            self._print_lines(f"The collection '{friendly_name}' was already deleted", "\n")
+        elif not response.content:
+            self._print_lines(f"The collection '{friendly_name}' was successfully deleted", "\n")
+        else:
+            self._print_lines(response.content)
+
+        error = None
+        if not deleted:
+            error = response.content.decode(errors="replace")
+        return {"name": name, "friendlyName": friendly_name, "status_code": response.status_code, "error": error}
+
+    def _runnable_actions(self, level: List[CollectionAction], failed: Set[str], results: List[Dict]) -> List:
+        """Internal helper function. Do not call directly.
+
+        Returns the actions of the level to run. Actions that depend on a
+            failed action are added to the results as errors (and failed).
+        """
+        runnable = []
+        for action in level:
+            blocked = [name for name in action.depends_on if name in failed]
+            if blocked:
+                failed.add(action.name)
+                results.append({**action.to_dict(), "status_code": None, "error": action.blocked_error(blocked[0])})
+            else:
+                runnable.append(action)
+        return runnable
+
+    def _action_error(self, action: CollectionAction, error: Exception) -> Dict:
+        """
+        Internal helper function. Do not call directly.
+        """
+        return {**action.to_dict(), "status_code": None, "error": str(error)}
+
+    def _search_url(self, api_version: str) -> str:
+        """
+        Internal helper function. Do not call directly.
+        """
+        return f"{self.catalog_endpoint}/api/search/query?api-version={api_version}"
+
+    def _check_search_response(self, response, friendly_name: str) -> Dict:
+        """Internal helper function. Do not call directly.
+
+        Returns the search page.
+        """
+        if response.status_code == 403:
+            err_msg = (
+                f"The Service Principal or user needs to be listed as a Data Curator on collection '{friendly_name}' "
+                "in order to delete assets on that collection."
+            )
+            raise ValueError(err_msg)
+        elif response.status_code != 200:
+            response.raise_for_status()
+        return response.json()
+
+    def _check_count_response(self, response, collections: List[str]) -> Optional[Dict[str, int]]:
+        """Internal helper function. Do not call directly.
+
+        Returns the counts of the collections (see _asset_counts_from_page).
+        """
+        if response.status_code == 403:
+            err_msg = (
+                "The Service Principal or user needs to be listed as a Data Reader on the collections "
+                f"in order to count their assets: {collections}"
+            )
+            raise ValueError(err_msg)
+        elif response.status_code != 200:
+            response.raise_for_status()
+        return self._asset_counts_from_page(collections, response.json())
+
+    def _count_batches(
+        self,
+        tree: CollectionTree,
+        collection_name: str,
+        include_children: bool,
+        force_actual_name: bool,
+        batch_size: int,
+    ) -> Tuple[CollectionTree, str, List[List[str]]]:
+        """Internal helper function. Do not call directly.
+
+        Returns the tree to roll the counts up, the start collection and
+            the batches of collections to count.
+        """
+        start_collection = tree.resolve(collection_name, force_actual_name)
+        if include_children:
+            collections = [node.name for node in tree.iter_bfs(start_collection, include_start=True)]
+        else:
+            collections = [start_collection]
+            tree = CollectionTree([tree[start_collection].raw])
+        batches = [collections[index : index + batch_size] for index in range(0, len(collections), batch_size)]
+        return tree, start_collection, batches
+
+    def _project_asset(self, item: Dict, fields: Optional[List[str]]) -> Dict:
+        """
+        Internal helper function. Do not call directly.
+        """
+        return item if fields is None else {field: item.get(field) for field in fields}
+
+    def _bulk_delete_url(self, guids: List[str]) -> str:
+        """
+        Internal helper function. Do not call directly.
+        """
+        guid_str = "&guid=".join(guids)
+        return f"{self.catalog_endpoint}/api/atlas/v2/entity/bulk?guid={guid_str}"
+
+    def _move_url(self, target_collection: str, api_version: str) -> str:
+        """
+        Internal helper function. Do not call directly.
+        """
+        return f"{self.catalog_endpoint}/api/entity/moveTo?collectionId={target_collection}&api-version={api_version}"
+
+    def _bulk_result(self, response, guids: List[str], mutation: str) -> Tuple[List[str], List[str]]:
+        """Internal helper function. Do not call directly.
+
+        Returns the guids that were changed (DELETE or UPDATE mutation) and
+            the guids that weren't.
+        """
+        if response.status_code != 200:
+            return [], guids
+
+        try:
+            changed = {entity["guid"] for entity in response.json()["mutatedEntities"][mutation]}
+        except (ValueError, KeyError, TypeError):
+            # nothing to report back (ex: the assets were already deleted or moved)
+            return guids, []
+        return [guid for guid in guids if guid in changed], [guid for guid in guids if guid not in changed]
+
+    def _purge_targets(
+        self, tree: CollectionTree, collection_names: List[str], force_actual_name: bool
+    ) -> Dict[str, str]:
+        """Internal helper function. Do not call directly.
+
+        Returns the friendly name of every collection to purge by actual name.
+        """
+        collections = {}
+        for name in collection_names:
+            collection = tree.resolve(name, force_actual_name)
+            collections[collection] = tree[collection].friendly_name
+        return collections
+
+    def _start_purge(self, friendly_name: str) -> float:
+        """Internal helper function. Do not call directly.
+
+        Returns the start time of the purge.
+        """
+        self._print_lines(
+            f"Attempting to delete assets in collection: '{friendly_name}'",
+            "Note: This could take time if there's a large number of assets in the collection",
+        )
+        return time.monotonic()
+
+    def _purge_stats(self, friendly_name: str, deleted: int, failed: int, final: bool, start_time: float) -> Dict:
+        """
+        Internal helper function. Do not call directly.
+        """
+        seconds = time.monotonic() - start_time
+        stats = {
+            "friendlyName": friendly_name,
+            "deleted": deleted,
+            "failed": failed,
+            "seconds": round(seconds, 3),
+            "assets_per_second": round(deleted / seconds, 3) if seconds else 0.0,
+            "completed": final,
+        }
+        if final:
+            status = f"All assets have been successfully deleted from collection: '{friendly_name}'"
+        else:
+            status = f"Not all assets were deleted from collection: '{friendly_name}' ({failed} failed to delete)"
+        self._print_lines(
+            status,
+            f"Deleted {stats['deleted']} assets in {stats['seconds']} seconds ({stats['assets_per_second']} assets/sec)",
+            "\n",
+        )
+        return stats
+
+    def _start_move(
+        self, tree: CollectionTree, source_collection: str, target_collection: str, force_actual_name: bool
+    ) -> Tuple[str, str, str, str, float]:
+        """Internal helper function. Do not call directly.
+
+        Returns the actual and friendly names of the source and target
+            collections and the start time of the move.
+        """
+        source = tree.resolve(source_collection, force_actual_name)
+        target = tree.resolve(target_collection, force_actual_name)
+        friendly_name = tree[source].friendly_name
+        target_friendly_name = tree[target].friendly_name
+        print(f"Attempting to move assets from collection: '{friendly_name}' to '{target_friendly_name}'")
+        print("Note: This could take time if there's a large number of assets in the collection")
+        return source, target, friendly_name, target_friendly_name, time.monotonic()
+
+    def _move_progress(
+        self, progress: Optional[Callable[[Dict], None]], start_time: float
+    ) -> Optional[Callable[[int, int], None]]:
+        """Internal helper function. Do not call directly.
+
+        Returns the callback that reports the move progress to progress.
+        """
+        if progress is None:
+            return None
+
+        def report(moved: int, failed: int) -> None:
+            seconds = time.monotonic() - start_time
+            progress(
+                {
+                    "moved": moved,
+                    "failed": failed,
+                    "seconds": round(seconds, 3),
+                    "assets_per_second": round(moved / seconds, 3) if seconds else 0.0,
+                }
+            )
+
+        return report
+
+    def _move_stats(
+        self, friendly_name: str, target_friendly_name: str, moved: int, failed: int, final: bool, start_time: float
+    ) -> Dict:
+        """
+        Internal helper function. Do not call directly.
+        """
+        seconds = time.monotonic() - start_time
+        stats = {
+            "friendlyName": friendly_name,
+            "targetFriendlyName": target_friendly_name,
+            "moved": moved,
+            "failed": failed,
+            "seconds": round(seconds, 3),
+            "assets_per_second": round(moved / seconds, 3) if seconds else 0.0,
+            "completed": final,
+        }
+        if final:
+            print(f"All assets have been successfully moved from collection: '{friendly_name}'")
+        else:
+            print(f"Not all assets were moved from collection: '{friendly_name}' ({failed} failed to move)")
+        print(f"Moved {moved} assets in {stats['seconds']} seconds ({stats['assets_per_second']} assets/sec)")
+        print("\n")
+        return stats
+
+    def _load_recursive_delete_job(
+        self, path: Optional[str], collection_names: List[str], also_delete_first_collection: bool
+    ) -> Tuple[Dict, Optional[DeleteCheckpoint], Optional[Tuple[CollectionPlan, Dict]]]:
+        """Internal helper function. Do not call directly.
+
+        Returns the job of delete_collections_recursively, its checkpoint
+            (None without a path) and the remaining plan and settings saved
+            in the checkpoint (None if there's no job to resume).
+        """
+        job = {
+            "operation": "delete_collections_recursively",
+            "collection_names": collection_names,
+            "also_delete_first_collection": also_delete_first_collection,
+        }
+        if path is None:
+            return job, None, None
+        job_checkpoint = DeleteCheckpoint(path)
+        if not job_checkpoint.load():
+            return job, job_checkpoint, None
+        job_checkpoint.check_job(job)
+        return job, job_checkpoint, (job_checkpoint.remaining(), job_checkpoint.job)
+
+    def _purge_checkpoint(
+        self, checkpoint: Union[str, DeleteCheckpoint, None], collections: Dict[str, str]
+    ) -> Tuple[Optional[DeleteCheckpoint], Optional[DeleteCheckpoint], Dict[str, str]]:
+        """Internal helper function. Do not call directly.
+
+        Returns the checkpoint of the delete_collection_assets job (None if
+            the checkpoint is part of another job), the checkpoint to record
+            the batches in and the collections that aren't purged yet.
+        """
+        job_checkpoint = None
+        if isinstance(checkpoint, str):
+            job_checkpoint = checkpoint = self._start_checkpoint(
+                checkpoint, {"operation": "delete_collection_assets", "collections": sorted(collections)}
+            )
+        if checkpoint is not None:
+            collections = {
+                collection: friendly_name
+                for collection, friendly_name in collections.items()
+                if collection not in checkpoint.assets_completed
+            }
+        return job_checkpoint, checkpoint, collections
+
+    def _print_recursive_safe_delete(
+        self,
+        tree: CollectionTree,
+        collection_names: List[str],
+        safe_delete: str,
+        also_delete_first_collection: bool,
+        force_actual_name: bool,
+    ) -> None:
+        """
+        Internal helper function. Do not call directly.
+        """
+        for name in collection_names:
+            coll_name = tree.resolve(name, force_actual_name)
+            delete_list = [node.name for node in tree.descendants(coll_name)]
+            self._safe_delete_recursivly(delete_list, safe_delete, coll_name, also_delete_first_collection, tree)
+
+    def _extract_collections(
+        self, tree: CollectionTree, start_collection_name: str, safe_delete_name: str
+    ) -> List[str]:
+        """
+        Internal helper function. Do not call directly.
+        """
+        name = tree.resolve(start_collection_name)
+        collections_list = [node.name for node in tree.descendants(name)]
+        return self._safe_delete_recursivly(collections_list, safe_delete_name, name, True, tree)
+
+    def _safe_delete(
+        self, collection_names: List[str], safe_delete_name: str, tree: Optional[CollectionTree] = None
+    ) -> str:
+        """Helper function. Do not run directly."""
+
+        if tree is None:
+            tree = self._get_tree()
+
+        create_colls_list = []
+        for name in collection_names:
+            if len(collection_names) == 1:
+                collection_name = tree.resolve(name)
+                parent_name = tree[collection_name].parent_name
+                friendly_name = tree[collection_name].friendly_name
+                create_collection_string = (
+                    f"{safe_delete_name}"
+                    f".create_collections(start_collection='{parent_name}', "
+                    f"collection_names='{collection_name}', "
+                    f"safe_delete_friendly_name='{friendly_name}')"
+                )
+
+            else:
+                collection_name = tree.resolve(name)
+                parent_name = tree[collection_name].parent_name
+                friendly_name = tree[collection_name].friendly_name
+                create_collection_string = (
+                    f"create_collections(start_collection='{parent_name}', "
+                    f"collection_names='{collection_name}', "
+                    f"safe_delete_friendly_name='{friendly_name}')"
+                )
+                create_colls_list.append(create_collection_string)
+
+        print("Copy and run the below code in your program to recreate the collection/collections:", "\n")
+        if len(collection_names) == 1:
+            print(create_collection_string)
+            print("\n")
+
+        else:
+            for item in create_colls_list:
+                create_coll_final_string = f"{safe_delete_name}.{item}"
+                print(create_coll_final_string)
+                print("\n")
+
+        print("end of code")
+        print("\n")
+        if len(create_colls_list) >= 1:
+            return create_colls_list
+        else:
+            return create_collection_string
+
+    def _safe_delete_recursivly(
+        self,
+        delete_list: List[str],
+        safe_delete_name: str,
+        parent_name: str,
+        also_delete_first_collection: bool = False,
+        tree: Optional[CollectionTree] = None,
+    ) -> List[str]:
+        initial_list = []
+        clean_list = []
+
+        if tree is None:
+            tree = self._get_tree()
+        print("Copy and run the below code in your program to recreate the", end=" ")
+        print("collections and collection hierarchies:")
+        print("\n")
 
+        for index, name in enumerate(delete_list):
+            if index == 0 or tree[name].parent_name.lower() == parent_name.lower():
+                first_string = f"{safe_delete_name}.create_collections(start_collection='{parent_name}', collection_names='{name}', safe_delete_friendly_name='{tree[name].friendly_name}')"
+                initial_list.append(first_string)
+
+            for child in tree.children(name):
+                initial_list.append(
+                    f"{safe_delete_name}.create_collections(start_collection='{name}', collection_names='{child.name}', safe_delete_friendly_name='{child.friendly_name}')"
+                )
+
+        default_set = set()
+        for item in initial_list:
+            if item not in default_set:
+                default_set.add(item)
+                clean_list.append(item)
+        if also_delete_first_collection:
+            print(
+                f"{safe_delete_name}.create_collections(start_collection='{tree[parent_name].parent_name}', collection_names='{parent_name}', safe_delete_friendly_name='{tree[parent_name].friendly_name}')"
+            )
+        for item in clean_list:
+            print(item)
 
-class PurviewCollections:
+        print("\n")
+        print("end code", "\n")
+        return clean_list
+
+
+class PurviewCollections(_PurviewCollectionsBase):
     """Interact with Purview Collections.
 
     Attributes:
         purview_account_name: Name of the Purview account.
-        auth: Access token automatically generated
-                from the ServicePrincipalAuthentication class.
-        header: Headers to be sent when calling the Purview APIs.
+        authentication: The authentication object passed in.
+        auth: Current access token. Refreshed automatically
+            before it expires.
+        header: Headers to be sent when calling the Purview APIs
+            (with the current access token).
         collections_endpoint: The endpoint when calling collection APIs.
         collections_api_version: API version for the collection APIs.
         catalog_endpoint: The endpoint when calling the catalog APIs.
         catalog_api_version: API version for the catalog APIs.
+        transport: HTTP transport used for every API call. If None,
+            a pooled HttpTransport with 2 * max_workers connections
+            (at least 10) is created.
+        cache_ttl: How long in seconds a collection listing is reused
+            before it's fetched again. Collections created or deleted
+            by this client update the cached listing directly.
+            If 0, every call fetches the collections.
+        max_workers: Default max number of concurrent requests
+            for parallel operations.
+        instrumentation: Receives the timing, status and size of every
+            API call and of every public method call (ex: MetricsCollector).
+            If None, nothing is recorded.
+        snapshot_cache: Saves the collection listing on disk so new
+            processes start without listing the collections (see
+            SnapshotCache). If None, nothing is saved.
 
     Returns:
         PurviewCollections object
     """
 
     def __init__(
-        self, purview_account_name: str, auth: Union[ServicePrincipalAuthentication, AzIdentityAuthentication]
+        self,
+        purview_account_name: str,
+        auth: Union[ServicePrincipalAuthentication, AzIdentityAuthentication],
+        transport: Optional[HttpTransport] = None,
+        cache_ttl: float = 30,
+        max_workers: int = 8,
+        instrumentation: Optional[Instrumentation] = None,
+        snapshot_cache: Optional[SnapshotCache] = None,
     ) -> None:
-        self.purview_account_name = purview_account_name
-        self.auth = auth.get_access_token()
-        self.header = {"Authorization": f"Bearer {self.auth}", "Content-Type": "application/json"}
-        self.collections_endpoint = f"https://{self.purview_account_name}.purview.azure.com/account/collections"
-        self.collections_api_version = "2019-11-01-preview"
-        self.catalog_endpoint = f"https://{self.purview_account_name}.purview.azure.com/catalog"
-        self.catalog_api_version = "2022-03-01-preview"
+        super().__init__(purview_account_name, cache_ttl, max_workers, instrumentation, snapshot_cache)
+        self.authentication = auth
+        self.authentication.get_access_token()
+        self.transport = transport if transport is not None else HttpTransport(pool_maxsize=max(10, 2 * max_workers))
+        self._reads = SingleFlight()
+
+    @property
+    def auth(self) -> str:
+        return self.authentication.get_access_token()
+
+    @property
+    def header(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.auth}", "Content-Type": "application/json"}
+
+    def _request(
+        self, method: str, url: str, data: Optional[str] = None, headers: Optional[Dict[str, str]] = None
+    ) -> requests.Response:
+        """
+        Internal helper function. Do not call directly.
+        """
+        headers = {**self.header, **headers} if headers else self.header
+        if self.instrumentation is None:
+            return self.transport.request(method, url, headers=headers, data=data)
+
+        start = time.perf_counter()
+        try:
+            response = self.transport.request(method, url, headers=headers, data=data)
+        except Exception as e:
+            record_request(self.instrumentation, method, url, data, None, time.perf_counter() - start, e)
+            raise
+        record_request(self.instrumentation, method, url, data, response, time.perf_counter() - start)
+        return response
+
+    def _get_collections_page(self, url: str) -> Dict:
+        """
+        Internal helper function. Do not call directly.
+        """
+        return self._get_collections_response(url).json()
+
+    def _get_collections_response(self, url: str, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """
+        Internal helper function. Do not call directly.
+        """
+        collection_request = self._request("GET", url, headers=headers)
+        self._check_collections_response(collection_request)
+        return collection_request
+
+    def _get_tree(self, api_version: Optional[str] = None) -> CollectionTree:
+        """Internal helper function. Do not call directly.
+
+        Returns the cached collection tree or fetches the collections
+            if the cache is empty or older than cache_ttl. Threads that
+            need the collections while they're fetched share the fetch.
+        """
+        if not api_version:
+            api_version = self.collections_api_version
+
+        tree = self._cached_tree(api_version)
+        if tree is not None:
+            return tree
+        return self._reads.do(("tree", api_version), lambda: self._fetch_tree(api_version))
+
+    def _fetch_tree(self, api_version: str) -> CollectionTree:
+        """
+        Internal helper function. Do not call directly.
+        """
+        generation, changes = self._start_tree_fetch()
+        tree = validators = None
+        try:
+            if self.snapshot_cache is None:
+                tree = CollectionTree(self._iter_collections(api_version=api_version, prefetch=True))
+            else:
+                collections, validators = self._fetch_snapshot_collections(api_version)
+                tree = CollectionTree(collections)
+        finally:
+            self._end_tree_fetch(api_version, generation, changes, tree, validators)
+        return tree
+
+    def _fetch_snapshot_collections(self, api_version: str) -> Tuple[List[Dict], Optional[Tuple]]:
+        """Internal helper function. Do not call directly.
+
+        Returns the collections from the snapshot cache, revalidating or
+            listing them again when the snapshot is too old, and the
+            validators to save (None if the snapshot is still current).
+        """
+        snapshot = self._load_snapshot(api_version)
+        if snapshot is not None and self.snapshot_cache.is_fresh(snapshot):
+            return snapshot.collections, None
+
+        response = self._get_collections_response(self._collections_url(api_version), self._snapshot_headers(snapshot))
+        if response.status_code == 304 and snapshot is not None:
+            self._write_snapshot(self.snapshot_cache.touch, self.purview_account_name, api_version)
+            return snapshot.collections, None
+
+        page = response.json()
+        collections = list(page["value"])
+        while page.get("nextLink"):
+            page = self._get_collections_page(page["nextLink"])
+            collections.extend(page["value"])
+        return collections, self._response_validators(response)
+
+    @instrumented
+    def iter_collections(self, api_version: Optional[str] = None, prefetch: bool = False) -> Iterator[Dict]:
+        """Yields the Purview collections one page at a time.
+
+        Follows the nextLink of every page until all of the collections
+        are returned. Collections are yielded as soon as their page is
+        returned. Always calls Purview (doesn't use the cached collections).
+
+        Args:
+            api_version: If None, default is "2019-11-01-preview".
+            prefetch: If True, the next page is fetched on a background
+                thread while the current page is being processed.
+
+        Returns:
+            Iterator of dictionaries containing the collection info.
+        """
+        yield from self._iter_collections(api_version, prefetch)
 
-    def list_collections(self, only_names: bool = False, pprint: bool = False, api_version: Optional[str] = None):
+    def _iter_collections(self, api_version: Optional[str] = None, prefetch: bool = False) -> Iterator[Dict]:
+        """Internal helper function. Do not call directly.
+
+        Used by iter_collections and to load the cached listing (which is
+        part of the calling operation).
+        """
+        if not api_version:
+            api_version = self.collections_api_version
+
+        url = self._collections_url(api_version)
+        if not prefetch:
+            while url:
+                page = self._get_collections_page(url)
+                url = page.get("nextLink")
+                yield from page["value"]
+            return
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        next_page = submit(executor, self._get_collections_page, url)
+        try:
+            while next_page is not None:
+                page = next_page.result()
+                url = page.get("nextLink")
+                next_page = submit(executor, self._get_collections_page, url) if url else None
+                yield from page["value"]
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+            executor.shutdown(wait=False)
+
+    @instrumented
+    def list_collections(
+        self, only_names: bool = False, pprint: bool = False, api_version: Optional[str] = None
+    ) -> Union[List[Dict], Dict[str, Dict]]:
         """Returns the Purview collections.
 
+        Returns every page of collections (see iter_collections) and
+        reuses the cached collections for up to cache_ttl seconds.
+
         Args:
             only_names: If True, will return only the actual, friendly,
                 and parent collection names.
@@ -56,44 +1374,9 @@ class PurviewCollections:
                 If pprint is True, will print the values to the screen
                     and nothing is returned.
         """
-        if not api_version:
-            api_version = self.collections_api_version
-
-        url = f"{self.collections_endpoint}?api-version={api_version}"
-        collection_request = requests.get(url=url, headers=self.header)
-        if collection_request.status_code != 200:
-            if collection_request.status_code == 403:
-                err_msg = (
-                    "Not authorized. The Service Principal or user would need to be added as a Collection Admin on at "
-                    "least one collection. For more info see: "
-                    "https://learn.microsoft.com/en-us/azure/purview/catalog-permissions"
-                )
-                raise ValueError(err_msg)
-            else:
-                collection_request.raise_for_status()
-
-        collections = collection_request.json()["value"]
-
-        if only_names:
-            coll_dict = {}
-            for coll in collections:
-                if "parentCollection" not in coll:
-                    coll_dict[coll["name"]] = {"friendlyName": coll["friendlyName"], "parentCollection": None}
-                else:
-                    coll_dict[coll["name"]] = {
-                        "friendlyName": coll["friendlyName"],
-                        "parentCollection": coll["parentCollection"]["referenceName"],
-                    }
-            if pprint:
-                pretty_print(coll_dict, sort_dicts=False)
-
-            return coll_dict
-
-        if pprint:
-            pretty_print(collections, sort_dicts=False)
-
-        return collections
+        return self._list_collections(self._get_tree(api_version), only_names, pprint)
 
+    @instrumented
     def get_real_collection_name(
         self, collection_name: str, api_version: Optional[str] = None, force_actual_name: bool = False
     ) -> str:
@@ -118,45 +1401,7 @@ class PurviewCollections:
         if not api_version:
             api_version = self.collections_api_version
 
-        collections = self.list_collections(only_names=True, api_version=api_version)
-        friendly_names = [
-            (name, collections[name]) for name, value in collections.items() if collection_name == value["friendlyName"]
-        ]
-
-        if collection_name not in collections and len(friendly_names) == 0:
-            err_msg = (
-                "collection_name parameter value error. "
-                f"The collection '{collection_name}' either doesn't exist or your don't have permission to start on it. "
-                "If you're trying to create a child collection, would need to be a collection admin on that collection "
-                "if it exists. Name is case sensitive."
-            )
-            raise ValueError(err_msg)
-        elif collection_name not in collections and len(friendly_names) == 1:
-            return friendly_names[0][0]
-        elif collection_name in collections and len(friendly_names) <= 1:
-            return collection_name
-
-        if force_actual_name:
-            for i in range(len(friendly_names)):
-                if friendly_names[i][0] == collection_name:
-                    return collection_name
-        else:
-            multiple_friendly_names = []
-            for item in friendly_names:
-                parent_name = item[1]["parentCollection"]
-                parent_friendly_name = collections[parent_name]["friendlyName"]
-                friendly_output = f"{item[0]}: [collection info: actual_name: {item[0]}, friendlyName: {item[1]['friendlyName']}, parentCollection: {parent_friendly_name}]"
-                multiple_friendly_names.append(friendly_output)
-            newline = "\n"
-            err_msg = (
-                f"Multiple collections exist with the friendly name '{collection_name}'. "
-                f"Please choose and re-enter the first item from one of the options below in place of '{collection_name}': "
-                f"{newline}{newline.join(map(str, multiple_friendly_names))} {newline}"
-                f"If you want to use the collection name '{collection_name}' and it's listed as an option above as "
-                f"a first item (actual_name), add the force_actual_name parameter to True. "
-                "Ex: force_actual_name=True"
-            )
-            raise ValueError(err_msg)
+        return self._get_tree(api_version).resolve(collection_name, force_actual_name)
 
     def _return_request_info(
         self, name: str, friendly_name: str, parent_collection: str, api_version: Optional[str] = None
@@ -167,9 +1412,10 @@ class PurviewCollections:
         if not api_version:
             api_version = self.collections_api_version
 
-        url = f"{self.collections_endpoint}/{name}?api-version={api_version}"
-        data = f'{{"parentCollection": {{"referenceName": "{parent_collection}"}}, "friendlyName": "{friendly_name}"}}'
-        request = requests.put(url=url, headers=self.header, data=data)
+        request = self._request(
+            "PUT", self._collection_url(name, api_version), data=self._collection_data(friendly_name, parent_collection)
+        )
+        self._collection_saved(request)
         return request
 
     def _return_friendly_collection_names(
@@ -178,108 +1424,314 @@ class PurviewCollections:
         """
         Internal helper function. Do not call directly.
         """
-        collections = self.list_collections(only_names=True, api_version=api_version)
-        friendly_names = [
-            (name, collections[name]) for name, value in collections.items() if collection_name == value["friendlyName"]
+        return [
+            (node.name, {"friendlyName": node.friendly_name, "parentCollection": node.parent_name})
+            for node in self._get_tree(api_version).find_by_friendly_name(collection_name)
         ]
-        return friendly_names
 
-    def _verify_collection_name(self, collection_name: str) -> str:
-        """Checks if the collection_name meets the Purview naming requirements.
+    def _create_planned_collection(self, action: CollectionAction, api_version: str) -> Dict:
+        """
+        Internal helper function. Do not call directly.
+        """
+        request = self._return_request_info(
+            name=action.name,
+            friendly_name=action.friendly_name,
+            parent_collection=action.parent_collection,
+            api_version=api_version,
+        )
+        return self._planned_collection_result(action, request)
+
+    def _execute_action(
+        self,
+        action: CollectionAction,
+        api_version: str,
+        delete_assets: bool = False,
+        delete_assets_timeout: int = 30,
+        checkpoint: Optional[DeleteCheckpoint] = None,
+        asset_executor: Optional[ThreadPoolExecutor] = None,
+        max_in_flight: Optional[int] = None,
+    ) -> Dict:
+        """
+        Internal helper function. Do not call directly.
+        """
+        if action.action in ("create", "update"):
+            return self._create_planned_collection(action, api_version)
+        result = self._delete_collection(
+            action.name,
+            action.friendly_name,
+            api_version,
+            delete_assets,
+            delete_assets_timeout,
+            checkpoint,
+            asset_executor,
+            max_in_flight,
+        )
+        if checkpoint is not None and result["error"] is None:
+            checkpoint.mark_completed(action.name)
+        return {**action.to_dict(), **result}
+
+    def _execute_plan(
+        self,
+        plan: CollectionPlan,
+        api_version: str,
+        max_workers: int,
+        delete_assets: bool = False,
+        delete_assets_timeout: int = 30,
+        checkpoint: Optional[DeleteCheckpoint] = None,
+    ) -> List[Dict]:
+        """Internal method. Do not call directly.
+
+        Runs every level of the plan concurrently, lowest level first.
+        Actions that depend on a failed action are skipped. When assets
+        are deleted, every collection shares one pool of max_workers bulk
+        deletes, so at most 2 * max_workers requests run at the same time.
+        """
+        results = []
+        failed = set()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor, ThreadPoolExecutor(
+            max_workers=max_workers
+        ) as asset_executor:
+            for level in plan.levels:
+                futures = []
+                for action in self._runnable_actions(level, failed, results):
+                    future = submit(
+                        executor,
+                        self._execute_action,
+                        action,
+                        api_version,
+                        delete_assets,
+                        delete_assets_timeout,
+                        checkpoint,
+                        asset_executor,
+                        max_workers * 2,
+                    )
+                    futures.append((action, future))
+
+                for action, future in futures:
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = self._action_error(action, e)
+                    if result["error"] is not None:
+                        failed.add(action.name)
+                    results.append(result)
+        return results
+
+    @instrumented
+    def plan_create_collections(
+        self,
+        start_collection: str,
+        collection_names: Union[str, List[str]],
+        force_actual_name: bool = False,
+        api_version: Optional[str] = None,
+        **kwargs,
+    ) -> CollectionPlan:
+        """Plans the collections create_collections would create.
+
+        Only lists the collections (or uses the cached listing).
+        Nothing is created. Run the plan with execute_plan.
 
         Args:
-            collection_name: Name to check.
+            start_collection: Existing collection name. Accepts friendly
+                and actual names.
+            collection_names: collection name or names.
+            force_actual_name: Edge Case. If multiple duplicate friendly names
+                and one of the actual names is the name passed in.
+            api_version: If None, default is "2019-11-01-preview".
+            **kwargs:
+                safe_delete_friendly_name: Used during the safe delete
+                functionality. Don't call directly.
 
         Returns:
-            The original collection_name or a random six character
-                lowercase string if requirements are not met.
+            CollectionPlan with one create action per new collection.
         """
-        pattern = "[a-zA-Z0-9]+"
-        collection_check_pattern = re.search(pattern, collection_name)
-        if collection_check_pattern:
-            # returns the name the pattern matched.
-            collection_name_check = collection_check_pattern.group()
-            if len(collection_name) < 3 or len(collection_name) > 36 or (collection_name_check != collection_name):
-                collection_name = "".join(random.choices(string.ascii_lowercase, k=6))
-        else:
-            collection_name = "".join(random.choices(string.ascii_lowercase, k=6))
-        return collection_name
+        if not api_version:
+            api_version = self.collections_api_version
 
-    def _return_updated_collection_name(
+        tree = self._get_tree(api_version)
+        start_collection = tree.resolve(start_collection, force_actual_name)
+        collection_list = self._return_collection_paths(collection_names)
+        return self._plan_create_collections(
+            start_collection, collection_list, tree, kwargs.get("safe_delete_friendly_name")
+        )
+
+    @instrumented
+    def plan_delete_collections(
         self,
-        name: str,
-        collection_dict: Dict[str, Dict[str, str]],
-        parent_collection: str,
-        friendly_names: List[str],
-        api_version: str,
-    ) -> str:
-        """Internal helper function. Do not call directly.
+        collection_names: Union[str, List[str]],
+        force_actual_name: bool = False,
+        api_version: Optional[str] = None,
+    ) -> CollectionPlan:
+        """Plans the collections delete_collections would delete.
 
-        Returns one of the following:
-        -Actual name if the collection exists in Purview and
-            the parent collection names match.
-        -If the name doesn't exist but meets the Purview naming
-            requirements, returns the name.
-        -If none of the above are returned, returns a random
-            six character lowercase string.
+        Only lists the collections (or uses the cached listing).
+        Nothing is deleted. Run the plan with execute_plan.
+
+        Args:
+            collection_names: Collections to be deleted.
+            force_actual_name: Edge Case. If multiple duplicate friendly names
+                and one of the actual names is the name passed in.
+            api_version: If None, default is "2019-11-01-preview".
+
+        Returns:
+            CollectionPlan with one delete action per collection.
+
+        Raises:
+            ValueError if any of the collections has children.
         """
-        if name in collection_dict and collection_dict[name]["parentCollection"] == parent_collection.lower():
-            return name
-        elif name in friendly_names:
-            friendly_list = self._return_friendly_collection_names(name, api_version)
+        collection_names = self._collection_names_list(collection_names)
 
-            if len(friendly_list) == 1 and friendly_list[0][1]["parentCollection"] == parent_collection.lower():
-                name = friendly_list[0][0]
-            elif len(friendly_list) == 1 and name in collection_dict:
-                name = "".join(random.choices(string.ascii_lowercase, k=6))
+        return self._plan_delete_collections(collection_names, self._get_tree(api_version), force_actual_name)
 
-            elif len(friendly_list) > 1:
-                for collection in friendly_list:
-                    if collection[1]["parentCollection"] == parent_collection.lower():
-                        name = collection[0]
-                    else:
-                        if collection[0] == name:
-                            name = "".join(random.choices(string.ascii_lowercase, k=6))
-            else:
-                name = self._verify_collection_name(name)
-        else:
-            name = self._verify_collection_name(name)
-        return name
+    @instrumented
+    def plan_delete_collections_recursively(
+        self,
+        collection_names: Union[str, List[str]],
+        also_delete_first_collection: bool = False,
+        force_actual_name: bool = False,
+        api_version: Optional[str] = None,
+    ) -> CollectionPlan:
+        """Plans the collections delete_collections_recursively would delete.
 
-    def _return_updated_collection_list(
+        Only lists the collections (or uses the cached listing).
+        Nothing is deleted. Run the plan with execute_plan.
+
+        Args:
+            collection_names: One or multiple names.
+            also_delete_first_collection: Deletes the start collection
+                along with the children collections.
+            force_actual_name: Edge Case. If multiple duplicate friendly names
+                and one of the actual names is the name passed in.
+            api_version: If None, default is "2019-11-01-preview".
+
+        Returns:
+            CollectionPlan with one delete action per collection
+                (leaf collections in the first level).
+
+        Raises:
+            ValueError if any of the collections has no children.
+        """
+        collection_names = self._collection_names_list(collection_names)
+
+        return self._plan_delete_collections_recursively(
+            collection_names, self._get_tree(api_version), also_delete_first_collection, force_actual_name
+        )
+
+    @instrumented
+    def execute_plan(
         self,
-        start_collection: str,
-        collection_list: List[str],
-        collection_dict: Dict[str, Dict],  # Need to check this
-        api_version: str,
-    ) -> List[str]:
-        """Internal method. Do not call directly.
+        plan: CollectionPlan,
+        max_workers: Optional[int] = None,
+        delete_assets: bool = False,
+        delete_assets_timeout: int = 30,
+        api_version: Optional[str] = None,
+    ) -> List[Dict]:
+        """Runs a plan from one of the plan methods.
 
-        Returns a collection list with the collection names
-            used to call other methods.
+        Every level of the plan runs concurrently, lowest level first.
+        Actions that depend on a failed action are skipped.
+
+        Args:
+            plan: The CollectionPlan to run.
+            max_workers: Max number of concurrent requests.
+                If None, uses the client's max_workers.
+            delete_assets: if True, deletes the assets of every collection
+                before it's deleted.
+            delete_assets_timeout: If delete_assets is True,
+                this is the timeout in minutes for deleting the assets.
+            api_version: If None, default is "2019-11-01-preview".
+
+        Returns:
+            List of dictionaries with the action and result of every
+                collection (action, name, friendlyName, parentCollection,
+                level, dependsOn, status_code and error).
         """
-        updated_list = []
-        friendly_names = [v["friendlyName"] for v in collection_dict.values()]
-        for index, name in enumerate(collection_list):
-            if index == 0:
-                name = self._return_updated_collection_name(
-                    name, collection_dict, start_collection, friendly_names, api_version
-                )
-            else:
-                name = self._return_updated_collection_name(
-                    name, collection_dict, updated_list[index - 1], friendly_names, api_version
-                )
-            updated_list.append(name)
-        return updated_list
+        if not api_version:
+            api_version = self.collections_api_version
+
+        return self._execute_plan(
+            plan, api_version, max_workers or self.max_workers, delete_assets, delete_assets_timeout
+        )
+
+    @instrumented
+    def plan_sync_collections(
+        self,
+        hierarchy: Union[str, Dict],
+        prune: bool = False,
+        force_actual_name: bool = False,
+        api_version: Optional[str] = None,
+    ) -> CollectionPlan:
+        """Plans the changes that make Purview match a desired hierarchy.
+
+        Only lists the collections (or uses the cached listing).
+        Nothing is changed. Run the plan with execute_plan.
+
+        Args:
+            hierarchy: Path to a .json, .yaml or .yml file, or a dictionary
+                with the desired collections. See load_hierarchy.
+            prune: If True, collections under the start collection that
+                aren't in the hierarchy are deleted.
+            force_actual_name: Edge Case. If multiple duplicate friendly names
+                and one of the actual names is the start collection.
+            api_version: If None, default is "2019-11-01-preview".
+
+        Returns:
+            CollectionPlan with create, update (rename or move) and delete
+                actions. Empty if Purview already matches the hierarchy.
+        """
+        if not api_version:
+            api_version = self.collections_api_version
+
+        hierarchy = load_hierarchy(hierarchy)
+        return self._plan_sync_collections(hierarchy, self._get_tree(api_version), prune, force_actual_name)
+
+    @instrumented
+    def sync_collections(
+        self,
+        hierarchy: Union[str, Dict],
+        prune: bool = False,
+        force_actual_name: bool = False,
+        api_version: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ) -> List[Dict]:
+        """Creates, renames, moves and (optionally) deletes collections to match a desired hierarchy.
+
+        Only the differences are sent to Purview. Running it again on
+        an account that already matches makes no changes.
+
+        Args:
+            hierarchy: Path to a .json, .yaml or .yml file, or a dictionary
+                with the desired collections. See load_hierarchy.
+            prune: If True, collections under the start collection that
+                aren't in the hierarchy are deleted. Collections with
+                assets can't be deleted.
+            force_actual_name: Edge Case. If multiple duplicate friendly names
+                and one of the actual names is the start collection.
+            api_version: If None, default is "2019-11-01-preview".
+            max_workers: Max number of concurrent requests.
+                If None, uses the client's max_workers.
+
+        Returns:
+            List of dictionaries with the action and result of every
+                changed collection (see execute_plan).
+        """
+        if not api_version:
+            api_version = self.collections_api_version
+
+        plan = self.plan_sync_collections(hierarchy, prune, force_actual_name, api_version)
+        return self._execute_plan(plan, api_version, max_workers or self.max_workers)
 
+    @instrumented
     def create_collections(
         self,
         start_collection: str,
         collection_names: Union[str, List[str]],
         force_actual_name: bool = False,
         api_version: Optional[str] = None,
+        parallel: bool = False,
+        max_workers: Optional[int] = None,
         **kwargs,
-    ) -> None:  # TODO Need to update this
+    ) -> List[Dict]:
         """Create collections.
 
         Can create any of the following:
@@ -297,6 +1749,12 @@ class PurviewCollections:
             force_actual_name: Edge Case. If multiple duplicate friendly names
                 and one of the actual names is the name passed in.
             api_version: If None, default is "2019-11-01-preview".
+            parallel: If True, every level of the new collections is
+                created concurrently (parents are always created
+                before their children). Errors are returned in
+                the results instead of being raised.
+            max_workers: Max number of concurrent requests when parallel
+                is True. If None, uses the client's max_workers.
             **kwargs:
                 safe_delete_friendly_name: Used during the safe delete
                 functionality. Don't call directly.
@@ -304,148 +1762,309 @@ class PurviewCollections:
         Returns:
             Prints the successfully created collection/collections.
                 If the collection/collections already exist, nothing prints.
+            List of dictionaries with the result of every collection
+                that was created (name, friendlyName, parentCollection,
+                level, status_code and error).
         """
         if not api_version:
             api_version = self.collections_api_version
 
-        coll_dict = self.list_collections(only_names=True, api_version=api_version)
-        start_collection = self.get_real_collection_name(start_collection, api_version, force_actual_name)
+        plan = self.plan_create_collections(
+            start_collection, collection_names, force_actual_name, api_version, **kwargs
+        )
+        if parallel:
+            return self._execute_plan(plan, api_version, max_workers or self.max_workers)
 
-        collection_list = []
-        if not isinstance(collection_names, (str, list)):
-            err = """The collection_names parameter has
-                     to be a string or list type.
-                  """
-            raise ValueError(err)
-        elif isinstance(collection_names, str):
-            collection_names = [collection_names]
+        return [self._create_planned_collection(action, api_version) for action in plan]
 
-        collection_names_list = [[name] for name in collection_names]
-        for item in collection_names_list:
-            for name in item:
-                if "/" in name:
-                    names = name.split("/")
-                    names = [name.strip() for name in names]
-                    collection_list.append(names)
-                else:
-                    names = [name.strip() for name in item]
-                    collection_list.append(names)
+    # Delete collections/assets
 
-        for colls in collection_list:
-            updated_collection_list = self._return_updated_collection_list(
-                start_collection, colls, coll_dict, api_version
-            )
-            for index, name in enumerate(updated_collection_list):
-                if index == 0:
-                    if name in coll_dict and coll_dict[name]["parentCollection"].lower() == start_collection.lower():
-                        continue
-                    else:
-                        if "safe_delete_friendly_name" in kwargs:
-                            friendly_name = kwargs["safe_delete_friendly_name"]
-                        else:
-                            friendly_name = colls[index]
-                    try:
-                        request = self._return_request_info(
-                            name=name,
-                            friendly_name=friendly_name,
-                            parent_collection=start_collection,
-                            api_version=api_version,
-                        )
-                        print(request.content)
-                        print("\n")
-                    except Exception as e:
-                        raise e
+    @instrumented
+    def get_child_collection_names(self, collection_name: str, api_version: Optional[str] = None) -> Dict:
+        if not api_version:
+            api_version = self.collections_api_version
 
-                else:
-                    if (
-                        name in coll_dict
-                        and coll_dict[name]["parentCollection"].lower() == updated_collection_list[index - 1].lower()
-                    ):
-                        continue
-                    else:
-                        friendly_name = colls[index]
-                        parent_collection = updated_collection_list[index - 1]
-                    try:
-                        request = self._return_request_info(
-                            name=name,
-                            friendly_name=friendly_name,
-                            parent_collection=parent_collection,
-                            api_version=api_version,
-                        )
-                        print(request.content)
-                        print("\n")
-                    except Exception as e:
-                        raise e
+        url = self._child_names_url(collection_name, api_version)
+        # concurrent calls for the same collection share one request
+        return self._reads.do(("GET", url), lambda: self._request("GET", url).json())
 
-    # Delete collections/assets
+    def _search_collection_assets(
+        self,
+        collection: str,
+        friendly_name: str,
+        api_version: str,
+        limit: int,
+        filters: Optional[Dict] = None,
+        continuation_token: Optional[str] = None,
+        offset: Optional[int] = None,
+    ) -> Dict:
+        """
+        Internal helper function. Do not call directly.
+        """
+        data = self._asset_search_data(collection, limit, filters, continuation_token, offset)
+        asset_request = self._request("POST", self._search_url(api_version), data=data)
+        return self._check_search_response(asset_request, friendly_name)
 
-    def _safe_delete(self, collection_names: List[str], safe_delete_name: str) -> str:
-        """Helper function. Do not run directly."""
+    def _count_assets(self, collections: List[str], api_version: str, filters: Optional[Dict] = None) -> Dict[str, int]:
+        """
+        Internal helper function. Do not call directly.
+        """
+        count_request = self._request(
+            "POST", self._search_url(api_version), data=self._asset_count_data(collections, filters)
+        )
+        counts = self._check_count_response(count_request, collections)
+        if counts is None:
+            counts = {}
+            for collection in collections:
+                counts.update(self._count_assets([collection], api_version, filters))
+        return counts
+
+    @instrumented
+    def count_collection_assets(
+        self,
+        collection_name: str,
+        include_children: bool = True,
+        filters: Optional[Dict] = None,
+        batch_size: int = 50,
+        max_workers: Optional[int] = None,
+        force_actual_name: bool = False,
+        api_version: Optional[str] = None,
+    ) -> Dict[str, Dict]:
+        """Counts the assets in a collection and every collection under it.
 
-        collections = self.list_collections(only_names=True)
+        Collections are counted in batches (one search per batch with the
+        counts in the collectionId facet) and the batches run concurrently.
+        The counts are then added up the hierarchy.
 
-        create_colls_list = []
-        for name in collection_names:
-            if len(collection_names) == 1:
-                collection_name = self.get_real_collection_name(name)
-                parent_name = collections[collection_name]["parentCollection"]
-                friendly_name = collections[collection_name]["friendlyName"]
-                create_collection_string = (
-                    f"{safe_delete_name}"
-                    f".create_collections(start_collection='{parent_name}', "
-                    f"collection_names='{collection_name}', "
-                    f"safe_delete_friendly_name='{friendly_name}')"
-                )
+        Args:
+            collection_name: Collection to start on. Accepts friendly
+                and actual names.
+            include_children: If False, only the collection is counted.
+            filters: Extra search filter combined (and) with the collections.
+                Ex: {"entityType": "azure_datalake_gen2_path"}.
+            batch_size: Number of collections counted per search.
+            max_workers: Max number of concurrent searches.
+                If None, uses the client's max_workers.
+            force_actual_name: Edge Case. If multiple duplicate friendly names
+                and one of the actual names is the name passed in.
+            api_version: Catalog API version.
+                If None, default is "2022-03-01-preview".
 
-            else:
-                collection_name = self.get_real_collection_name(name)
-                parent_name = collections[collection_name]["parentCollection"]
-                friendly_name = collections[collection_name]["friendlyName"]
-                create_collection_string = (
-                    f"create_collections(start_collection='{parent_name}', "
-                    f"collection_names='{collection_name}', "
-                    f"safe_delete_friendly_name='{friendly_name}')"
-                )
-                create_colls_list.append(create_collection_string)
+        Returns:
+            Dictionary with the actual collection name as the key (parents
+                before children) and the friendlyName, assets (in the
+                collection) and total (in the collection and every collection
+                under it) as the values.
+        """
+        if not api_version:
+            api_version = self.catalog_api_version
 
-        print("Copy and run the below code in your program to recreate the collection/collections:", "\n")
-        if len(collection_names) == 1:
-            print(create_collection_string)
-            print("\n")
+        tree, start_collection, batches = self._count_batches(
+            self._get_tree(), collection_name, include_children, force_actual_name, batch_size
+        )
+        counts = {}
+        with ThreadPoolExecutor(max_workers=max_workers or self.max_workers) as executor:
+            futures = [submit(executor, self._count_assets, batch, api_version, filters) for batch in batches]
+            for future in futures:
+                counts.update(future.result())
+        return self._rollup_asset_counts(tree, start_collection, counts)
+
+    @instrumented
+    def iter_collection_assets(
+        self,
+        collection_name: str,
+        filters: Optional[Dict] = None,
+        page_size: int = 1000,
+        fields: Optional[List[str]] = None,
+        prefetch: bool = False,
+        force_actual_name: bool = False,
+        api_version: Optional[str] = None,
+    ) -> Iterator[Dict]:
+        """Yields the assets in a collection one search page at a time.
 
-        else:
-            for item in create_colls_list:
-                create_coll_final_string = f"{safe_delete_name}.{item}"
-                print(create_coll_final_string)
-                print("\n")
+        Pages with the continuationToken Purview returns (or the offset
+        if there's none), so only one page is in memory at a time.
 
-        print("end of code")
-        print("\n")
-        if len(create_colls_list) >= 1:
-            return create_colls_list
-        else:
-            return create_collection_string
+        Args:
+            collection_name: Collection to list the assets of. Accepts
+                friendly and actual names.
+            filters: Extra search filter combined (and) with the collection.
+                Ex: {"entityType": "azure_datalake_gen2_path"}.
+            page_size: Number of assets returned per search. Max is 1000.
+            fields: If given, only these fields of every asset are yielded.
+                Ex: ["id", "qualifiedName"].
+            prefetch: If True, the next page is fetched on a background
+                thread while the current page is being processed.
+            force_actual_name: Edge Case. If multiple duplicate friendly names
+                and one of the actual names is the name passed in.
+            api_version: Catalog API version.
+                If None, default is "2022-03-01-preview".
 
-    def get_child_collection_names(self, collection_name: str, api_version: Optional[str] = None):
+        Returns:
+            Iterator of dictionaries with the asset search results.
+        """
         if not api_version:
-            api_version = self.collections_api_version
+            api_version = self.catalog_api_version
+
+        tree = self._get_tree()
+        collection = tree.resolve(collection_name, force_actual_name)
+        friendly_name = tree[collection].friendly_name
+
+        def search(paging: Dict) -> Dict:
+            return self._search_collection_assets(collection, friendly_name, api_version, page_size, filters, **paging)
 
-        url = f"{self.collections_endpoint}/{collection_name}/getChildCollectionNames?api-version={api_version}"
+        def assets(page: Dict) -> Iterator[Dict]:
+            return (self._project_asset(item, fields) for item in page["value"])
+
+        offset = 0
+        if not prefetch:
+            paging = {}
+            while paging is not None:
+                page = search(paging)
+                offset += len(page["value"])
+                paging = self._next_asset_paging(page, page_size, offset)
+                yield from assets(page)
+            return
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        next_page = submit(executor, search, {})
         try:
-            get_collections_request = requests.get(url=url, headers=self.header)
-        except Exception as e:
-            raise e
-        return get_collections_request.json()
+            while next_page is not None:
+                page = next_page.result()
+                offset += len(page["value"])
+                paging = self._next_asset_paging(page, page_size, offset)
+                next_page = submit(executor, search, paging) if paging is not None else None
+                yield from assets(page)
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+            executor.shutdown(wait=False)
+
+    def _bulk_delete_assets(self, guids: List[str]) -> Tuple[List[str], List[str]]:
+        """Internal helper function. Do not call directly.
 
+        Returns the deleted guids and the guids that weren't deleted.
+        """
+        return self._bulk_result(self._request("DELETE", self._bulk_delete_url(guids)), guids, "DELETE")
+
+    def _drain_collection_assets(
+        self,
+        collection: str,
+        friendly_name: str,
+        timeout: int,
+        api_version: str,
+        executor: ThreadPoolExecutor,
+        max_in_flight: int,
+        batch_size: int,
+        page_size: int,
+        max_retries: int,
+        operation: Callable[[List[str]], Tuple[List[str], List[str]]],
+        checkpoint: Optional[DeleteCheckpoint] = None,
+        filters: Optional[Dict] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> Tuple[int, int, bool]:
+        """Internal method. Do not call directly.
+
+        Runs the bulk operation (delete or move) on batches of guids until
+        the search finds no more assets in the collection. Searches for the
+        next page of assets while the previous batches are still running.
+        Guids that fail are retried up to max_retries times. Batches that
+        were in flight when a checkpointed job stopped are sent again first.
+        Their guids aren't retried (the search finds them again if they
+        still exist).
+
+        Returns the number of guids done, failed and if every asset was found.
+        """
+        drain = _AssetDrain(timeout, batch_size, max_retries, progress)
+
+        def send(batches: List[List[str]]) -> None:
+            for guids in batches:
+                if checkpoint is not None:
+                    checkpoint.add_batch(collection, guids)
+                drain.in_flight[submit(executor, operation, guids)] = guids
+
+        def collect(futures) -> None:
+            retry = []
+            for future in futures:
+                guids, retry_guids = drain.finished(future)
+                if checkpoint is not None:
+                    checkpoint.remove_batch(collection, guids)
+                retry.extend(retry_guids)
+            send(drain.batches(retry))
+
+        if checkpoint is not None:
+            send(drain.resume(checkpoint.batches(collection)))
+
+        while drain.running():
+            results = self._search_collection_assets(collection, friendly_name, api_version, page_size, filters)
+            step, batches = drain.next_step([item["id"] for item in results["value"]])
+            send(batches)
+            if step == "wait":
+                collect(wait(drain.in_flight, return_when=FIRST_COMPLETED).done)
+            elif step == "sleep":
+                time.sleep(1)
+
+            while len(drain.in_flight) >= max_in_flight:
+                collect(wait(drain.in_flight, return_when=FIRST_COMPLETED).done)
+            collect(drain.finished_handles())
+
+        collect(wait(drain.in_flight).done)
+        return drain.result()
+
+    def _purge_collection_assets(
+        self,
+        collection: str,
+        friendly_name: str,
+        timeout: int,
+        api_version: str,
+        executor: ThreadPoolExecutor,
+        max_in_flight: int,
+        batch_size: int,
+        page_size: int,
+        max_retries: int,
+        checkpoint: Optional[DeleteCheckpoint] = None,
+    ) -> Dict:
+        """
+        Internal helper function. Do not call directly.
+        """
+        start_time = self._start_purge(friendly_name)
+        deleted, failed, final = self._drain_collection_assets(
+            collection,
+            friendly_name,
+            timeout,
+            api_version,
+            executor,
+            max_in_flight,
+            batch_size,
+            page_size,
+            max_retries,
+            self._bulk_delete_assets,
+            checkpoint,
+        )
+        if final and checkpoint is not None:
+            checkpoint.mark_assets_completed(collection)
+        return self._purge_stats(friendly_name, deleted, failed, final, start_time)
+
+    @instrumented
     def delete_collection_assets(
         self,
         collection_names: Union[str, List[str]],
         timeout: int = 30,
         force_actual_name: bool = False,
         api_version: Optional[str] = None,
-    ) -> None:
+        max_workers: Optional[int] = None,
+        max_collections: int = 4,
+        batch_size: int = 100,
+        page_size: int = 1000,
+        max_retries: int = 3,
+        checkpoint: Union[str, DeleteCheckpoint, None] = None,
+    ) -> Dict[str, Dict]:
         """Delete all assets in one or multiple collections.
 
+        Searching for the next page of assets overlaps with the
+        bulk deletes of the previous page and multiple delete
+        batches run concurrently.
+
         Args:
             collection_names: Collection name or names to delete assets.
             timeout: How long in minutes before the code times out.
@@ -454,56 +2073,194 @@ class PurviewCollections:
                 and one of the actual names is the name passed in.
             api_version: Catalog API version.
                 If None, default is "2022-03-01-preview".
+            max_workers: Max number of concurrent bulk delete requests
+                (shared by all of the collections). If None, uses the
+                client's max_workers.
+            max_collections: Max number of collections purged at the same time.
+            batch_size: Number of assets deleted per bulk delete request.
+            page_size: Number of assets returned per search. Max is 1000.
+            max_retries: How many times assets that fail to delete are retried.
+            checkpoint: Path of a checkpoint file. Progress is saved to it
+                and running the same call again resumes the purge
+                (collections that were fully purged are skipped). The file
+                is deleted once every asset is deleted.
 
         Returns:
             Prints that the collection assets have been deleted.
+            Dictionary with the actual collection name as the key and
+                the number of deleted and failed assets, seconds and
+                assets_per_second as the values.
         """
         if not api_version:
             api_version = self.catalog_api_version
 
-        if not isinstance(collection_names, (str, list)):
-            err = "The collection_names parameter has to be a string or list type."
-            raise ValueError(err)
-        elif isinstance(collection_names, str):
-            collection_names = [collection_names]
+        collection_names = self._collection_names_list(
+            collection_names, "The collection_names parameter has to be a string or list type."
+        )
+        collections = self._purge_targets(self._get_tree(), collection_names, force_actual_name)
+
+        job_checkpoint, checkpoint, collections = self._purge_checkpoint(checkpoint, collections)
+
+        max_workers = max_workers or self.max_workers
+        with ThreadPoolExecutor(max_workers=max_workers) as delete_executor, ThreadPoolExecutor(
+            max_workers=max_collections
+        ) as collection_executor:
+            futures = {
+                collection: submit(
+                    collection_executor,
+                    self._purge_collection_assets,
+                    collection,
+                    friendly_name,
+                    timeout,
+                    api_version,
+                    delete_executor,
+                    max_workers * 2,
+                    batch_size,
+                    page_size,
+                    max_retries,
+                    checkpoint,
+                )
+                for collection, friendly_name in collections.items()
+            }
+            results = {collection: future.result() for collection, future in futures.items()}
 
-        collections = self.list_collections(only_names=True)
+        if job_checkpoint is not None and all(result["completed"] for result in results.values()):
+            job_checkpoint.remove()
+        return results
 
-        for name in collection_names:
-            collection = self.get_real_collection_name(collection_name=name, force_actual_name=force_actual_name)
-
-            future_timeout_time = datetime.now() + timedelta(minutes=timeout)
-            final = False
-            print(f"Attempting to delete assets in collection: '{collections[collection]['friendlyName']}'")
-            print("Note: This could take time if there's a large number of assets in the collection")
-
-            while not final and datetime.now() <= future_timeout_time:
-                url = f"{self.catalog_endpoint}/api/search/query?api-version={api_version}"
-                # max value is 1000
-                data = f'{{"keywords": null, "limit": 1000, "filter": {{"collectionId": "{collection}"}}}}'
-                asset_request = requests.post(url=url, data=data, headers=self.header)
-
-                if asset_request.status_code == 403:
-                    err_msg = (
-                        f"The Service Principal or user needs to be listed as a Data Curator on collection '{collections[collection]['friendlyName']}' "
-                        "in order to delete assets on that collection."
-                    )
-                    raise ValueError(err_msg)
-
-                results = asset_request.json()
-                total = len(results["value"])
-                if total == 0:
-                    final = True
-                    print(
-                        f"All assets have been successfully deleted from collection: '{collections[collection]['friendlyName']}'"
-                    )
-                    print("\n")
-                else:
-                    guids = [item["id"] for item in results["value"]]
-                    guid_str = "&guid=".join(guids)
-                    url = f"{self.catalog_endpoint}/api/atlas/v2/entity/bulk?guid={guid_str}"
-                    delete_request = requests.delete(url, headers=self.header)
+    def _bulk_move_assets(
+        self, guids: List[str], target_collection: str, api_version: str
+    ) -> Tuple[List[str], List[str]]:
+        """Internal helper function. Do not call directly.
+
+        Returns the moved guids and the guids that weren't moved.
+        """
+        url = self._move_url(target_collection, api_version)
+        move_request = self._request("POST", url, data=json.dumps({"entityGuids": guids}))
+        return self._bulk_result(move_request, guids, "UPDATE")
+
+    @instrumented
+    def move_collection_assets(
+        self,
+        source_collection: str,
+        target_collection: str,
+        filters: Optional[Dict] = None,
+        timeout: int = 30,
+        force_actual_name: bool = False,
+        api_version: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        batch_size: int = 50,
+        page_size: int = 1000,
+        max_retries: int = 3,
+        progress: Optional[Callable[[Dict], None]] = None,
+    ) -> Dict:
+        """Move all assets from one collection to another.
+
+        Searching for the next page of assets overlaps with the
+        moves of the previous page and multiple move batches run
+        concurrently.
 
+        Args:
+            source_collection: Collection to move the assets from.
+                Accepts friendly and actual names.
+            target_collection: Collection to move the assets to.
+                Accepts friendly and actual names.
+            filters: Extra search filter to only move some of the assets.
+                Ex: {"entityType": "azure_datalake_gen2_path"}.
+            timeout: How long in minutes before the code times out.
+                Default is 30 minutes.
+            force_actual_name: Edge Case. If multiple duplicate friendly names
+                and one of the actual names is the name passed in.
+            api_version: Catalog API version.
+                If None, default is "2022-03-01-preview".
+            max_workers: Max number of concurrent move requests.
+                If None, uses the client's max_workers.
+            batch_size: Number of assets moved per request. Max is 50.
+            page_size: Number of assets returned per search. Max is 1000.
+            max_retries: How many times assets that fail to move are retried.
+            progress: Called after every finished batch with a dictionary
+                with the number of moved and failed assets, seconds and
+                assets_per_second so far.
+
+        Returns:
+            Prints that the collection assets have been moved.
+            Dictionary with the friendlyName of the source and target
+                collections, the number of moved and failed assets, seconds,
+                assets_per_second and completed (True if every asset was moved).
+
+        Raises:
+            ValueError if batch_size is more than 50.
+        """
+        if not api_version:
+            api_version = self.catalog_api_version
+        if batch_size > 50:
+            raise ValueError("The batch_size can't be more than 50 (the max number of assets per move request).")
+
+        source, target, friendly_name, target_friendly_name, start_time = self._start_move(
+            self._get_tree(), source_collection, target_collection, force_actual_name
+        )
+
+        def move(guids: List[str]) -> Tuple[List[str], List[str]]:
+            return self._bulk_move_assets(guids, target, api_version)
+
+        max_workers = max_workers or self.max_workers
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            moved, failed, final = self._drain_collection_assets(
+                source,
+                friendly_name,
+                timeout,
+                api_version,
+                executor,
+                max_workers * 2,
+                batch_size,
+                page_size,
+                max_retries,
+                move,
+                filters=filters,
+                progress=self._move_progress(progress, start_time),
+            )
+        return self._move_stats(friendly_name, target_friendly_name, moved, failed, final, start_time)
+
+    def _delete_collection(
+        self,
+        name: str,
+        friendly_name: str,
+        api_version: str,
+        delete_assets: bool = False,
+        delete_assets_timeout: int = 30,
+        checkpoint: Optional[DeleteCheckpoint] = None,
+        asset_executor: Optional[ThreadPoolExecutor] = None,
+        max_in_flight: Optional[int] = None,
+    ) -> Dict:
+        """Internal helper function. Do not call directly.
+
+        Plans pass in the asset_executor shared by all of their collections.
+        """
+        if delete_assets and (checkpoint is None or name not in checkpoint.assets_completed):
+            if asset_executor is None:
+                self.delete_collection_assets(
+                    collection_names=name, timeout=delete_assets_timeout, force_actual_name=True, checkpoint=checkpoint
+                )
+            else:
+                self._purge_collection_assets(
+                    name,
+                    friendly_name,
+                    delete_assets_timeout,
+                    self.catalog_api_version,
+                    asset_executor,
+                    max_in_flight,
+                    100,
+                    1000,
+                    3,
+                    checkpoint,
+                )
+
+        delete_collections_request = self._request("DELETE", self._collection_url(name, api_version))
+        return self._deleted_collection_result(
+            name, friendly_name, delete_collections_request, missing_ok=checkpoint is not None
+        )
+
+    @instrumented
     def delete_collections(
         self,
         collection_names: Union[str, list],
@@ -512,12 +2269,13 @@ class PurviewCollections:
         delete_assets_timeout: int = 30,
         force_actual_name: bool = False,
         api_version: Optional[str] = None,
-    ) -> None:
+    ) -> List[Dict]:
         """Delete one or more collections.
 
             Pass in either the actual or friendly collection name.
             Can't pass in collections that have chidren.
             Use delete_collection_recursively instead.
+            Nothing is deleted if any of the collections has children.
 
         Args:
             collection_names: Collections to be deleted.
@@ -531,106 +2289,21 @@ class PurviewCollections:
 
         Returns:
             Ouptuts to the screen the collection has been deleted.
+            List of dictionaries with the result of every collection
+                (name, friendlyName, status_code and error).
         """
         if not api_version:
             api_version = self.collections_api_version
 
-        if not isinstance(collection_names, (str, list)):
-            raise ValueError("The collection_names parameter has to either be a string or a list.")
-        elif isinstance(collection_names, str):
-            collection_names = [collection_names]
+        collection_names = self._collection_names_list(collection_names)
 
+        plan = self.plan_delete_collections(collection_names, force_actual_name)
         if safe_delete:
             self._safe_delete(collection_names=collection_names, safe_delete_name=safe_delete)
 
-        for name in collection_names:
-            coll_name = self.get_real_collection_name(collection_name=name, force_actual_name=force_actual_name)
-            child_collections_check = self.get_child_collection_names(coll_name)
-            if child_collections_check["count"] > 0:
-                err_msg = (
-                    f"The collection '{name}' has child collections. Can only delete collections that have no children. "
-                    "To delete collections and all of their children recursively, "
-                    f"use: delete_collections_recursively('{name}')"
-                )
-                raise ValueError(err_msg)
-
-            url = f"{self.collections_endpoint}/{coll_name}?api-version={api_version}"
-            try:
-                colls = self.list_collections(only_names=True)
-                friendly_name = colls[coll_name]["friendlyName"]
-                if delete_assets:
-                    self.delete_collection_assets(collection_names=coll_name, timeout=delete_assets_timeout)
-                delete_collections_request = requests.delete(url=url, headers=self.header)
-                if not delete_collections_request.content:
-                    print(f"The collection '{friendly_name}' was successfully deleted")
-                    print("\n")
-                else:
-                    print(delete_collections_request.content)
-            except Exception as e:
-                raise e
-
-    def _recursive_append(self, name: str, append_list: List[Union[str, None]]):
-        """Internal method. Do not call directly."""
-
-        child_collections = self.get_child_collection_names(name)
-        if child_collections["count"] == 0:
-            append_list.append(None)
-        elif child_collections["count"] == 1:
-            append_list.append(child_collections["value"][0]["name"])
-        elif child_collections["count"] > 1:
-            for v in child_collections.values():
-                if isinstance(v, list):
-                    for index, name in enumerate(v):
-                        append_list.append(v[index]["name"])
-
-    def _safe_delete_recursivly(
-        self,
-        delete_list: List[str],
-        safe_delete_name: str,
-        parent_name: str,
-        also_delete_first_collection: bool = False,
-    ) -> List[str]:
-        initial_list = []
-        clean_list = []
-
-        collections = self.list_collections(only_names=True)
-        print("Copy and run the below code in your program to recreate the", end=" ")
-        print("collections and collection hierarchies:")
-        print("\n")
-
-        for index, name in enumerate(delete_list):
-            if index == 0 or collections[name]["parentCollection"].lower() == parent_name.lower():
-                first_string = f"{safe_delete_name}.create_collections(start_collection='{parent_name}', collection_names='{name}', safe_delete_friendly_name='{collections[name]['friendlyName']}')"
-                initial_list.append(first_string)
-
-            child_test = self.get_child_collection_names(name)
-            if child_test["count"] == 1:
-                initial_list.append(
-                    f"{safe_delete_name}.create_collections(start_collection='{name}', collection_names='{child_test['value'][0]['name']}', safe_delete_friendly_name='{child_test['value'][0]['friendlyName']}')"
-                )
-
-            elif child_test["count"] > 1:
-                for index, name2 in enumerate(child_test["value"]):
-                    initial_list.append(
-                        f"{safe_delete_name}.create_collections(start_collection='{name}', collection_names='{name2['name']}', safe_delete_friendly_name='{name2['friendlyName']}')"
-                    )
-
-        default_set = set()
-        for item in initial_list:
-            if item not in default_set:
-                default_set.add(item)
-                clean_list.append(item)
-        if also_delete_first_collection:
-            print(
-                f"{safe_delete_name}.create_collections(start_collection='{collections[parent_name]['parentCollection']}', collection_names='{parent_name}', safe_delete_friendly_name='{collections[parent_name]['friendlyName']}')"
-            )
-        for item in clean_list:
-            print(item)
-
-        print("\n")
-        print("end code", "\n")
-        return clean_list
+        return [self._execute_action(action, api_version, delete_assets, delete_assets_timeout) for action in plan]
 
+    @instrumented
     def delete_collections_recursively(
         self,
         collection_names: Union[str, List[str]],
@@ -640,9 +2313,16 @@ class PurviewCollections:
         delete_assets_timeout: int = 30,
         force_actual_name: bool = False,
         api_version: Optional[str] = None,
-    ) -> None:  # TODO need to update this and add force_actual_name
+        max_workers: Optional[int] = None,
+        checkpoint: Optional[str] = None,
+    ) -> List[Dict]:
         """Delete one or multiple collection hierarchies.
 
+        The hierarchy is worked out once (see plan_delete_collections_recursively)
+        and nothing is deleted if any of the collections has no children.
+        All of the collections without children are deleted concurrently,
+        then their parents and so on up to the start collection.
+
         Args:
             collection_names: One or multiple names.
             safe_delete: Client name to be used when printing
@@ -658,61 +2338,62 @@ class PurviewCollections:
                 this is the timeout for deleting the assets.
                 If None, the default is 30 minutes.
             api_version: If None, default is "2019-11-01-preview".
+            max_workers: Max number of collections deleted at the same time.
+                If None, uses the client's max_workers.
+            checkpoint: Path of a checkpoint file. The plan and progress
+                (deleted collections, purged collections and asset batches)
+                are saved to it. Running the same call again resumes the job
+                with the saved plan and settings instead of listing and
+                searching again. The file is deleted once every collection
+                is deleted.
 
         Returns:
-            None. Will print out the collections being deleted.
+            Prints out the collections being deleted.
+            List of dictionaries with the result of every collection
+                (name, friendlyName, status_code and error). Collections
+                that still have children after a failed delete are skipped.
         """
         if not api_version:
             api_version = self.collections_api_version
 
-        if not isinstance(collection_names, (str, list)):
-            raise ValueError("The collection_names parameter has to either be a string or a list.")
-        elif isinstance(collection_names, str):
-            collection_names = [collection_names]
+        collection_names = self._collection_names_list(collection_names)
 
-        for name in collection_names:
-            delete_list = []
-            recursive_list = []
-            coll_name = self.get_real_collection_name(name, force_actual_name=force_actual_name)
-            child_collections_check = self.get_child_collection_names(coll_name)
-            if child_collections_check["count"] == 0:
-                err_msg = (
-                    f"The collection '{name}' has no child collections. Can only delete collections that have children. "
-                    "To delete collections with no children, "
-                    f"use: delete_collections('{name}')"
+        job, job_checkpoint, saved = self._load_recursive_delete_job(
+            checkpoint, collection_names, also_delete_first_collection
+        )
+        if saved is not None:
+            plan, saved_job = saved
+            delete_assets = saved_job["delete_assets"]
+            delete_assets_timeout = saved_job["delete_assets_timeout"]
+            max_workers = saved_job["max_workers"]
+        else:
+            plan = self.plan_delete_collections_recursively(
+                collection_names, also_delete_first_collection, force_actual_name
+            )
+            if job_checkpoint is not None:
+                job_settings = {
+                    "delete_assets": delete_assets,
+                    "delete_assets_timeout": delete_assets_timeout,
+                    "max_workers": max_workers or self.max_workers,
+                }
+                job_checkpoint.start({**job, **job_settings}, plan)
+            if safe_delete:
+                self._print_recursive_safe_delete(
+                    self._get_tree(), collection_names, safe_delete, also_delete_first_collection, force_actual_name
                 )
-                raise ValueError(err_msg)
-
-            self._recursive_append(coll_name, delete_list)
-            if delete_list[0] is not None:
-                for item in delete_list:
-                    self._recursive_append(item, recursive_list)
-                for item2 in recursive_list:
-                    if item2 is not None:
-                        delete_list.append(item2)
-                        self._recursive_append(item2, recursive_list)
 
-            if safe_delete:
-                if also_delete_first_collection:
-                    self._safe_delete_recursivly(delete_list, safe_delete, coll_name, True)
-                else:
-                    self._safe_delete_recursivly(delete_list, safe_delete, coll_name)
-
-            if delete_list[0] is not None:
-                if also_delete_first_collection:
-                    delete_list.insert(0, collection_names[0])
-                for coll in delete_list[::-1]:  # starting from the most child collection
-                    if delete_assets:
-                        remove_duplicate_names = []
-                        if coll not in remove_duplicate_names:
-                            remove_duplicate_names.append(coll)
-                        for coll in remove_duplicate_names:
-                            self.delete_collection_assets(collection_names=coll, timeout=delete_assets_timeout)
-                    self.delete_collections([coll])
+        # starting from the most child collection
+        results = self._execute_plan(
+            plan, api_version, max_workers or self.max_workers, delete_assets, delete_assets_timeout, job_checkpoint
+        )
+        if job_checkpoint is not None and all(result["error"] is None for result in results):
+            job_checkpoint.remove()
+        return results
 
+    @instrumented
     def extract_collections(
         self, start_collection_name: str, safe_delete_name: str = "client", api_version: Optional[str] = None
-    ) -> None:
+    ) -> List[str]:
         """Extract and outputs the collection hierarchy structure.
 
         Args:
@@ -722,25 +2403,98 @@ class PurviewCollections:
             api_version: API version to use. If None, default is "2019-11-01-preview".
 
         Returns:
-            None. Will print out the script to create the collection hierarchy structure
-            starting at the start_collection_name.
+            Prints and returns the code to create the collection hierarchy
+                structure starting at the start_collection_name.
+        """
+        return self._extract_collections(self._get_tree(api_version), start_collection_name, safe_delete_name)
+
+    @instrumented
+    def export_collections(
+        self, start_collection_name: str, path: Optional[str] = None, api_version: Optional[str] = None
+    ) -> List[Dict]:
+        """Exports the collection and everything under it from one listing.
+
+        Args:
+            start_collection_name: Collection to start on. Accepts friendly
+                and actual names.
+            path: If given, the export is also written to the file.
+                .jsonl files get one collection per line, any other
+                extension gets one JSON list.
+            api_version: API version to use. If None, default is "2019-11-01-preview".
+
+        Returns:
+            List of dictionaries (parents before children) with the name,
+                friendlyName, parentCollection and depth (0 for the
+                start collection) of every collection.
+        """
+        tree = self._get_tree(api_version)
+        records = export_tree(tree, tree.resolve(start_collection_name))
+        if path is not None:
+            write_export(records, path)
+        return records
+
+    @instrumented
+    def plan_import_collections(
+        self,
+        source: Union[str, List[Dict]],
+        parent_collection: Optional[str] = None,
+        force_actual_name: bool = False,
+        api_version: Optional[str] = None,
+    ) -> CollectionPlan:
+        """Plans the changes import_collections would make.
+
+        Only lists the collections (or uses the cached listing).
+        Nothing is changed. Run the plan with execute_plan.
+
+        Args:
+            source: Path to a .json or .jsonl export, or the records
+                returned by export_collections.
+            parent_collection: Collection to put the exported start
+                collection under. If None, it keeps its exported parent.
+                Accepts friendly and actual names.
+            force_actual_name: Edge Case. If multiple duplicate friendly names
+                and one of the actual names is the parent_collection.
+            api_version: If None, default is "2019-11-01-preview".
+
+        Returns:
+            CollectionPlan with create and update actions. Empty if every
+                exported collection already exists as exported.
+        """
+        return self._plan_import_collections(source, self._get_tree(api_version), parent_collection, force_actual_name)
+
+    @instrumented
+    def import_collections(
+        self,
+        source: Union[str, List[Dict]],
+        parent_collection: Optional[str] = None,
+        force_actual_name: bool = False,
+        api_version: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ) -> List[Dict]:
+        """Recreates the collections from export_collections.
+
+        Every depth of the export is created concurrently, parents first.
+        Collections keep their exported actual names. Collections that
+        already exist as exported are skipped.
+
+        Args:
+            source: Path to a .json or .jsonl export, or the records
+                returned by export_collections.
+            parent_collection: Collection to put the exported start
+                collection under. If None, it keeps its exported parent.
+                Accepts friendly and actual names.
+            force_actual_name: Edge Case. If multiple duplicate friendly names
+                and one of the actual names is the parent_collection.
+            api_version: If None, default is "2019-11-01-preview".
+            max_workers: Max number of concurrent requests.
+                If None, uses the client's max_workers.
+
+        Returns:
+            List of dictionaries with the action and result of every
+                created or updated collection (see execute_plan).
         """
         if not api_version:
             api_version = self.collections_api_version
 
-        collections_list = []
-        recursive_list = []
-
-        start_collection_name = [start_collection_name]
-        for name in start_collection_name:
-            name = self.get_real_collection_name(name)
-            self._recursive_append(name, collections_list)
-            if collections_list[0] is not None:
-                for item in collections_list:
-                    self._recursive_append(item, recursive_list)
-                for item2 in recursive_list:
-                    if item2 is not None:
-                        collections_list.append(item2)
-                        self._recursive_append(item2, recursive_list)
-
-        self._safe_delete_recursivly(collections_list, safe_delete_name, name, True)
+        plan = self.plan_import_collections(source, parent_collection, force_actual_name, api_version)
+        return self._execute_plan(plan, api_version, max_workers or self.max_workers)
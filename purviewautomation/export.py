@@ -0,0 +1,125 @@
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Union
+
+from .planning import CollectionAction, CollectionPlan, assign_levels
+from .tree import CollectionTree
+
+_FIELDS = ("name", "friendlyName", "parentCollection", "depth")
+
+
+def export_tree(tree: CollectionTree, start_collection: str) -> List[Dict]:
+    """Returns the collection and everything under it as export records.
+
+    Args:
+        tree: Current collections.
+        start_collection: Actual name of the collection to start on.
+
+    Returns:
+        List of dictionaries (parents before children) with the name,
+            friendlyName, parentCollection (actual name) and depth
+            (0 for the start collection).
+    """
+    depths = {start_collection: 0}
+    records = []
+    for node in tree.iter_bfs(start_collection, include_start=True):
+        depth = depths[node.name]
+        for child in node.children:
+            depths[child.name] = depth + 1
+        records.append(
+            {
+                "name": node.name,
+                "friendlyName": node.friendly_name,
+                "parentCollection": node.parent_name,
+                "depth": depth,
+            }
+        )
+    return records
+
+
+def write_export(records: Iterable[Dict], path: Union[str, os.PathLike]) -> None:
+    """Writes export records to a file.
+
+    Args:
+        records: Records from export_tree.
+        path: .jsonl files get one record per line. Any other
+            extension gets one JSON list.
+    """
+    with open(path, "w", encoding="utf-8") as export_file:
+        if str(path).endswith(".jsonl"):
+            for record in records:
+                export_file.write(json.dumps(record, separators=(",", ":")))
+                export_file.write("\n")
+        else:
+            json.dump(list(records), export_file, indent=2)
+
+
+def read_export(source: Union[str, os.PathLike, List[Dict]]) -> List[Dict]:
+    """Reads and validates export records.
+
+    Args:
+        source: Path to a .json or .jsonl export, or the records.
+
+    Returns:
+        The records sorted by depth.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding="utf-8") as export_file:
+            if str(source).endswith(".jsonl"):
+                records = [json.loads(line) for line in export_file if line.strip()]
+            else:
+                records = json.load(export_file)
+    else:
+        records = list(source)
+
+    for record in records:
+        if not isinstance(record, dict) or any(field not in record for field in _FIELDS):
+            raise ValueError(f"Every record needs a name, friendlyName, parentCollection and depth. Invalid: {record}")
+    return sorted(records, key=lambda record: record["depth"])
+
+
+def plan_import(records: List[Dict], tree: CollectionTree, parent_collection: Optional[str] = None) -> CollectionPlan:
+    """Returns the changes that recreate the exported collections.
+
+    Args:
+        records: Records from read_export (sorted by depth).
+        tree: Current collections.
+        parent_collection: Actual name of the collection the top
+            records (depth 0) are put under. If None, they keep
+            their exported parent.
+
+    Returns:
+        CollectionPlan with a create action per missing collection and an
+            update action per collection with a different friendly name or
+            parent. Collections that already match are skipped.
+
+    Raises:
+        ValueError if a parent is neither in Purview nor in the records.
+    """
+    top_depth = records[0]["depth"] if records else 0
+    record_names = {record["name"] for record in records}
+    actions = []
+    planned_names = set()
+    for record in records:
+        name = record["name"]
+        parent = record["parentCollection"]
+        if record["depth"] == top_depth and parent_collection is not None:
+            parent = parent_collection
+        node = tree.get(name)
+        if (
+            node is not None
+            and node.friendly_name == record["friendlyName"]
+            and (node.parent_name or "").lower() == (parent or "").lower()
+        ):
+            continue
+        if parent is None or (parent not in tree and parent not in record_names):
+            raise ValueError(f"The parent collection '{parent}' of '{name}' doesn't exist.")
+
+        action = "create" if node is None else "update"
+        depends_on = [parent] if parent in planned_names else []
+        actions.append(CollectionAction(action, name, record["friendlyName"], parent, 0, depends_on))
+        planned_names.add(name)
+
+    assign_levels(actions)
+    actions.sort(key=lambda action: action.level)
+    return CollectionPlan(actions)
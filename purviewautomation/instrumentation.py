@@ -0,0 +1,471 @@
+import contextvars
+import functools
+import inspect
+import re
+import threading
+import time
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+
+_current_operation = contextvars.ContextVar("purviewautomation_operation", default=None)
+
+_ENDPOINTS = (
+    ("GET", re.compile(r"^/account/collections$"), "list_collections"),
+    ("GET", re.compile(r"^/account/collections/[^/]+/getChildCollectionNames$"), "get_child_collection_names"),
+    ("PUT", re.compile(r"^/account/collections/[^/]+$"), "create_collection"),
+    ("DELETE", re.compile(r"^/account/collections/[^/]+$"), "delete_collection"),
+    ("POST", re.compile(r"^/catalog/api/search/query$"), "search_assets"),
+    ("DELETE", re.compile(r"^/catalog/api/atlas/v2/entity/bulk$"), "bulk_delete_assets"),
+    ("POST", re.compile(r"^/catalog/api/entity/moveTo$"), "move_assets"),
+)
+
+
+def endpoint_label(method: str, url: str) -> str:
+    """Returns a low cardinality label for the Purview API called.
+
+    Ex: "create_collection" for PUT .../account/collections/<name>.
+    Unknown APIs are labeled with the method and path.
+    """
+    path = urlparse(url).path
+    for endpoint_method, pattern, label in _ENDPOINTS:
+        if method == endpoint_method and pattern.match(path):
+            return label
+    return f"{method} {path}"
+
+
+class RequestEvent:
+    """One Purview API call (including its retries).
+
+    Attributes:
+        method: HTTP method.
+        url: Full url called.
+        endpoint: Label of the API called. See endpoint_label.
+        status_code: HTTP status code. None if the request raised an error.
+        seconds: Wall time of the call including retries.
+        request_bytes: Size of the request body.
+        response_bytes: Size of the response body.
+        retries: Number of retries made by the transport.
+        error: The error raised, if any.
+        operation: Name of the PurviewCollections method that made the call.
+    """
+
+    __slots__ = (
+        "method",
+        "url",
+        "endpoint",
+        "status_code",
+        "seconds",
+        "request_bytes",
+        "response_bytes",
+        "retries",
+        "error",
+        "operation",
+    )
+
+    def __init__(
+        self,
+        method: str,
+        url: str,
+        status_code: Optional[int],
+        seconds: float,
+        request_bytes: int,
+        response_bytes: int,
+        retries: int,
+        error: Optional[BaseException],
+        operation: Optional[str],
+    ) -> None:
+        self.method = method
+        self.url = url
+        self.endpoint = endpoint_label(method, url)
+        self.status_code = status_code
+        self.seconds = seconds
+        self.request_bytes = request_bytes
+        self.response_bytes = response_bytes
+        self.retries = retries
+        self.error = error
+        self.operation = operation
+
+    def __repr__(self) -> str:
+        return f"RequestEvent(endpoint={self.endpoint!r}, status_code={self.status_code}, seconds={self.seconds:.3f})"
+
+
+class OperationEvent:
+    """One call to a public PurviewCollections method.
+
+    Attributes:
+        name: Method name. Ex: "create_collections".
+        parent: Name of the operation that called it (ex: delete_collections
+            calling delete_collection_assets). None for top level calls.
+        seconds: Wall time of the operation.
+        requests: Number of Purview API calls made (including nested operations).
+        error: The error raised, if any.
+    """
+
+    __slots__ = ("name", "parent", "seconds", "requests", "error")
+
+    def __init__(
+        self, name: str, parent: Optional[str], seconds: float, requests: int, error: Optional[BaseException]
+    ) -> None:
+        self.name = name
+        self.parent = parent
+        self.seconds = seconds
+        self.requests = requests
+        self.error = error
+
+    def __repr__(self) -> str:
+        return f"OperationEvent(name={self.name!r}, seconds={self.seconds:.3f}, requests={self.requests})"
+
+
+class Instrumentation:
+    """Base class for instrumentation sinks.
+
+    Subclass it and override the hooks to export the events (ex: to
+    Prometheus or OpenTelemetry), then pass it into PurviewCollections
+    with the instrumentation parameter. Hooks are called from multiple
+    threads. Errors raised by hooks are ignored.
+    """
+
+    def on_operation_start(self, name: str, parent: Optional[str]) -> None:
+        """Called when a public PurviewCollections method starts."""
+
+    def on_operation_end(self, event: OperationEvent) -> None:
+        """Called when a public PurviewCollections method returns or raises."""
+
+    def on_request(self, event: RequestEvent) -> None:
+        """Called after every Purview API call."""
+
+
+class MultiInstrumentation(Instrumentation):
+    """Sends every event to multiple instrumentation sinks."""
+
+    def __init__(self, *sinks: Instrumentation) -> None:
+        self.sinks = sinks
+
+    def on_operation_start(self, name: str, parent: Optional[str]) -> None:
+        for sink in self.sinks:
+            _call_hook(sink.on_operation_start, name, parent)
+
+    def on_operation_end(self, event: OperationEvent) -> None:
+        for sink in self.sinks:
+            _call_hook(sink.on_operation_end, event)
+
+    def on_request(self, event: RequestEvent) -> None:
+        for sink in self.sinks:
+            _call_hook(sink.on_request, event)
+
+
+class MetricsCollector(Instrumentation):
+    """In-memory aggregator of the request and operation events.
+
+    Attributes:
+        keep_events: If True, every event is also kept in the events list.
+        events: Every RequestEvent and OperationEvent (if keep_events is True).
+
+    Returns:
+        MetricsCollector object
+    """
+
+    def __init__(self, keep_events: bool = False) -> None:
+        self.keep_events = keep_events
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Clears every metric."""
+        with self._lock:
+            self.events = []
+            self._endpoints = {}
+            self._operations = {}
+
+    def on_request(self, event: RequestEvent) -> None:
+        with self._lock:
+            if self.keep_events:
+                self.events.append(event)
+            stats = self._endpoints.setdefault(
+                event.endpoint,
+                {
+                    "requests": 0,
+                    "errors": 0,
+                    "retries": 0,
+                    "seconds": 0.0,
+                    "max_seconds": 0.0,
+                    "request_bytes": 0,
+                    "response_bytes": 0,
+                    "status_codes": {},
+                },
+            )
+            stats["requests"] += 1
+            stats["retries"] += event.retries
+            stats["seconds"] += event.seconds
+            stats["max_seconds"] = max(stats["max_seconds"], event.seconds)
+            stats["request_bytes"] += event.request_bytes
+            stats["response_bytes"] += event.response_bytes
+            if event.error is not None or event.status_code is None or event.status_code >= 400:
+                stats["errors"] += 1
+            status = str(event.status_code)
+            stats["status_codes"][status] = stats["status_codes"].get(status, 0) + 1
+
+    def on_operation_end(self, event: OperationEvent) -> None:
+        with self._lock:
+            if self.keep_events:
+                self.events.append(event)
+            stats = self._operations.setdefault(
+                event.name, {"calls": 0, "errors": 0, "seconds": 0.0, "max_seconds": 0.0, "requests": 0}
+            )
+            stats["calls"] += 1
+            stats["seconds"] += event.seconds
+            stats["max_seconds"] = max(stats["max_seconds"], event.seconds)
+            stats["requests"] += event.requests
+            if event.error is not None:
+                stats["errors"] += 1
+
+    def summary(self) -> Dict[str, Dict]:
+        """Returns the aggregated metrics.
+
+        Returns:
+            Dictionary with the "endpoints" and "operations" metrics.
+                Every endpoint has the number of requests, errors, retries,
+                total/mean/max seconds, bytes and a count per status code.
+                Every operation has the number of calls, errors, requests
+                and total/mean/max seconds.
+        """
+        with self._lock:
+            endpoints = {
+                name: {**stats, "status_codes": dict(stats["status_codes"])} for name, stats in self._endpoints.items()
+            }
+            operations = {name: dict(stats) for name, stats in self._operations.items()}
+        for stats in endpoints.values():
+            stats["mean_seconds"] = stats["seconds"] / stats["requests"]
+        for stats in operations.values():
+            stats["mean_seconds"] = stats["seconds"] / stats["calls"]
+        return {"endpoints": endpoints, "operations": operations}
+
+
+class _Operation:
+    """
+    Internal helper class. Do not use directly.
+    """
+
+    __slots__ = ("name", "parent", "requests", "_lock")
+
+    def __init__(self, name: str, parent: Optional["_Operation"]) -> None:
+        self.name = name
+        self.parent = parent
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def add_request(self) -> None:
+        operation = self
+        while operation is not None:
+            with operation._lock:
+                operation.requests += 1
+            operation = operation.parent
+
+
+def _call_hook(hook: Callable, *args) -> None:
+    """Internal helper function. Do not call directly.
+
+    Instrumentation must never break the operation being instrumented.
+    """
+    try:
+        hook(*args)
+    except Exception:
+        pass
+
+
+def current_operation() -> Optional[str]:
+    """Returns the name of the PurviewCollections method running in this context."""
+    operation = _current_operation.get()
+    return operation.name if operation is not None else None
+
+
+def _start_operation(instrumentation: Instrumentation, name: str) -> Tuple[_Operation, float]:
+    """
+    Internal helper function. Do not call directly.
+    """
+    parent = _current_operation.get()
+    _call_hook(instrumentation.on_operation_start, name, parent.name if parent is not None else None)
+    return _Operation(name, parent), time.perf_counter()
+
+
+def _end_operation(
+    instrumentation: Instrumentation, current: _Operation, start: float, error: Optional[BaseException]
+) -> None:
+    """
+    Internal helper function. Do not call directly.
+    """
+    parent_name = current.parent.name if current.parent is not None else None
+    event = OperationEvent(current.name, parent_name, time.perf_counter() - start, current.requests, error)
+    _call_hook(instrumentation.on_operation_end, event)
+
+
+@contextmanager
+def operation(instrumentation: Optional[Instrumentation], name: str) -> Iterator[None]:
+    """Records everything inside the with block as one operation.
+
+    Does nothing if instrumentation is None.
+    """
+    if instrumentation is None:
+        yield
+        return
+
+    current, start = _start_operation(instrumentation, name)
+    token = _current_operation.set(current)
+    error = None
+    try:
+        yield
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        _current_operation.reset(token)
+        _end_operation(instrumentation, current, start, error)
+
+
+def _instrumented_generator(function: Callable) -> Callable:
+    """Internal helper function. Do not call directly.
+
+    The operation lasts from the first item until the generator is
+        exhausted or closed. It's only the current operation while the
+        generator runs, not while the caller handles the items.
+    """
+
+    @functools.wraps(function)
+    def wrapper(self, *args, **kwargs):
+        instrumentation = self.instrumentation
+        generator = function(self, *args, **kwargs)
+        if instrumentation is None:
+            return (yield from generator)
+
+        current, start = _start_operation(instrumentation, function.__name__)
+        error = None
+        try:
+            while True:
+                token = _current_operation.set(current)
+                try:
+                    item = next(generator)
+                except StopIteration:
+                    return
+                finally:
+                    _current_operation.reset(token)
+                yield item
+        except GeneratorExit:
+            raise
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            generator.close()
+            _end_operation(instrumentation, current, start, error)
+
+    return wrapper
+
+
+def _instrumented_async_generator(function: Callable) -> Callable:
+    """Internal helper function. Do not call directly.
+
+    Async version of _instrumented_generator.
+    """
+
+    @functools.wraps(function)
+    async def wrapper(self, *args, **kwargs):
+        instrumentation = self.instrumentation
+        generator = function(self, *args, **kwargs)
+        current = start = None
+        if instrumentation is not None:
+            current, start = _start_operation(instrumentation, function.__name__)
+        error = None
+        try:
+            while True:
+                token = _current_operation.set(current) if current is not None else None
+                try:
+                    item = await generator.__anext__()
+                except StopAsyncIteration:
+                    return
+                finally:
+                    if token is not None:
+                        _current_operation.reset(token)
+                yield item
+        except GeneratorExit:
+            raise
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            await generator.aclose()
+            if current is not None:
+                _end_operation(instrumentation, current, start, error)
+
+    return wrapper
+
+
+def instrumented(function: Callable) -> Callable:
+    """Decorator that records a client method as an operation.
+
+    Works on regular, async, generator and async generator methods.
+    The client needs an instrumentation attribute.
+    """
+    if inspect.isasyncgenfunction(function):
+        return _instrumented_async_generator(function)
+    if inspect.isgeneratorfunction(function):
+        return _instrumented_generator(function)
+    if inspect.iscoroutinefunction(function):
+
+        @functools.wraps(function)
+        async def async_wrapper(self, *args, **kwargs):
+            with operation(self.instrumentation, function.__name__):
+                return await function(self, *args, **kwargs)
+
+        return async_wrapper
+
+    @functools.wraps(function)
+    def wrapper(self, *args, **kwargs):
+        with operation(self.instrumentation, function.__name__):
+            return function(self, *args, **kwargs)
+
+    return wrapper
+
+
+def record_request(
+    instrumentation: Optional[Instrumentation],
+    method: str,
+    url: str,
+    data,
+    response,
+    seconds: float,
+    error: Optional[BaseException] = None,
+) -> None:
+    """Sends a RequestEvent for one API call to the instrumentation.
+
+    Does nothing if instrumentation is None.
+    """
+    if instrumentation is None:
+        return
+    operation = _current_operation.get()
+    if operation is not None:
+        operation.add_request()
+    if isinstance(data, str):
+        data = data.encode()
+    event = RequestEvent(
+        method=method,
+        url=url,
+        status_code=response.status_code if response is not None else None,
+        seconds=seconds,
+        request_bytes=len(data) if data else 0,
+        response_bytes=len(response.content or b"") if response is not None else 0,
+        retries=getattr(response, "retries", 0) if response is not None else 0,
+        error=error,
+        operation=operation.name if operation is not None else None,
+    )
+    _call_hook(instrumentation.on_request, event)
+
+
+def submit(executor: Executor, function: Callable, *args, **kwargs) -> Future:
+    """Submits the function to the executor in a copy of the current context.
+
+    Requests made in worker threads are recorded under the operation
+    that submitted them.
+    """
+    return executor.submit(contextvars.copy_context().run, function, *args, **kwargs)
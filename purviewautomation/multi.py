@@ -0,0 +1,147 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from .auth import AzIdentityAuthentication, ServicePrincipalAuthentication
+from .collections import PurviewCollections
+from .instrumentation import Instrumentation, submit
+from .snapshot import SnapshotCache
+from .transport import HttpTransport
+
+
+class _LimitedTransport:
+    """Internal helper class. Do not use directly.
+
+    Caps custom transports that aren't an HttpTransport (the slot is
+    held for the whole call, including any retries of the transport).
+    """
+
+    def __init__(self, transport, max_requests: int) -> None:
+        self.transport = transport
+        self._semaphore = threading.BoundedSemaphore(max_requests)
+
+    def request(self, method, url, headers=None, data=None, timeout=None):
+        with self._semaphore:
+            return self.transport.request(method, url, headers=headers, data=data, timeout=timeout)
+
+
+class MultiAccountExecutor:
+    """Runs the same PurviewCollections operation on many Purview accounts at the same time.
+
+    Every account gets its own PurviewCollections client, but they all
+    share the authentication (one token is used for every account) and
+    the transport. The shared HttpTransport keeps a connection pool and
+    an adaptive rate limiter per account (host).
+
+    Args:
+        purview_account_names: Names of the Purview accounts.
+        auth: Authentication shared by every account.
+        transport: Transport shared by every account. If None, a pooled
+            HttpTransport with a pool per account is created.
+        max_accounts: Max number of accounts worked on at the same time.
+        max_requests: Max number of concurrent requests across every
+            account. If None, only max_workers limits each account.
+            With an HttpTransport, it's set as the transport's
+            request_slots, so retry and throttling waits don't hold a slot.
+        max_rate: Max requests per second per account when transport
+            is None. If None, requests aren't rate limited.
+        cache_ttl: Passed into every PurviewCollections client.
+        max_workers: Passed into every PurviewCollections client.
+        instrumentation: Passed into every PurviewCollections client.
+        snapshot_cache: Passed into every PurviewCollections client
+            (every account is saved in its own file).
+
+    Returns:
+        MultiAccountExecutor object
+    """
+
+    def __init__(
+        self,
+        purview_account_names: List[str],
+        auth: Union[ServicePrincipalAuthentication, AzIdentityAuthentication],
+        transport: Optional[HttpTransport] = None,
+        max_accounts: int = 8,
+        max_requests: Optional[int] = None,
+        max_rate: Optional[float] = 100,
+        cache_ttl: float = 30,
+        max_workers: int = 8,
+        instrumentation: Optional[Instrumentation] = None,
+        snapshot_cache: Optional[SnapshotCache] = None,
+    ) -> None:
+        if not purview_account_names:
+            raise ValueError("The purview_account_names parameter needs at least one account name.")
+        if transport is None:
+            pool_size = max(max_workers, 10)
+            transport = HttpTransport(
+                pool_connections=len(purview_account_names), pool_maxsize=pool_size, max_rate=max_rate
+            )
+        self.transport = transport
+        self.max_accounts = max_accounts
+        shared_transport = transport
+        if max_requests and isinstance(transport, HttpTransport):
+            transport.request_slots = threading.BoundedSemaphore(max_requests)
+        elif max_requests:
+            shared_transport = _LimitedTransport(transport, max_requests)
+        self.clients = {
+            account: PurviewCollections(
+                account,
+                auth,
+                transport=shared_transport,
+                cache_ttl=cache_ttl,
+                max_workers=max_workers,
+                instrumentation=instrumentation,
+                snapshot_cache=snapshot_cache,
+            )
+            for account in purview_account_names
+        }
+
+    def run(
+        self,
+        operation: Union[str, Callable[[PurviewCollections], Any]],
+        *args,
+        accounts: Optional[List[str]] = None,
+        **kwargs,
+    ) -> Dict[str, Dict]:
+        """Runs the operation on every account.
+
+        An error in one account doesn't stop the others.
+
+        Args:
+            operation: Name of the PurviewCollections method to call with
+                args and kwargs (ex: "create_collections"), or a function
+                that gets the account's client.
+            accounts: Accounts to run on. If None, every account.
+            *args: Passed into the method.
+            **kwargs: Passed into the method.
+
+        Returns:
+            Dictionary with the account name as the key and the result,
+                error (None if it succeeded) and seconds as the values.
+        """
+        accounts = accounts if accounts is not None else list(self.clients)
+        unknown = [account for account in accounts if account not in self.clients]
+        if unknown:
+            raise ValueError(f"Unknown Purview accounts: {unknown}")
+
+        def run_account(account: str) -> Dict:
+            client = self.clients[account]
+            start = time.perf_counter()
+            try:
+                if callable(operation):
+                    result = operation(client)
+                else:
+                    result = getattr(client, operation)(*args, **kwargs)
+                error = None
+            except Exception as e:
+                result, error = None, str(e)
+            return {"result": result, "error": error, "seconds": round(time.perf_counter() - start, 3)}
+
+        with ThreadPoolExecutor(max_workers=self.max_accounts) as executor:
+            futures = {account: submit(executor, run_account, account) for account in accounts}
+            return {account: future.result() for account, future in futures.items()}
+
+    def refresh(self) -> None:
+        """Clears the cached collections of every account."""
+        for client in self.clients.values():
+            client.refresh()
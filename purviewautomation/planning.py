@@ -0,0 +1,148 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+
+class CollectionAction:
+    """One collection to create or delete.
+
+    Attributes:
+        action: "create", "update" (rename or move) or "delete".
+        name: Actual collection name.
+        friendly_name: Friendly collection name.
+        parent_collection: Actual name of the parent collection.
+        level: Actions in the same level can run at the same time.
+            Lower levels run first.
+        depends_on: Actual names of the planned collections that have to
+            succeed first (the parent for creates and updates, the children
+            for deletes).
+    """
+
+    __slots__ = ("action", "name", "friendly_name", "parent_collection", "level", "depends_on")
+
+    def __init__(
+        self,
+        action: str,
+        name: str,
+        friendly_name: str,
+        parent_collection: Optional[str],
+        level: int,
+        depends_on: Sequence[str] = (),
+    ) -> None:
+        if action not in ("create", "update", "delete"):
+            raise ValueError(f"The action has to be 'create', 'update' or 'delete', not '{action}'.")
+        self.action = action
+        self.name = name
+        self.friendly_name = friendly_name
+        self.parent_collection = parent_collection
+        self.level = level
+        self.depends_on = tuple(depends_on)
+
+    def blocked_error(self, failed_name: str) -> str:
+        """Returns the error used when an action it depends on failed."""
+        if self.action == "create":
+            return f"Parent collection '{failed_name}' was not created."
+        if self.action == "update":
+            return f"Parent collection '{failed_name}' was not created or updated."
+        return f"The collection '{self.friendly_name}' still has child collections."
+
+    def to_dict(self) -> Dict:
+        """Returns the action as a dictionary (same keys as the results)."""
+        return {
+            "action": self.action,
+            "name": self.name,
+            "friendlyName": self.friendly_name,
+            "parentCollection": self.parent_collection,
+            "level": self.level,
+            "dependsOn": list(self.depends_on),
+        }
+
+    @classmethod
+    def from_dict(cls, action: Dict) -> "CollectionAction":
+        """Returns the action from a dictionary made by to_dict."""
+        return cls(
+            action["action"],
+            action["name"],
+            action["friendlyName"],
+            action["parentCollection"],
+            action["level"],
+            action["dependsOn"],
+        )
+
+    def __repr__(self) -> str:
+        return f"CollectionAction(action={self.action!r}, name={self.name!r}, level={self.level})"
+
+
+class CollectionPlan:
+    """Every collection create or delete needed for an operation.
+
+    Built from one collection listing without calling Purview.
+    Run it with execute_plan.
+
+    Args:
+        actions: The planned actions (in the order they'd run one by one).
+
+    Returns:
+        CollectionPlan object
+    """
+
+    def __init__(self, actions: Iterable[CollectionAction] = ()) -> None:
+        self.actions = list(actions)
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    def __iter__(self) -> Iterator[CollectionAction]:
+        return iter(self.actions)
+
+    def __repr__(self) -> str:
+        return f"CollectionPlan(actions={len(self.actions)}, levels={len(self.levels)})"
+
+    @property
+    def levels(self) -> List[List[CollectionAction]]:
+        """The actions grouped by level, lowest level first."""
+        levels = {}
+        for action in self.actions:
+            levels.setdefault(action.level, []).append(action)
+        return [levels[level] for level in sorted(levels)]
+
+    def names(self) -> List[str]:
+        """Returns the actual names of every planned collection."""
+        return [action.name for action in self.actions]
+
+    def to_dicts(self) -> List[Dict]:
+        """Returns every action as a dictionary."""
+        return [action.to_dict() for action in self.actions]
+
+    @classmethod
+    def from_dicts(cls, actions: Iterable[Dict]) -> "CollectionPlan":
+        """Returns the plan from the dictionaries made by to_dicts."""
+        return cls(CollectionAction.from_dict(action) for action in actions)
+
+
+def assign_levels(actions: List[CollectionAction]) -> None:
+    """Sets the level of every action to one after the last action it depends on.
+
+    Actions without dependencies get level 0.
+
+    Args:
+        actions: The planned actions. depends_on has to name other actions in the list.
+
+    Raises:
+        ValueError if actions depend on each other.
+    """
+    by_name = {action.name: action for action in actions}
+    levels = {}
+    visiting = set()
+
+    def level_of(action: CollectionAction) -> int:
+        if action.name in levels:
+            return levels[action.name]
+        if action.name in visiting:
+            raise ValueError(f"The changes to collection '{action.name}' depend on each other.")
+        visiting.add(action.name)
+        level = 1 + max((level_of(by_name[name]) for name in action.depends_on), default=-1)
+        visiting.discard(action.name)
+        levels[action.name] = level
+        return level
+
+    for action in actions:
+        action.level = level_of(action)
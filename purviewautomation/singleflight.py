@@ -0,0 +1,113 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Call:
+    """
+    Internal helper class. Do not use directly.
+    """
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Shares one call between threads asking for the same key at the same time.
+
+    The first thread runs the function. Threads that ask for the same
+    key before it finishes wait and get its result (or its error)
+    instead of running the function again. Nothing is cached: once the
+    call finishes, the next call for the key runs the function again.
+
+    Attributes:
+        coalesced: Number of calls that reused another thread's call.
+
+    Returns:
+        SingleFlight object
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.coalesced = 0
+
+    def do(self, key: Hashable, function: Callable[[], Any]) -> Any:
+        """Runs the function, or waits for the call already running for the key.
+
+        Args:
+            key: Identifies identical calls (ex: the method and url).
+            function: Called without arguments.
+
+        Returns:
+            The result of the function.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+class AsyncSingleFlight:
+    """Shares one call between tasks asking for the same key at the same time.
+
+    Same as SingleFlight for coroutines. The call runs in its own task,
+    so cancelling one of the waiting tasks doesn't cancel the others.
+
+    Attributes:
+        coalesced: Number of calls that reused another task's call.
+
+    Returns:
+        AsyncSingleFlight object
+    """
+
+    def __init__(self) -> None:
+        self._tasks: Dict[Hashable, asyncio.Future] = {}
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, function: Callable[[], Awaitable[Any]]) -> Any:
+        """Awaits the function, or the call already running for the key.
+
+        Args:
+            key: Identifies identical calls (ex: the method and url).
+            function: Called without arguments. Returns an awaitable.
+
+        Returns:
+            The result of the function.
+        """
+        task = self._tasks.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = self._tasks[key] = asyncio.ensure_future(function())
+
+            def forget(finished: asyncio.Future) -> None:
+                if self._tasks.get(key) is finished:
+                    del self._tasks[key]
+
+            task.add_done_callback(forget)
+        return await asyncio.shield(task)
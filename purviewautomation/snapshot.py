@@ -0,0 +1,143 @@
+import marshal
+import os
+import re
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+# marshal's format can change between Python versions, so files written
+# by another version are ignored.
+_HEADER = b"PVSNAP1" + bytes([marshal.version])
+
+
+class CollectionSnapshot:
+    """Collection listing saved by SnapshotCache.
+
+    Attributes:
+        collections: Collection info as returned by the Purview API.
+        etag: ETag of the listing. None if Purview didn't send one.
+        last_modified: Last-Modified of the listing. None if Purview
+            didn't send one.
+        saved_at: Time (seconds since the epoch) the listing was
+            fetched or last revalidated.
+    """
+
+    __slots__ = ("collections", "etag", "last_modified", "saved_at")
+
+    def __init__(
+        self, collections: List[Dict], etag: Optional[str], last_modified: Optional[str], saved_at: float
+    ) -> None:
+        self.collections = collections
+        self.etag = etag
+        self.last_modified = last_modified
+        self.saved_at = saved_at
+
+
+class SnapshotCache:
+    """On-disk cache of the collection listing of every Purview account.
+
+    New processes (ex: short scripts and CLI jobs) start with the saved
+    collections instead of listing them again. A snapshot younger than
+    ttl seconds is used without calling Purview. An older one is
+    revalidated with If-None-Match/If-Modified-Since when Purview sent
+    an ETag or Last-Modified, otherwise the collections are listed again.
+    Creates and deletes made by the client drop the account's snapshot.
+
+    Every account is saved in its own file (readable only by the current
+    user) with the marshal format, which loads much faster than JSON.
+    Only point it at a directory you trust: marshal files aren't meant
+    to be read from untrusted sources.
+
+    Pass it into PurviewCollections or AsyncPurviewCollections with the
+    snapshot_cache parameter.
+
+    Attributes:
+        path: Directory of the cache files. If None, defaults to
+            ~/.purviewautomation/snapshots.
+        ttl: Seconds a snapshot is used without calling Purview.
+
+    Returns:
+        SnapshotCache object
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: float = 300) -> None:
+        if path is None:
+            path = os.path.join(os.path.expanduser("~"), ".purviewautomation", "snapshots")
+        self.path = path
+        self.ttl = ttl
+
+    def _file_path(self, account: str) -> str:
+        """
+        Internal helper function. Do not call directly.
+        """
+        return os.path.join(self.path, f"{re.sub(r'[^A-Za-z0-9_.-]', '_', account)}.snapshot")
+
+    def _read(self, account: str) -> Dict[str, tuple]:
+        """
+        Internal helper function. Do not call directly.
+        """
+        try:
+            with open(self._file_path(account), "rb") as snapshot_file:
+                content = snapshot_file.read()
+            if not content.startswith(_HEADER):
+                return {}
+            snapshots = marshal.loads(content[len(_HEADER) :])
+        except (OSError, EOFError, ValueError, TypeError):
+            # missing, corrupt or written by another Python version. The collections are listed again.
+            return {}
+        return snapshots if isinstance(snapshots, dict) else {}
+
+    def _write(self, account: str, snapshots: Dict[str, tuple]) -> None:
+        """
+        Internal helper function. Do not call directly.
+        """
+        os.makedirs(self.path, mode=0o700, exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.path, prefix=".snapshot.")
+        try:
+            with os.fdopen(file_descriptor, "wb") as temp_file:
+                temp_file.write(_HEADER)
+                temp_file.write(marshal.dumps(snapshots))
+            os.replace(temp_path, self._file_path(account))
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def get(self, account: str, api_version: str) -> Optional[CollectionSnapshot]:
+        """Returns the saved collections of the account or None."""
+        entry = self._read(account).get(api_version)
+        if entry is None:
+            return None
+        etag, last_modified, saved_at, collections = entry
+        return CollectionSnapshot(collections, etag, last_modified, saved_at)
+
+    def is_fresh(self, snapshot: CollectionSnapshot) -> bool:
+        """Returns True if the snapshot can be used without calling Purview."""
+        return time.time() - snapshot.saved_at < self.ttl
+
+    def set(
+        self,
+        account: str,
+        api_version: str,
+        collections: List[Dict],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """Saves the collections of the account."""
+        snapshots = self._read(account)
+        snapshots[api_version] = (etag, last_modified, time.time(), collections)
+        self._write(account, snapshots)
+
+    def touch(self, account: str, api_version: str) -> None:
+        """Marks the saved collections as revalidated (Purview answered 304)."""
+        snapshots = self._read(account)
+        if api_version in snapshots:
+            etag, last_modified, _, collections = snapshots[api_version]
+            snapshots[api_version] = (etag, last_modified, time.time(), collections)
+            self._write(account, snapshots)
+
+    def remove(self, account: str) -> None:
+        """Deletes the saved collections of the account."""
+        try:
+            os.remove(self._file_path(account))
+        except FileNotFoundError:
+            pass
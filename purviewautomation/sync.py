@@ -0,0 +1,139 @@
+import json
+import os
+from typing import Callable, Dict, List, Set, Union
+
+from .planning import CollectionAction, CollectionPlan, assign_levels
+from .tree import CollectionTree
+
+try:
+    import yaml
+except ImportError:  # optional dependency: pip install purviewautomation[yaml]
+    yaml = None
+
+
+def load_hierarchy(source: Union[str, Dict]) -> Dict:
+    """Loads a desired collection hierarchy.
+
+    The hierarchy has the collection to start on and the nested
+    collections that should exist under it. "name" (the actual name)
+    is optional. Without it, a collection is matched by its friendly
+    name under the same parent. Ex (YAML):
+
+        start_collection: My-Company
+        collections:
+          - friendlyName: Sales
+            children:
+              - friendlyName: EMEA
+          - friendlyName: Finance
+            name: finance
+
+    Args:
+        source: Path to a .json, .yaml or .yml file, or the
+            hierarchy as a dictionary.
+
+    Returns:
+        The validated hierarchy as a dictionary.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding="utf-8") as hierarchy_file:
+            if str(source).endswith((".yaml", ".yml")):
+                if yaml is None:
+                    raise ImportError(
+                        "Loading YAML needs the pyyaml package. Install it with: pip install purviewautomation[yaml]"
+                    )
+                hierarchy = yaml.safe_load(hierarchy_file)
+            else:
+                hierarchy = json.load(hierarchy_file)
+    else:
+        hierarchy = source
+
+    if not isinstance(hierarchy, dict) or "start_collection" not in hierarchy:
+        raise ValueError("The hierarchy has to be a dictionary with a 'start_collection' key.")
+    _validate_collections(hierarchy.get("collections") or [])
+    return hierarchy
+
+
+def _validate_collections(collections: List[Dict]) -> None:
+    """
+    Internal helper function. Do not call directly.
+    """
+    if not isinstance(collections, list):
+        raise ValueError("'collections' and 'children' have to be lists.")
+    for collection in collections:
+        if not isinstance(collection, dict) or not collection.get("friendlyName"):
+            raise ValueError(f"Every collection needs a friendlyName. Invalid collection: {collection}")
+        _validate_collections(collection.get("children") or [])
+
+
+def diff_hierarchy(
+    tree: CollectionTree,
+    start_collection: str,
+    collections: List[Dict],
+    new_name: Callable[[str, Set[str]], str],
+    prune: bool = False,
+) -> CollectionPlan:
+    """Returns the minimal changes to make the tree match the desired collections.
+
+    Args:
+        tree: Current collections.
+        start_collection: Actual name of the collection the desired
+            collections are under. It's never changed.
+        collections: Desired nested collections (see load_hierarchy).
+        new_name: Returns the actual name for a new collection from its
+            friendly name and the actual names already taken.
+        prune: If True, collections under the start collection that aren't
+            in the desired collections are deleted.
+
+    Returns:
+        CollectionPlan with create, update (rename or move) and delete
+            actions. Empty if the tree already matches.
+    """
+    actions = {}
+    desired_names = set()
+    taken_names = {node.name for node in tree}
+
+    def walk(specs: List[Dict], parent_name: str) -> None:
+        for spec in specs:
+            friendly_name = spec["friendlyName"]
+            name = spec.get("name")
+            if name is None:
+                siblings = tree.children(parent_name) if parent_name in tree else []
+                match = next(
+                    (
+                        node
+                        for node in siblings
+                        if node.friendly_name == friendly_name and node.name not in desired_names
+                    ),
+                    None,
+                )
+                name = match.name if match is not None else new_name(friendly_name, taken_names)
+            if name in desired_names:
+                raise ValueError(f"The collection '{name}' is in the hierarchy more than once.")
+            desired_names.add(name)
+            taken_names.add(name)
+
+            node = tree.get(name)
+            if node is None:
+                depends_on = [parent_name] if parent_name in actions else []
+                actions[name] = CollectionAction("create", name, friendly_name, parent_name, 0, depends_on)
+            elif node.friendly_name != friendly_name or (node.parent_name or "").lower() != parent_name.lower():
+                depends_on = [parent_name] if parent_name in actions else []
+                actions[name] = CollectionAction("update", name, friendly_name, parent_name, 0, depends_on)
+            walk(spec.get("children") or [], name)
+
+    walk(collections, start_collection)
+
+    if prune:
+        for node in tree.leaf_first(start_collection):
+            if node.name in desired_names:
+                continue
+            # children are either deleted first or moved away first
+            depends_on = [child.name for child in node.children if child.name in actions]
+            actions[node.name] = CollectionAction(
+                "delete", node.name, node.friendly_name, node.parent_name, 0, depends_on
+            )
+
+    plan_actions = list(actions.values())
+    assign_levels(plan_actions)
+    plan_actions.sort(key=lambda action: action.level)
+    return CollectionPlan(plan_actions)
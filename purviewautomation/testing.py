@@ -0,0 +1,403 @@
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+from itertools import chain, islice
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+_COLLECTION_PATH = re.compile(r"^/account/collections/([^/]+)$")
+_CHILD_NAMES_PATH = re.compile(r"^/account/collections/([^/]+)/getChildCollectionNames$")
+_ASSET_TYPE = "azure_datalake_gen2_path"
+
+
+class FakeAuth:
+    """Authentication stand-in that returns a fixed access token."""
+
+    def get_access_token(self) -> str:
+        return "fake-token"
+
+
+class FakeResponse:
+    """requests.Response like object returned by FakePurview."""
+
+    def __init__(self, status_code: int = 200, body=None, headers: Optional[Dict[str, str]] = None) -> None:
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.content = json.dumps(body).encode() if body is not None else b""
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(str(self.status_code), response=self)
+
+
+class FakePurview:
+    """In-memory stand-in for the Purview APIs used by PurviewCollections.
+
+    Pass it in as the transport to run the client without a Purview
+    account or credentials (ex: for tests and benchmarks). Covers the
+    collection APIs (list with nextLink paging, create, delete and
+    getChildCollectionNames), catalog search, bulk delete and move. Safe to
+    call from multiple threads.
+
+    Assets aren't stored one by one (only a count per collection and the
+    deleted ones), so millions of assets fit in memory.
+
+    Attributes:
+        account_name: Name of the fake Purview account (and root collection).
+        page_size: Collections returned per list page. If None, one page.
+        latency: Seconds every request takes.
+        throttle_rate: Fraction (0 to 1) of requests answered with 429.
+        retry_after: Retry-After header value sent with 429 responses.
+            If None, the header isn't sent.
+        seed: Seed for the throttling random numbers.
+        collections: Collection info by actual name.
+        fail_names: Collections that fail to be created or deleted.
+        flaky_guids: Number of times an asset guid fails to delete.
+        continuation_tokens: If True, searches with more results return a
+            continuationToken. Otherwise only offset paging works.
+        facets: If True, searches return the collectionId facets asked for.
+        etags: If True, collection listings return an ETag and answer a
+            matching If-None-Match with 304 Not Modified.
+        calls: (method, path) of every request.
+        throttled: Number of 429 responses sent.
+
+    Returns:
+        FakePurview object
+    """
+
+    def __init__(
+        self,
+        account_name: str = "account",
+        page_size: Optional[int] = None,
+        latency: float = 0,
+        throttle_rate: float = 0,
+        retry_after: Optional[float] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.account_name = account_name
+        self.page_size = page_size
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.fail_names = set()
+        self.flaky_guids = {}
+        self.continuation_tokens = True
+        self.facets = True
+        self.etags = True
+        self.collections = {}
+        self.calls = []
+        self.throttled = 0
+        self._random = random.Random(seed)
+        self._children = {}
+        self._asset_counts = {}
+        self._first_assets = {}
+        self._deleted_assets = {}
+        self._version = 0
+        self._lock = threading.Lock()
+        self._add_collection({"name": account_name, "friendlyName": account_name})
+
+    def _add_collection(self, collection: Dict) -> None:
+        """
+        Internal helper function. Do not call directly.
+        """
+        self.collections[collection["name"]] = collection
+        self._version += 1
+        self._children.setdefault(collection["name"], set())
+        if "parentCollection" in collection:
+            self._children.setdefault(collection["parentCollection"]["referenceName"], set()).add(collection["name"])
+
+    def add_collection(self, name: str, friendly_name: str, parent: str) -> Dict:
+        """Adds a collection (the parent doesn't have to exist)."""
+        collection = {
+            "name": name,
+            "friendlyName": friendly_name,
+            "parentCollection": {"type": "CollectionReference", "referenceName": parent},
+        }
+        with self._lock:
+            self._add_collection(collection)
+        return collection
+
+    def generate_tree(
+        self, depth: int, breadth: int, parent: Optional[str] = None, assets_per_collection: int = 0
+    ) -> List[str]:
+        """Adds a synthetic collection hierarchy.
+
+        Ex: depth=4 and breadth=10 adds 11,110 collections.
+
+        Args:
+            depth: Number of levels below the parent.
+            breadth: Number of children per collection.
+            parent: Actual name of the collection to add under.
+                If None, uses the root collection.
+            assets_per_collection: Number of assets added to every new collection.
+
+        Returns:
+            Actual names of the new collections (parents before children).
+        """
+        parent = parent or self.account_name
+        names = []
+        level = [parent]
+        for level_number in range(depth):
+            next_level = []
+            for parent_name in level:
+                for index in range(breadth):
+                    name = f"{parent_name}-{index}" if parent_name != parent else f"gen{len(names)}"
+                    while name in self.collections:
+                        name = f"{name}x"
+                    self.add_collection(name, f"L{level_number + 1}-{name}", parent_name)
+                    if assets_per_collection:
+                        self.add_assets(name, assets_per_collection)
+                    names.append(name)
+                    next_level.append(name)
+            level = next_level
+        return names
+
+    def add_assets(self, collection: str, count: int) -> None:
+        """Adds count assets to the collection."""
+        with self._lock:
+            self._asset_counts[collection] = self._asset_counts.get(collection, 0) + count
+
+    def asset_count(self, collection: Optional[str] = None) -> int:
+        """Returns the number of assets left in the collection (or in every collection)."""
+        with self._lock:
+            collections = [collection] if collection is not None else list(self._asset_counts)
+            return sum(self._remaining_assets(name) for name in collections)
+
+    @property
+    def assets(self) -> Dict[str, str]:
+        """Remaining asset guids with their collection (for small trees)."""
+        with self._lock:
+            return {
+                guid: collection for collection in list(self._asset_counts) for guid in self._asset_guids(collection)
+            }
+
+    def _remaining_assets(self, collection: str) -> int:
+        """
+        Internal helper function. Do not call directly.
+        """
+        deleted = len(self._deleted_assets.get(collection, ()))
+        return self._asset_counts.get(collection, 0) - self._first_assets.get(collection, 0) - deleted
+
+    def _asset_guids(self, collection: str):
+        """
+        Internal helper function. Do not call directly.
+        """
+        deleted = self._deleted_assets.get(collection, ())
+        for index in range(self._first_assets.get(collection, 0), self._asset_counts.get(collection, 0)):
+            if index not in deleted:
+                yield f"{collection}-asset-{index}"
+
+    def _delete_asset(self, collection: str, index: int) -> bool:
+        """Internal helper function. Do not call directly.
+
+        Assets below _first_assets are all deleted, so only the
+        deleted assets above it are kept in _deleted_assets.
+        """
+        first = self._first_assets.get(collection, 0)
+        deleted = self._deleted_assets.setdefault(collection, set())
+        if index < first or index in deleted:
+            return False
+        deleted.add(index)
+        while first in deleted:
+            deleted.remove(first)
+            first += 1
+        self._first_assets[collection] = first
+        return True
+
+    def _parse_guid(self, guid: str) -> Optional[Tuple[str, int]]:
+        """
+        Internal helper function. Do not call directly.
+        """
+        collection, _, index = guid.rpartition("-asset-")
+        if not collection or not index.isdigit() or int(index) >= self._asset_counts.get(collection, 0):
+            return None
+        return collection, int(index)
+
+    def _search(self, body: Dict) -> FakeResponse:
+        """Internal helper function. Do not call directly.
+
+        Supports collectionId filters (alone or in an "or" list) combined
+        with entityType filters in an "and" list, offset and
+        continuationToken paging and collectionId facets.
+        """
+        clauses = body["filter"].get("and", [body["filter"]])
+        collections = []
+        for clause in clauses:
+            for option in clause.get("or", [clause]):
+                if "collectionId" in option:
+                    collections.append(option["collectionId"])
+        matches = all(clause["entityType"] == _ASSET_TYPE for clause in clauses if "entityType" in clause)
+        counts = {collection: self._remaining_assets(collection) if matches else 0 for collection in collections}
+        count = sum(counts.values())
+        limit = body.get("limit", 50)
+        offset = int(body.get("continuationToken") or body.get("offset") or 0)
+        guids = chain.from_iterable(self._asset_guids(collection) for collection in collections) if matches else ()
+        value = [
+            {
+                "id": guid,
+                "name": guid.rpartition("-")[2],
+                "qualifiedName": f"https://{self.account_name}.dfs.core.windows.net/{guid}",
+                "entityType": _ASSET_TYPE,
+                "collectionId": guid.rpartition("-asset-")[0],
+            }
+            for guid in islice(guids, offset, offset + limit)
+        ]
+        response = {"@search.count": count, "value": value}
+        if self.continuation_tokens and offset + len(value) < count:
+            response["continuationToken"] = str(offset + len(value))
+        if self.facets and any(facet.get("facet") == "collectionId" for facet in body.get("facets") or ()):
+            response["@search.facets"] = {
+                "collectionId": [
+                    {"value": collection, "count": collection_count}
+                    for collection, collection_count in counts.items()
+                    if collection_count
+                ]
+            }
+        return FakeResponse(body=response)
+
+    def count(self, method: str, path: str) -> int:
+        """Returns the number of requests made to the method and path."""
+        with self._lock:
+            return sum(1 for call in self.calls if call == (method, path))
+
+    def request(self, method, url, headers=None, data=None, timeout=None) -> FakeResponse:
+        """Same signature as HttpTransport.request."""
+        if self.latency:
+            time.sleep(self.latency)
+        return self.handle(method, url, data, headers)
+
+    def handle(
+        self, method: str, url: str, data: Optional[str] = None, headers: Optional[Dict[str, str]] = None
+    ) -> FakeResponse:
+        """Returns the response to a request without waiting for the latency."""
+        parsed = urlparse(url)
+        path = parsed.path
+        with self._lock:
+            self.calls.append((method, path))
+            if self.throttle_rate and self._random.random() < self.throttle_rate:
+                self.throttled += 1
+                headers = {"Retry-After": str(self.retry_after)} if self.retry_after is not None else None
+                return FakeResponse(status_code=429, body={"error": {"code": "TooManyRequests"}}, headers=headers)
+            return self._handle(method, url, parsed, path, data, headers or {})
+
+    def _handle(
+        self, method: str, url: str, parsed, path: str, data: Optional[str], headers: Dict[str, str]
+    ) -> FakeResponse:
+        """
+        Internal helper function. Do not call directly.
+        """
+        if path == "/account/collections" and method == "GET":
+            etag = f'"{self._version}"' if self.etags else None
+            if etag is not None and headers.get("If-None-Match") == etag:
+                return FakeResponse(status_code=304, headers={"ETag": etag})
+            response_headers = {"ETag": etag} if etag is not None else None
+            if self.page_size is None:
+                collections = list(self.collections.values())
+                return FakeResponse(body={"value": collections, "count": len(collections)}, headers=response_headers)
+            skip = int(parse_qs(parsed.query).get("$skipToken", ["0"])[0])
+            collections = list(islice(self.collections.values(), skip, skip + self.page_size))
+            body = {"value": collections, "count": len(self.collections)}
+            if skip + self.page_size < len(self.collections):
+                body["nextLink"] = f"{url.split('&$skipToken')[0]}&$skipToken={skip + self.page_size}"
+            return FakeResponse(body=body, headers=response_headers)
+
+        match = _CHILD_NAMES_PATH.match(path)
+        if match:
+            children = [
+                {"name": name, "friendlyName": self.collections[name]["friendlyName"]}
+                for name in self._children.get(match.group(1), ())
+            ]
+            return FakeResponse(body={"value": children, "count": len(children)})
+
+        match = _COLLECTION_PATH.match(path)
+        if match and method == "PUT":
+            body = json.loads(data)
+            parent = body["parentCollection"]["referenceName"]
+            if parent not in self.collections or match.group(1) in self.fail_names:
+                return FakeResponse(status_code=400, body={"error": {"code": "BadRequest"}})
+            old = self.collections.get(match.group(1))
+            if old is not None and "parentCollection" in old:
+                self._children[old["parentCollection"]["referenceName"]].discard(match.group(1))
+            collection = {
+                "name": match.group(1),
+                "friendlyName": body["friendlyName"],
+                "parentCollection": {"type": "CollectionReference", "referenceName": parent},
+            }
+            self._add_collection(collection)
+            return FakeResponse(body=collection)
+        if match and method == "DELETE":
+            name = match.group(1)
+            if self._children.get(name) or name in self.fail_names:
+                return FakeResponse(status_code=400, body={"error": {"code": "CollectionHasChildren"}})
+            collection = self.collections.pop(name, None)
+            if collection is None:
+                return FakeResponse(status_code=404, body={"error": {"code": "CollectionNotFound"}})
+            self._version += 1
+            del self._children[name]
+            if "parentCollection" in collection:
+                self._children[collection["parentCollection"]["referenceName"]].discard(name)
+            return FakeResponse(status_code=204)
+
+        if path == "/catalog/api/search/query":
+            return self._search(json.loads(data))
+        if path == "/catalog/api/entity/moveTo" and method == "POST":
+            target = parse_qs(parsed.query)["collectionId"][0]
+            if target not in self.collections:
+                return FakeResponse(status_code=404, body={"error": {"code": "CollectionNotFound"}})
+            moved = []
+            for guid in json.loads(data)["entityGuids"]:
+                asset = self._parse_guid(guid)
+                if self.flaky_guids.get(guid, 0) > 0:
+                    self.flaky_guids[guid] -= 1
+                elif asset is not None and asset[0] != target and self._delete_asset(*asset):
+                    # the moved asset gets a new guid in the target collection
+                    self._asset_counts[target] = self._asset_counts.get(target, 0) + 1
+                    moved.append({"guid": guid})
+            return FakeResponse(body={"mutatedEntities": {"UPDATE": moved}})
+        if path == "/catalog/api/atlas/v2/entity/bulk":
+            deleted = []
+            for guid in parse_qs(parsed.query).get("guid", []):
+                asset = self._parse_guid(guid)
+                if self.flaky_guids.get(guid, 0) > 0:
+                    self.flaky_guids[guid] -= 1
+                elif asset is not None and self._delete_asset(*asset):
+                    deleted.append({"guid": guid})
+            return FakeResponse(body={"mutatedEntities": {"DELETE": deleted}})
+        return FakeResponse(status_code=404, body={"error": path})
+
+
+class FakeSession:
+    """requests.Session stand-in that sends every request to a FakePurview.
+
+    Pass it into HttpTransport(session=...) to run the real retry and
+    rate limiting logic against the fake.
+    """
+
+    def __init__(self, purview: FakePurview) -> None:
+        self.purview = purview
+
+    def mount(self, prefix, adapter) -> None:
+        pass
+
+    def request(self, method, url, headers=None, data=None, timeout=None) -> FakeResponse:
+        return self.purview.request(method, url, headers=headers, data=data, timeout=timeout)
+
+    def close(self) -> None:
+        pass
+
+
+class AsyncFakePurview(FakePurview):
+    """FakePurview for AsyncPurviewCollections (the request is awaited)."""
+
+    async def request(self, method, url, headers=None, data=None, timeout=None) -> FakeResponse:
+        """Same signature as AsyncHttpTransport.request."""
+        await asyncio.sleep(self.latency)
+        return self.handle(method, url, data, headers)
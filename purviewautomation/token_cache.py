@@ -0,0 +1,102 @@
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, Optional, Tuple
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+class FileTokenCache:
+    """On-disk access token cache shared by every process on the host.
+
+    Tokens are stored in a JSON file (readable only by the current user)
+    keyed by tenant, client and resource. Updates hold an exclusive file
+    lock, so when multiple processes need a new token at the same time,
+    only one of them requests it and the others read it from the cache.
+
+    Pass it into ServicePrincipalAuthentication or AzIdentityAuthentication
+    with the token_cache parameter.
+
+    Attributes:
+        path: Path of the cache file. If None, defaults to
+            ~/.purviewautomation/token_cache.json.
+
+    Returns:
+        FileTokenCache object
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        if path is None:
+            path = os.path.join(os.path.expanduser("~"), ".purviewautomation", "token_cache.json")
+        self.path = path
+        self._lock_path = f"{path}.lock"
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """Holds an exclusive lock on the cache across processes."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        with open(self._lock_path, "a+b") as lock_file:
+            if os.name == "nt":
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            else:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if os.name == "nt":
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+                else:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _read(self) -> Dict[str, Dict]:
+        """
+        Internal helper function. Do not call directly.
+        """
+        try:
+            with open(self.path, encoding="utf-8") as cache_file:
+                return json.load(cache_file)
+        except (OSError, ValueError):
+            # missing or corrupt cache. The token is requested again.
+            return {}
+
+    def get(self, key: str) -> Optional[Tuple[str, datetime]]:
+        """Returns the cached (access token, expiration) or None.
+
+        Expired tokens are never returned.
+        """
+        entry = self._read().get(key)
+        if entry is None:
+            return None
+        expiration = datetime.fromtimestamp(entry["expires_on"])
+        if expiration <= datetime.now():
+            return None
+        return entry["access_token"], expiration
+
+    def set(self, key: str, access_token: str, expiration: datetime) -> None:
+        """Saves the access token. Call it while holding lock()."""
+        now = datetime.now().timestamp()
+        cache = {
+            cache_key: entry
+            for cache_key, entry in self._read().items()
+            if isinstance(entry, dict) and entry.get("expires_on", 0) > now
+        }
+        cache[key] = {"access_token": access_token, "expires_on": expiration.timestamp()}
+
+        directory = os.path.dirname(self.path) or "."
+        file_descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix=".token_cache.")
+        try:
+            with os.fdopen(file_descriptor, "w", encoding="utf-8") as temp_file:
+                json.dump(cache, temp_file)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
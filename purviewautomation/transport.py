@@ -0,0 +1,319 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+class RetryPolicy:
+    """When and how long to wait before retrying a request.
+
+    Uses exponential backoff with full jitter and honors the
+    Retry-After header returned with throttled (429) and
+    unavailable (503) responses.
+
+    Attributes:
+        total: Max number of retries. 0 disables retries.
+        backoff_factor: Base number of seconds for the backoff.
+            The backoff is backoff_factor * 2 ** retry number.
+        max_backoff: Max number of seconds to wait between retries.
+        status_forcelist: Status codes that are retried.
+        respect_retry_after: If True, waits for the Retry-After
+            header value when it's returned.
+        jitter: If True, waits a random time between 0 and the backoff.
+
+    Returns:
+        RetryPolicy object
+    """
+
+    def __init__(
+        self,
+        total: int = 5,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 60,
+        status_forcelist: Iterable[int] = (429, 500, 502, 503, 504),
+        respect_retry_after: bool = True,
+        jitter: bool = True,
+    ) -> None:
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.status_forcelist = frozenset(status_forcelist)
+        self.respect_retry_after = respect_retry_after
+        self.jitter = jitter
+
+    def should_retry(self, retries: int, response: Optional[requests.Response] = None) -> bool:
+        """Returns True if the request should be retried.
+
+        Args:
+            retries: Number of retries already made.
+            response: The response. If None, the request raised a
+                connection or timeout error.
+        """
+        if retries >= self.total:
+            return False
+        return response is None or response.status_code in self.status_forcelist
+
+    def _retry_after(self, response: Optional[requests.Response]) -> Optional[float]:
+        """
+        Internal helper function. Do not call directly.
+        """
+        if response is None or not self.respect_retry_after:
+            return None
+        value = response.headers.get("Retry-After")
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+
+    def get_backoff(self, retries: int, response: Optional[requests.Response] = None) -> float:
+        """Returns how many seconds to wait before the next retry.
+
+        Args:
+            retries: Number of retries already made.
+            response: The response that's being retried.
+        """
+        retry_after = self._retry_after(response)
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        backoff = min(self.backoff_factor * (2**retries), self.max_backoff)
+        return random.uniform(0, backoff) if self.jitter else backoff
+
+
+class AdaptiveRateLimiter:
+    """Client side rate limiter that adapts to throttling.
+
+    Spaces requests out to the current rate. The rate is cut by
+    decrease_factor when a request is throttled (429) and grows back
+    by about increase requests per second for every second of
+    successful requests, up to max_rate. The rate is cut at most once
+    per cooldown, so a burst of throttled requests only counts once.
+
+    Attributes:
+        rate: Current number of requests allowed per second.
+        min_rate: Lowest rate the limiter slows down to.
+        max_rate: Highest rate the limiter speeds back up to.
+        increase: Requests per second added back per second of
+            successful requests.
+        decrease_factor: Multiplier applied to the rate when throttled.
+        cooldown: Seconds after a cut during which throttled
+            requests don't cut the rate again.
+
+    Returns:
+        AdaptiveRateLimiter object
+    """
+
+    def __init__(
+        self,
+        max_rate: float = 100,
+        min_rate: float = 1,
+        increase: float = 1,
+        decrease_factor: float = 0.5,
+        cooldown: float = 1,
+    ) -> None:
+        self.rate = max_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self._next_request = time.monotonic()
+        self._last_cut = None
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Reserves the next request slot.
+
+        Returns:
+            Number of seconds to wait before sending the request.
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._next_request - now)
+            self._next_request = max(now, self._next_request) + 1 / self.rate
+        return wait
+
+    def acquire(self) -> None:
+        """Waits until the next request is allowed."""
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+
+    def on_success(self) -> None:
+        """Speeds back up after a successful request."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+
+    def on_throttle(self) -> None:
+        """Slows down after a throttled request.
+
+        Throttles within the cooldown of the last cut are ignored.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._last_cut is not None and now - self._last_cut < self.cooldown:
+                return
+            self._last_cut = now
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+
+
+class HttpTransport:
+    """Pooled HTTP transport used for every Purview API call.
+
+    Keeps connections to each Purview host alive between calls instead of
+    opening a new TCP/TLS connection per request. One transport can be shared
+    by multiple clients.
+
+    Throttled (429), unavailable (5xx) and failed connections are retried
+    with the retry policy. Every host gets its own AdaptiveRateLimiter, which
+    slows down when the host throttles and speeds back up afterwards.
+    Purview calls made by this library are safe to retry.
+
+    A custom transport can be passed into PurviewCollections (ex: for testing).
+    It only needs a request(method, url, headers, data, timeout) method that
+    returns a requests.Response like object (status_code, content, headers,
+    json() and raise_for_status()).
+
+    Attributes:
+        pool_connections: Number of host connection pools to keep.
+        pool_maxsize: Max number of connections kept alive per host.
+        pool_block: If True, waits for a free connection when a host's pool
+            is full instead of opening an extra (not pooled) connection.
+        timeout: Default timeout in seconds. Either a single value
+            or a (connect timeout, read timeout) tuple.
+        session: The underlying requests.Session.
+        retry_policy: When and how long to wait before retrying.
+            If None, uses the default RetryPolicy.
+        max_rate: Max requests per second per host. The rate adapts
+            between 1 and max_rate. If None, requests aren't rate limited.
+        request_slots: Semaphore taken for every HTTP attempt and released
+            before any retry or rate limiter wait. Share one between
+            transports to cap their requests in flight. If None, only the
+            callers limit the requests in flight.
+
+    Returns:
+        HttpTransport object
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        timeout: Optional[Timeout] = (10, 120),
+        session: Optional[requests.Session] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        max_rate: Optional[float] = 100,
+        request_slots: Optional[threading.Semaphore] = None,
+    ) -> None:
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.timeout = timeout
+        self.session = session if session is not None else requests.Session()
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.max_rate = max_rate
+        self.request_slots = request_slots
+        self._rate_limiters = {}
+        self._rate_limiters_lock = threading.Lock()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        data: Optional[Union[str, bytes]] = None,
+        timeout: Optional[Timeout] = None,
+    ) -> requests.Response:
+        """Sends a request using the pooled session.
+
+        Retries the request based on the retry policy.
+
+        Args:
+            method: HTTP method. Ex: "GET".
+            url: Full url to call.
+            headers: Headers to send.
+            data: Request body.
+            timeout: If None, uses the transport's default timeout.
+
+        Returns:
+            requests.Response object.
+        """
+        if timeout is None:
+            timeout = self.timeout
+        rate_limiter = self.rate_limiter(url)
+
+        retries = 0
+        while True:
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+            try:
+                response = self._send(method, url, headers, data, timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if not self.retry_policy.should_retry(retries):
+                    raise
+                time.sleep(self.retry_policy.get_backoff(retries))
+                retries += 1
+                continue
+
+            if rate_limiter is not None:
+                if response.status_code == 429:
+                    rate_limiter.on_throttle()
+                elif response.status_code < 500:
+                    rate_limiter.on_success()
+
+            if not self.retry_policy.should_retry(retries, response):
+                response.retries = retries
+                return response
+            time.sleep(self.retry_policy.get_backoff(retries, response))
+            retries += 1
+
+    def _send(
+        self, method: str, url: str, headers: Optional[Dict[str, str]], data: Optional[Union[str, bytes]], timeout
+    ) -> requests.Response:
+        """
+        Internal helper function. Do not call directly.
+        """
+        if self.request_slots is None:
+            return self.session.request(method=method, url=url, headers=headers, data=data, timeout=timeout)
+        with self.request_slots:
+            return self.session.request(method=method, url=url, headers=headers, data=data, timeout=timeout)
+
+    def rate_limiter(self, url: str) -> Optional[AdaptiveRateLimiter]:
+        """Returns the rate limiter for the url's host.
+
+        Returns None if max_rate is None.
+        """
+        if self.max_rate is None:
+            return None
+        host = urlparse(url).netloc
+        with self._rate_limiters_lock:
+            if host not in self._rate_limiters:
+                self._rate_limiters[host] = AdaptiveRateLimiter(max_rate=self.max_rate)
+            return self._rate_limiters[host]
+
+    def close(self) -> None:
+        """Closes all of the pooled connections."""
+        self.session.close()
+
+    def __enter__(self) -> "HttpTransport":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
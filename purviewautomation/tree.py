@@ -0,0 +1,339 @@
+from collections import deque
+from copy import deepcopy
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+class CollectionNode:
+    """One collection in a CollectionTree.
+
+    Attributes:
+        name: Actual (under the hood) collection name.
+        friendly_name: Friendly (display) collection name.
+        parent_name: Actual name of the parent collection.
+            None for the root collection.
+        parent: Parent CollectionNode. None for the root collection or
+            if the parent isn't visible to the caller.
+        children: Child CollectionNodes.
+        raw: The collection info returned by the Purview API.
+    """
+
+    __slots__ = ("name", "friendly_name", "parent_name", "parent", "children", "raw")
+
+    def __init__(self, raw: Dict) -> None:
+        self.name = raw["name"]
+        self.friendly_name = raw["friendlyName"]
+        parent_collection = raw.get("parentCollection")
+        self.parent_name = parent_collection["referenceName"] if parent_collection else None
+        self.parent = None
+        self.children = []
+        self.raw = raw
+
+    @property
+    def depth(self) -> int:
+        """Number of ancestors above the collection (the root is 0)."""
+        depth = 0
+        node = self.parent
+        while node is not None:
+            depth += 1
+            node = node.parent
+        return depth
+
+    def __repr__(self) -> str:
+        return f"CollectionNode(name={self.name!r}, friendly_name={self.friendly_name!r})"
+
+
+class CollectionTree:
+    """Indexed collection hierarchy built from one collections listing.
+
+    Lookups by actual name, by friendly name, parent and children
+    don't scan the collections.
+
+    Args:
+        collections: Collections returned from list_collections().
+
+    Returns:
+        CollectionTree object
+    """
+
+    def __init__(self, collections: Iterable[Dict] = ()) -> None:
+        self._nodes = {}
+        self._friendly_names = {}
+        self._orphans = {}
+        for coll in collections:
+            node = CollectionNode(coll)
+            self._nodes[node.name] = node
+            self._friendly_names.setdefault(node.friendly_name, []).append(node)
+        for node in self._nodes.values():
+            self._link(node)
+
+    def _link(self, node: CollectionNode) -> None:
+        """
+        Internal helper function. Do not call directly.
+        """
+        parent = self._nodes.get(node.parent_name) if node.parent_name else None
+        node.parent = parent
+        if parent is not None:
+            parent.children.append(node)
+        elif node.parent_name:
+            # parent isn't visible (yet). Linked if it's added later.
+            self._orphans.setdefault(node.parent_name, []).append(node)
+
+    def _unlink(self, node: CollectionNode) -> None:
+        """
+        Internal helper function. Do not call directly.
+        """
+        if node.parent is not None:
+            node.parent.children.remove(node)
+            node.parent = None
+        elif node.parent_name in self._orphans:
+            self._orphans[node.parent_name].remove(node)
+            if not self._orphans[node.parent_name]:
+                del self._orphans[node.parent_name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._nodes
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __iter__(self) -> Iterator[CollectionNode]:
+        return iter(self._nodes.values())
+
+    def __getitem__(self, name: str) -> CollectionNode:
+        return self._nodes[name]
+
+    def get(self, name: str) -> Optional[CollectionNode]:
+        """Returns the node for the actual name or None."""
+        return self._nodes.get(name)
+
+    def find_by_friendly_name(self, friendly_name: str) -> List[CollectionNode]:
+        """Returns every node with the friendly name (can be more than one)."""
+        return list(self._friendly_names.get(friendly_name, ()))
+
+    def parent(self, name: str) -> Optional[CollectionNode]:
+        """Returns the parent node of the actual name."""
+        return self._nodes[name].parent
+
+    def children(self, name: str) -> List[CollectionNode]:
+        """Returns the child nodes of the actual name."""
+        return list(self._nodes[name].children)
+
+    def depth(self, name: str) -> int:
+        """Returns the depth of the actual name (the root is 0)."""
+        return self._nodes[name].depth
+
+    def path(self, name: str, friendly: bool = True) -> str:
+        """Returns the full path from the root to the collection.
+
+        Args:
+            name: Actual collection name.
+            friendly: If True, the path uses friendly names.
+                Otherwise uses actual names.
+
+        Returns:
+            Path string. Ex: 'root/parent/child'
+        """
+        parts = []
+        node = self._nodes[name]
+        while node is not None:
+            parts.append(node.friendly_name if friendly else node.name)
+            node = node.parent
+        return "/".join(reversed(parts))
+
+    def iter_bfs(self, name: str, include_start: bool = False) -> Iterator[CollectionNode]:
+        """Yields the collections under the actual name level by level.
+
+        Args:
+            name: Actual name of the collection to start on.
+            include_start: If True, the start collection is yielded first.
+
+        Returns:
+            Iterator of CollectionNodes (breadth first).
+        """
+        start = self._nodes[name]
+        if include_start:
+            yield start
+        queue = deque(start.children)
+        while queue:
+            node = queue.popleft()
+            yield node
+            queue.extend(node.children)
+
+    def iter_dfs(self, name: str, include_start: bool = False) -> Iterator[CollectionNode]:
+        """Yields the collections under the actual name branch by branch.
+
+        Args:
+            name: Actual name of the collection to start on.
+            include_start: If True, the start collection is yielded first.
+
+        Returns:
+            Iterator of CollectionNodes (depth first, parents before children).
+        """
+        start = self._nodes[name]
+        if include_start:
+            yield start
+        stack = list(reversed(start.children))
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    def descendants(self, name: str) -> List[CollectionNode]:
+        """Returns every collection under the actual name (breadth first)."""
+        return list(self.iter_bfs(name))
+
+    def leaf_first_levels(self, name: str, include_start: bool = False) -> List[List[CollectionNode]]:
+        """Groups the collections under the actual name into leaf first levels.
+
+        The first level has the leaf collections. Every later level only has
+        collections whose children are all in earlier levels, so deleting
+        level by level never deletes a collection that still has children.
+
+        Args:
+            name: Actual name of the collection to start on.
+            include_start: If True, the start collection is included
+                (always in the last level).
+
+        Returns:
+            List of levels. Each level is a list of CollectionNodes.
+        """
+        nodes = list(self.iter_bfs(name, include_start=include_start))
+        heights = {}
+        for node in reversed(nodes):
+            heights[node.name] = 1 + max((heights[child.name] for child in node.children), default=-1)
+
+        levels = [[] for _ in range(max(heights.values(), default=-1) + 1)]
+        for node in nodes:
+            levels[heights[node.name]].append(node)
+        return levels
+
+    def leaf_first(self, name: str, include_start: bool = False) -> List[CollectionNode]:
+        """Returns the collections under the actual name, children before parents."""
+        return [node for level in self.leaf_first_levels(name, include_start=include_start) for node in level]
+
+    def add(self, collection: Dict) -> CollectionNode:
+        """Adds or updates a collection.
+
+        Args:
+            collection: Collection info in the same shape
+                the Purview API returns.
+
+        Returns:
+            The added or updated CollectionNode.
+        """
+        node = self._nodes.get(collection["name"])
+        if node is None:
+            node = CollectionNode(collection)
+            self._nodes[node.name] = node
+            self._friendly_names.setdefault(node.friendly_name, []).append(node)
+            for child in self._orphans.pop(node.name, []):
+                child.parent = node
+                node.children.append(child)
+            self._link(node)
+            return node
+
+        updated = CollectionNode(collection)
+        if updated.friendly_name != node.friendly_name:
+            self._friendly_names[node.friendly_name].remove(node)
+            if not self._friendly_names[node.friendly_name]:
+                del self._friendly_names[node.friendly_name]
+            node.friendly_name = updated.friendly_name
+            self._friendly_names.setdefault(node.friendly_name, []).append(node)
+        if updated.parent_name != node.parent_name:
+            self._unlink(node)
+            node.parent_name = updated.parent_name
+            self._link(node)
+        node.raw = collection
+        return node
+
+    def remove(self, name: str) -> None:
+        """Removes a collection. Does nothing if it doesn't exist."""
+        node = self._nodes.pop(name, None)
+        if node is None:
+            return
+        self._unlink(node)
+        self._friendly_names[node.friendly_name].remove(node)
+        if not self._friendly_names[node.friendly_name]:
+            del self._friendly_names[node.friendly_name]
+        for child in node.children:
+            child.parent = None
+        if node.children:
+            self._orphans.setdefault(name, []).extend(node.children)
+        node.children = []
+
+    def copy(self) -> "CollectionTree":
+        """Returns an independent copy of the tree."""
+        return CollectionTree(node.raw for node in self._nodes.values())
+
+    def collections(self) -> List[Dict]:
+        """Returns a copy of the collection info as returned by the Purview API.
+
+        Changing the returned dictionaries doesn't change the tree.
+        """
+        return deepcopy([node.raw for node in self._nodes.values()])
+
+    def names(self) -> Dict[str, Dict[str, Optional[str]]]:
+        """Returns the actual, friendly and parent collection names.
+
+        Same shape as list_collections(only_names=True).
+        """
+        return {
+            node.name: {"friendlyName": node.friendly_name, "parentCollection": node.parent_name}
+            for node in self._nodes.values()
+        }
+
+    def resolve(self, collection_name: str, force_actual_name: bool = False) -> str:
+        """Returns the actual name from a friendly or actual name.
+
+        Args:
+            collection_name: Name to check.
+            force_actual_name: Edge case. If True, will check if the
+                actual name is the name passed in. Useful if there
+                are multiple friendly names.
+
+        Returns:
+            The actual name of the collection.
+
+        Raises:
+            If the collection doesn't exist, will raise an error
+                that no collection exists.
+            If multiple friendly names exist, will raise an error
+                listing the multiple friendly names.
+        """
+        friendly_names = self._friendly_names.get(collection_name, [])
+        exists = collection_name in self._nodes
+
+        if not exists and len(friendly_names) == 0:
+            err_msg = (
+                "collection_name parameter value error. "
+                f"The collection '{collection_name}' either doesn't exist or your don't have permission to start on it. "
+                "If you're trying to create a child collection, would need to be a collection admin on that collection "
+                "if it exists. Name is case sensitive."
+            )
+            raise ValueError(err_msg)
+        elif not exists and len(friendly_names) == 1:
+            return friendly_names[0].name
+        elif exists and len(friendly_names) <= 1:
+            return collection_name
+
+        if force_actual_name:
+            for node in friendly_names:
+                if node.name == collection_name:
+                    return collection_name
+
+        multiple_friendly_names = []
+        for node in friendly_names:
+            parent = self._nodes.get(node.parent_name)
+            parent_friendly_name = parent.friendly_name if parent is not None else node.parent_name
+            friendly_output = f"{node.name}: [collection info: actual_name: {node.name}, friendlyName: {node.friendly_name}, parentCollection: {parent_friendly_name}]"
+            multiple_friendly_names.append(friendly_output)
+        newline = "\n"
+        err_msg = (
+            f"Multiple collections exist with the friendly name '{collection_name}'. "
+            f"Please choose and re-enter the first item from one of the options below in place of '{collection_name}': "
+            f"{newline}{newline.join(map(str, multiple_friendly_names))} {newline}"
+            f"If you want to use the collection name '{collection_name}' and it's listed as an option above as "
+            f"a first item (actual_name), add the force_actual_name parameter to True. "
+            "Ex: force_actual_name=True"
+        )
+        raise ValueError(err_msg)
@@ -0,0 +1,29 @@
+import pytest
+
+from purviewautomation import AsyncPurviewCollections, PurviewCollections
+from purviewautomation.testing import AsyncFakePurview, FakeAuth, FakePurview
+
+
+@pytest.fixture
+def make_client():
+    """Returns a factory for a client and the FakePurview it calls.
+
+    The factory takes the collections to add to a new FakePurview as
+    (name, friendlyName, parent) tuples, the number of assets to add by
+    collection and the FakePurview page_size. Pass in purview to make
+    another client for an existing FakePurview instead. If asynchronous
+    is True, makes an AsyncPurviewCollections and AsyncFakePurview.
+    Every other keyword is passed into the client.
+    """
+
+    def make(collections=(), assets=None, purview=None, page_size=None, asynchronous=False, auth=None, **kwargs):
+        if purview is None:
+            purview = (AsyncFakePurview if asynchronous else FakePurview)("account", page_size=page_size)
+            for collection in collections:
+                purview.add_collection(*collection)
+            for name, count in (assets or {}).items():
+                purview.add_assets(name, count)
+        client_class = AsyncPurviewCollections if asynchronous else PurviewCollections
+        return client_class("account", auth or FakeAuth(), transport=purview, **kwargs), purview
+
+    return make
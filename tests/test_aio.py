@@ -0,0 +1,95 @@
+import asyncio
+
+LIST_PATH = "/account/collections"
+
+
+class FakeAsyncAuth:
+    def __init__(self):
+        self.calls = 0
+
+    async def get_access_token(self):
+        self.calls += 1
+        return "fake-token"
+
+
+def test_list_collections_is_cached(make_client):
+    client, transport = make_client(asynchronous=True, auth=FakeAsyncAuth(), page_size=2)
+    transport.add_collection("one", "one", "account")
+    transport.add_collection("two", "two", "account")
+
+    async def run():
+        return await asyncio.gather(*(client.list_collections(only_names=True) for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert all(set(result) == {"account", "one", "two"} for result in results)
+    assert transport.count("GET", LIST_PATH) == 2
+
+
+def test_create_and_delete_recursively(make_client):
+    client, transport = make_client(asynchronous=True)
+    paths = [f"dept{i}/team{i}/project{i}" for i in range(10)]
+
+    async def run():
+        created = await client.create_collections("account", ["top"])
+        created += await client.create_collections("top", paths, max_workers=4)
+        deleted = await client.delete_collections_recursively("top", also_delete_first_collection=True)
+        return created, deleted
+
+    created, deleted = asyncio.run(run())
+    assert len(created) == 31 and all(result["error"] is None for result in created)
+    assert [result["level"] for result in created[1:]] == sorted(result["level"] for result in created[1:])
+    assert len(deleted) == 31 and all(result["error"] is None for result in deleted)
+    assert set(transport.collections) == {"account"}
+
+
+def test_delete_collection_assets(make_client):
+    client, transport = make_client(asynchronous=True, auth=FakeAsyncAuth())
+
+    async def run():
+        await client.create_collections("account", ["assets1", "assets2"])
+        transport.add_assets("assets1", 1200)
+        transport.add_assets("assets2", 30)
+        transport.flaky_guids["assets1-asset-5"] = 1
+        return await client.delete_collection_assets(["assets1", "assets2"], batch_size=50)
+
+    stats = asyncio.run(run())
+    assert stats["assets1"]["deleted"] == 1200
+    assert stats["assets2"]["deleted"] == 30
+    assert stats["assets1"]["completed"] is True
+    assert not transport.assets
+
+
+def test_delete_recursively_with_assets_bounds_concurrency(make_client):
+    client, transport = make_client(asynchronous=True)
+    transport.latency = 0.005
+    transport.add_collection("top", "top", "account")
+    for i in range(8):
+        transport.add_collection(f"leaf{i}", f"leaf{i}", "top")
+        transport.add_assets(f"leaf{i}", 200)
+    running = peak = 0
+    request = transport.request
+
+    async def counting_request(*args, **kwargs):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        try:
+            return await request(*args, **kwargs)
+        finally:
+            running -= 1
+
+    transport.request = counting_request
+    results = asyncio.run(client.delete_collections_recursively("top", delete_assets=True, max_workers=3))
+    assert all(result["error"] is None for result in results)
+    assert not transport.assets
+    assert peak <= 6
+
+
+def test_extract_collections_returns_the_same_as_the_sync_client(make_client, capsys):
+    collections = [("parent", "parent", "account"), ("child", "child", "parent")]
+    client, _ = make_client(collections, asynchronous=True)
+    sync_client, _ = make_client(collections)
+
+    code = asyncio.run(client.extract_collections("account"))
+    assert code == sync_client.extract_collections("account")
+    assert "start_collection='parent', collection_names='child'" in code[-1]
@@ -0,0 +1,131 @@
+import asyncio
+
+import pytest
+
+from purviewautomation import MetricsCollector
+
+SALES = [("sales", "Sales", "account")]
+TREE = [
+    ("top", "Top", "account"),
+    ("left", "Left", "top"),
+    ("leftleaf", "Left Leaf", "left"),
+    ("right", "Right", "top"),
+]
+TREE_ASSETS = {"top": 1, "left": 10, "leftleaf": 100, "right": 1000}
+
+
+@pytest.mark.parametrize("continuation_tokens", [True, False])
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_iter_collection_assets_pages(make_client, continuation_tokens, prefetch):
+    metrics = MetricsCollector(keep_events=True)
+    client, purview = make_client(SALES, {"sales": 35}, instrumentation=metrics)
+    purview.continuation_tokens = continuation_tokens
+    assets = list(client.iter_collection_assets("Sales", page_size=10, prefetch=prefetch))
+    assert [asset["id"] for asset in assets] == [f"sales-asset-{index}" for index in range(35)]
+    assert purview.count("POST", "/catalog/api/search/query") == 4
+    # the listing used to resolve the name and every search page belong to the operation
+    operation = metrics.summary()["operations"]["iter_collection_assets"]
+    assert (operation["calls"], operation["requests"], operation["errors"]) == (1, 5, 0)
+    searches = [event for event in metrics.events if getattr(event, "endpoint", None) == "search_assets"]
+    assert {event.operation for event in searches} == {"iter_collection_assets"}
+
+
+def test_iter_collection_assets_projection_and_filters(make_client):
+    client, purview = make_client(SALES, {"sales": 35})
+    assets = client.iter_collection_assets("sales", fields=["id", "entityType"], page_size=20)
+    assert next(assets) == {"id": "sales-asset-0", "entityType": "azure_datalake_gen2_path"}
+    assert len(list(assets)) == 34
+
+    assert list(client.iter_collection_assets("sales", filters={"entityType": "azure_sql_table"})) == []
+    matching = client.iter_collection_assets("sales", filters={"entityType": "azure_datalake_gen2_path"})
+    assert len(list(matching)) == 35
+
+
+def test_iter_collection_assets_is_lazy(make_client):
+    metrics = MetricsCollector()
+    client, purview = make_client(SALES, {"sales": 35}, instrumentation=metrics)
+    assets = client.iter_collection_assets("sales", page_size=10)
+    assert metrics.summary()["operations"] == {}
+    next(assets)
+    assert purview.count("POST", "/catalog/api/search/query") == 1
+    # the operation ends when the caller stops iterating
+    assets.close()
+    assert metrics.summary()["operations"]["iter_collection_assets"]["calls"] == 1
+
+
+def test_async_iter_collection_assets(make_client):
+    metrics = MetricsCollector()
+    client, purview = make_client(SALES, {"sales": 25}, asynchronous=True, instrumentation=metrics)
+
+    async def run():
+        return [asset async for asset in client.iter_collection_assets("Sales", page_size=10, fields=["id"])]
+
+    assets = asyncio.run(run())
+    assert assets == [{"id": f"sales-asset-{index}"} for index in range(25)]
+    assert purview.count("POST", "/catalog/api/search/query") == 3
+    assert metrics.summary()["operations"]["iter_collection_assets"]["requests"] == 4
+
+
+@pytest.mark.parametrize("facets", [True, False])
+def test_count_collection_assets_rolls_up(make_client, facets):
+    client, purview = make_client(TREE, TREE_ASSETS)
+    purview.facets = facets
+    counts = client.count_collection_assets("Top", batch_size=3)
+    assert list(counts) == ["top", "left", "right", "leftleaf"]
+    assert counts["top"] == {"friendlyName": "Top", "assets": 1, "total": 1111}
+    assert counts["left"] == {"friendlyName": "Left", "assets": 10, "total": 110}
+    assert counts["leftleaf"]["total"] == 100
+    searches = purview.count("POST", "/catalog/api/search/query")
+    assert searches == (2 if facets else 5)
+
+
+def test_count_collection_assets_only_the_collection(make_client):
+    client, purview = make_client(TREE, TREE_ASSETS)
+    assert client.count_collection_assets("left", include_children=False) == {
+        "left": {"friendlyName": "Left", "assets": 10, "total": 10}
+    }
+    counts = client.count_collection_assets("top", filters={"entityType": "azure_sql_table"})
+    assert counts["top"]["total"] == 0
+
+
+def test_async_count_collection_assets(make_client):
+    client, purview = make_client(
+        [("top", "Top", "account"), ("child", "Child", "top")], {"child": 7}, asynchronous=True
+    )
+    counts = asyncio.run(client.count_collection_assets("top"))
+    assert counts == {
+        "top": {"friendlyName": "Top", "assets": 0, "total": 7},
+        "child": {"friendlyName": "Child", "assets": 7, "total": 7},
+    }
+
+
+def test_move_collection_assets(make_client):
+    client, purview = make_client(TREE, TREE_ASSETS)
+    purview.flaky_guids["right-asset-3"] = 1
+    updates = []
+    stats = client.move_collection_assets("Right", "Left", batch_size=50, progress=updates.append)
+    assert stats["moved"] == 1000 and stats["failed"] == 0 and stats["completed"]
+    assert stats["targetFriendlyName"] == "Left"
+    assert purview.asset_count("right") == 0
+    assert purview.asset_count("left") == 1010
+    assert len(updates) == 21
+    assert updates[-1]["moved"] == 1000
+    assert purview.count("POST", "/catalog/api/entity/moveTo") == 21
+
+
+def test_move_collection_assets_validates_batch_size(make_client):
+    client, purview = make_client(TREE, TREE_ASSETS)
+    with pytest.raises(ValueError, match="more than 50"):
+        client.move_collection_assets("right", "left", batch_size=100)
+    stats = client.move_collection_assets("right", "left", filters={"entityType": "azure_sql_table"})
+    assert stats["moved"] == 0 and stats["completed"]
+    assert purview.asset_count("right") == 1000
+
+
+def test_async_move_collection_assets(make_client):
+    client, purview = make_client(
+        [("old", "Old", "account"), ("new", "New", "account")], {"old": 120}, asynchronous=True
+    )
+    stats = asyncio.run(client.move_collection_assets("Old", "New"))
+    assert stats["moved"] == 120 and stats["completed"]
+    assert purview.asset_count("new") == 120
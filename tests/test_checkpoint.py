@@ -0,0 +1,148 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from purviewautomation import DeleteCheckpoint
+
+TREE = [
+    ("top", "top", "account"),
+    ("left", "left", "top"),
+    ("leftleaf", "leftleaf", "left"),
+    ("right", "right", "top"),
+]
+
+
+def test_recursive_delete_resumes_from_checkpoint(make_client, tmp_path):
+    client, purview = make_client(TREE)
+    path = str(tmp_path / "job.jsonl")
+    purview.fail_names.add("left")
+    results = client.delete_collections_recursively("top", also_delete_first_collection=True, checkpoint=path)
+    assert {result["name"] for result in results if result["error"] is None} == {"leftleaf", "right"}
+
+    checkpoint = DeleteCheckpoint(path)
+    assert checkpoint.load()
+    assert checkpoint.completed == {"leftleaf", "right"}
+    assert checkpoint.remaining().names() == ["left", "top"]
+
+    purview.fail_names.clear()
+    calls = len(purview.calls)
+    results = client.delete_collections_recursively("top", also_delete_first_collection=True, checkpoint=path)
+    assert [result["name"] for result in results] == ["left", "top"]
+    assert purview.calls[calls:] == [
+        ("DELETE", "/account/collections/left"),
+        ("DELETE", "/account/collections/top"),
+    ]
+    assert "top" not in purview.collections
+    assert not (tmp_path / "job.jsonl").exists()
+
+
+def test_resume_treats_unrecorded_deletes_as_deleted(make_client, tmp_path):
+    client, purview = make_client(TREE)
+    path = tmp_path / "job.jsonl"
+    purview.fail_names.add("left")
+    client.delete_collections_recursively("top", also_delete_first_collection=True, checkpoint=str(path))
+    assert "leftleaf" not in purview.collections
+
+    # the process died before the deletes were recorded
+    path.write_text(path.read_text().splitlines()[0] + "\n")
+    purview.fail_names.clear()
+    results = client.delete_collections_recursively("top", also_delete_first_collection=True, checkpoint=str(path))
+    assert sorted((result["name"], result["status_code"], result["error"]) for result in results) == [
+        ("left", 204, None),
+        ("leftleaf", 404, None),
+        ("right", 404, None),
+        ("top", 204, None),
+    ]
+    assert "top" not in purview.collections
+    assert not path.exists()
+
+
+def test_checkpoint_for_another_job(make_client, tmp_path):
+    client, purview = make_client(TREE)
+    path = str(tmp_path / "job.jsonl")
+    DeleteCheckpoint(path).start({"operation": "delete_collections_recursively", "collection_names": ["left"]})
+    with pytest.raises(ValueError, match="different job"):
+        client.delete_collections_recursively("top", checkpoint=path)
+    assert len(purview.collections) == 5
+
+
+def test_checkpoint_ignores_cut_off_line(tmp_path):
+    path = tmp_path / "job.jsonl"
+    checkpoint = DeleteCheckpoint(str(path))
+    checkpoint.start({"operation": "delete_collection_assets", "collections": ["left"]})
+    checkpoint.add_batch("left", ["a", "b"])
+    checkpoint.add_batch("left", ["c"])
+    checkpoint.remove_batch("left", ["a", "b"])
+    with open(path, "a", encoding="utf-8") as checkpoint_file:
+        checkpoint_file.write('{"event": "assets_comp')
+
+    checkpoint = DeleteCheckpoint(str(path))
+    assert checkpoint.load()
+    assert checkpoint.batches("left") == [["c"]]
+    checkpoint.mark_assets_completed("left")
+    assert DeleteCheckpoint(str(path)).load()
+    reloaded = DeleteCheckpoint(str(path))
+    reloaded.load()
+    assert reloaded.assets_completed == {"left"}
+    assert json.loads(path.read_text().splitlines()[0])["plan"] is None
+
+
+def test_purge_resumes_from_checkpoint(make_client, tmp_path):
+    client, purview = make_client(TREE)
+    purview.add_assets("left", 30)
+    purview.add_assets("right", 20)
+    path = str(tmp_path / "purge.jsonl")
+    checkpoint = DeleteCheckpoint(path)
+    checkpoint.start({"operation": "delete_collection_assets", "collections": ["left", "right"]})
+    checkpoint.mark_assets_completed("right")
+    # a batch that was sent before the process died (already deleted)
+    purview.handle("DELETE", "https://account.purview.azure.com/catalog/api/atlas/v2/entity/bulk?guid=left-asset-0")
+    checkpoint.add_batch("left", ["left-asset-0", "left-asset-1"])
+
+    results = client.delete_collection_assets(["left", "right"], batch_size=10, checkpoint=path)
+    assert list(results) == ["left"]
+    assert results["left"]["completed"] and results["left"]["failed"] == 0
+    assert results["left"]["deleted"] == 29
+    assert ("POST", "/catalog/api/search/query") in purview.calls
+    assert purview.asset_count("left") == 0
+    assert purview.asset_count("right") == 20
+    assert not (tmp_path / "purge.jsonl").exists()
+
+
+def test_async_recursive_delete_resumes(make_client, tmp_path):
+    client, purview = make_client(TREE, asynchronous=True)
+    path = str(tmp_path / "job.jsonl")
+    purview.fail_names.add("left")
+    asyncio.run(client.delete_collections_recursively("top", checkpoint=path))
+    purview.fail_names.clear()
+    results = asyncio.run(client.delete_collections_recursively("top", checkpoint=path))
+    assert [result["name"] for result in results] == ["left"]
+    assert set(purview.collections) == {"account", "top"}
+
+
+def test_async_checkpoint_file_io_runs_off_the_event_loop(make_client, tmp_path, monkeypatch):
+    threads = []
+    for method in ("load", "start", "_append", "remove"):
+        original = getattr(DeleteCheckpoint, method)
+
+        def recording(self, *args, original=original):
+            threads.append(threading.current_thread())
+            return original(self, *args)
+
+        monkeypatch.setattr(DeleteCheckpoint, method, recording)
+
+    client, purview = make_client(TREE, {"right": 250}, asynchronous=True)
+    path = str(tmp_path / "job.jsonl")
+
+    async def run():
+        async with client:
+            results = await client.delete_collections_recursively("top", delete_assets=True, checkpoint=path)
+        return threading.current_thread(), results
+
+    loop_thread, results = asyncio.run(run())
+    assert all(result["error"] is None for result in results)
+    assert not purview.assets
+    assert threads and loop_thread not in threads
+    assert not (tmp_path / "job.jsonl").exists()
@@ -0,0 +1,269 @@
+import sys
+import threading
+
+from purviewautomation.testing import FakePurview
+
+LIST_PATH = "/account/collections"
+
+
+def test_listing_is_cached(make_client):
+    client, transport = make_client()
+    client.list_collections()
+    client.list_collections(only_names=True)
+    client.get_real_collection_name("account")
+    assert transport.count("GET", LIST_PATH) == 1
+
+
+def test_changing_listed_collections_leaves_cache_unchanged(make_client):
+    client, transport = make_client()
+    client.create_collections("account", "a")
+    for collection in client.list_collections():
+        collection["friendlyName"] = "MUTATED"
+        if "parentCollection" in collection:
+            collection["parentCollection"]["referenceName"] = "MUTATED"
+    friendly_names = [collection["friendlyName"] for collection in client.list_collections()]
+    assert "MUTATED" not in friendly_names
+    (name,) = [name for name, coll in transport.collections.items() if coll["friendlyName"] == "a"]
+    assert client.get_real_collection_name("a") == name
+    assert client.list_collections(only_names=True)[name]["parentCollection"] == "account"
+
+
+def test_cache_disabled(make_client):
+    client, transport = make_client(cache_ttl=0)
+    client.list_collections()
+    client.list_collections()
+    assert transport.count("GET", LIST_PATH) == 2
+
+
+def test_create_many_paths_lists_once(make_client):
+    client, transport = make_client()
+    paths = [f"path{i}/child{i}" for i in range(50)]
+    client.create_collections("account", paths)
+    assert transport.count("GET", LIST_PATH) == 1
+    friendly_names = [coll["friendlyName"] for coll in client.list_collections(only_names=True).values()]
+    assert "path49" in friendly_names and "child49" in friendly_names
+    assert transport.count("GET", LIST_PATH) == 1
+
+
+def test_delete_updates_cache(make_client):
+    client, transport = make_client()
+    client.create_collections("account", "deleteme")
+    client.delete_collections("deleteme")
+    friendly_names = [coll["friendlyName"] for coll in client.list_collections(only_names=True).values()]
+    assert "deleteme" not in friendly_names
+    assert transport.count("GET", LIST_PATH) == 1
+
+
+def test_refresh(make_client):
+    client, transport = make_client()
+    client.list_collections()
+    transport.add_collection("external", "external", "account")
+    assert "external" not in client.list_collections(only_names=True)
+    client.refresh()
+    assert "external" in client.list_collections(only_names=True)
+    assert transport.count("GET", LIST_PATH) == 2
+
+
+def test_extract_lists_once(make_client, capsys):
+    client, transport = make_client()
+    for i in range(200):
+        transport.add_collection(f"parent{i}", f"parent{i}", "account")
+        for j in range(5):
+            transport.add_collection(f"child{i}x{j}", f"child{i}x{j}", f"parent{i}")
+    client.extract_collections("account")
+    assert len(transport.calls) == 1
+    output = capsys.readouterr().out
+    assert "start_collection='parent199', collection_names='child199x4'" in output
+
+
+def test_delete_recursively_lists_once(make_client):
+    client, transport = make_client()
+    client.create_collections("account", ["top1/mid1/low1", "top1/mid2"])
+    client.delete_collections_recursively("top1", also_delete_first_collection=True)
+    assert set(transport.collections) == {"account"}
+    assert transport.count("GET", LIST_PATH) == 1
+    assert not any(path.endswith("getChildCollectionNames") for _, path in transport.calls)
+
+
+def test_iter_collections_follows_next_link(make_client):
+    client, transport = make_client([(f"coll{i}", f"coll{i}", "account") for i in range(30)], page_size=7)
+    names = [coll["name"] for coll in client.iter_collections()]
+    assert len(names) == 31
+    assert transport.count("GET", LIST_PATH) == 5
+    prefetched = [coll["name"] for coll in client.iter_collections(prefetch=True)]
+    assert prefetched == names
+    assert len(client.list_collections()) == 31
+
+
+def test_iter_collections_is_lazy(make_client):
+    client, transport = make_client([(f"coll{i}", f"coll{i}", "account") for i in range(10)], page_size=2)
+    collections = client.iter_collections()
+    next(collections)
+    assert transport.count("GET", LIST_PATH) == 1
+
+
+def test_create_collections_parallel(make_client):
+    client, transport = make_client()
+    paths = [f"dept{i}/team{i}/project{i}" for i in range(20)] + ["dept0/extra0"]
+    results = client.create_collections("account", paths, parallel=True, max_workers=4)
+    assert len(results) == 61
+    assert all(result["error"] is None for result in results)
+    assert [result["level"] for result in results] == sorted(result["level"] for result in results)
+    assert transport.collections["extra0"]["parentCollection"]["referenceName"] == "dept0"
+    assert transport.count("PUT", "/account/collections/dept0") == 1
+
+
+def test_create_collections_parallel_skips_children_of_failures(make_client):
+    client, transport = make_client()
+    transport.fail_names.add("broken")
+    results = client.create_collections("account", ["broken/child1/child2", "works"], parallel=True)
+    errors = {result["name"]: result["error"] for result in results}
+    assert errors["works"] is None
+    assert errors["broken"] is not None
+    assert "was not created" in errors["child1"] and "was not created" in errors["child2"]
+    assert "child1" not in transport.collections
+
+
+def test_create_collections_reuses_new_short_names(make_client):
+    client, transport = make_client()
+    client.create_collections("account", ["ab/first", "ab/second"])
+    short_names = [coll for coll in transport.collections.values() if coll["friendlyName"] == "ab"]
+    assert len(short_names) == 1
+
+
+def test_delete_recursively_leaf_first_in_parallel(make_client):
+    client, transport = make_client()
+    transport.add_collection("top", "top", "account")
+    for i in range(10):
+        transport.add_collection(f"mid{i}", f"mid{i}", "top")
+        for j in range(10):
+            transport.add_collection(f"low{i}x{j}", f"low{i}x{j}", f"mid{i}")
+    results = client.delete_collections_recursively("top", also_delete_first_collection=True, max_workers=8)
+    assert len(results) == 111
+    assert all(result["error"] is None for result in results)
+    assert set(transport.collections) == {"account"}
+    assert len(transport.calls) == 112
+
+
+class RecordingStdout:
+    def __init__(self):
+        self.writes = []
+
+    def write(self, text):
+        self.writes.append(text)
+
+    def flush(self):
+        pass
+
+
+def test_parallel_delete_prints_each_result_in_one_write(make_client, monkeypatch):
+    client, transport = make_client([("top", "top", "account")] + [(f"leaf{i}", f"leaf{i}", "top") for i in range(20)])
+    transport.add_assets("leaf0", 5)
+    stdout = RecordingStdout()
+    monkeypatch.setattr(sys, "stdout", stdout)
+    client.delete_collections_recursively("top", delete_assets=True, max_workers=8)
+    deleted = [text for text in stdout.writes if "was successfully deleted" in text]
+    assert sorted(deleted) == sorted(f"The collection 'leaf{i}' was successfully deleted\n\n\n" for i in range(20))
+    assert "\n" not in stdout.writes
+
+
+def test_delete_recursively_skips_parents_of_failures(make_client):
+    client, transport = make_client()
+    client.create_collections("account", ["top/left/leftleaf", "top/right"])
+    transport.fail_names.add("leftleaf")
+    results = client.delete_collections_recursively("top", also_delete_first_collection=True)
+    errors = {result["name"]: result["error"] for result in results}
+    assert errors["right"] is None
+    assert errors["leftleaf"] is not None
+    assert "still has child collections" in errors["left"] and "still has child collections" in errors["top"]
+    assert {"top", "left", "leftleaf"} <= set(transport.collections)
+
+
+def test_delete_collection_assets(make_client):
+    client, transport = make_client()
+    client.create_collections("account", ["assets1", "assets2"])
+    transport.add_assets("assets1", 2500)
+    transport.add_assets("assets2", 300)
+    transport.add_assets("account", 10)
+    transport.flaky_guids["assets1-asset-7"] = 2
+    stats = client.delete_collection_assets(["assets1", "assets2"], batch_size=50)
+    assert stats["assets1"]["deleted"] == 2500
+    assert stats["assets2"]["deleted"] == 300
+    assert stats["assets1"]["failed"] == 0
+    assert stats["assets1"]["completed"] is True
+    assert set(transport.assets.values()) == {"account"}
+
+
+def test_delete_collection_assets_gives_up_on_failed_guids(make_client):
+    client, transport = make_client()
+    client.create_collections("account", "assets1")
+    transport.add_assets("assets1", 20)
+    transport.flaky_guids["assets1-asset-3"] = 100
+    stats = client.delete_collection_assets("assets1", max_retries=2)
+    assert stats["assets1"]["deleted"] == 19
+    assert stats["assets1"]["failed"] == 1
+    assert stats["assets1"]["completed"] is False
+
+
+def test_readers_see_consistent_cache_while_writing(make_client):
+    client, transport = make_client()
+    client.list_collections()
+    errors = []
+    done = threading.Event()
+
+    def read():
+        while not done.is_set():
+            try:
+                client.list_collections()
+                client.list_collections(only_names=True)
+                client.get_real_collection_name("account")
+            except Exception as e:
+                errors.append(e)
+                return
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    try:
+        for index in range(300):
+            client.create_collections("account", [f"new{index}"])
+    finally:
+        done.set()
+        for reader in readers:
+            reader.join()
+    assert errors == []
+    assert len(client.list_collections()) == 301
+    assert transport.count("GET", LIST_PATH) == 1
+
+
+class PeakPurview(FakePurview):
+    """Records the most requests that were running at the same time."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.running = 0
+        self.peak = 0
+        self._running_lock = threading.Lock()
+
+    def request(self, method, url, headers=None, data=None, timeout=None):
+        with self._running_lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        try:
+            return super().request(method, url, headers, data, timeout)
+        finally:
+            with self._running_lock:
+                self.running -= 1
+
+
+def test_delete_recursively_with_assets_bounds_concurrency(make_client):
+    client, transport = make_client(purview=PeakPurview("account", latency=0.005))
+    transport.add_collection("top", "top", "account")
+    for i in range(8):
+        transport.add_collection(f"leaf{i}", f"leaf{i}", "top")
+        transport.add_assets(f"leaf{i}", 200)
+    results = client.delete_collections_recursively("top", delete_assets=True, max_workers=3)
+    assert all(result["error"] is None for result in results)
+    assert not transport.assets
+    # 3 collections searching plus 3 bulk deletes shared by all of them
+    assert transport.peak <= 6
@@ -0,0 +1,117 @@
+import asyncio
+import threading
+
+import pytest
+
+from purviewautomation import aio
+
+TREE = [
+    ("top", "Top", "account"),
+    ("left", "Left", "top"),
+    ("leftleaf", "Left Leaf", "left"),
+    ("right", "Right", "top"),
+    ("other", "Other", "account"),
+]
+
+
+def test_export_from_one_listing(make_client):
+    client, purview = make_client(TREE)
+    records = client.export_collections("Top")
+    assert records == [
+        {"name": "top", "friendlyName": "Top", "parentCollection": "account", "depth": 0},
+        {"name": "left", "friendlyName": "Left", "parentCollection": "top", "depth": 1},
+        {"name": "right", "friendlyName": "Right", "parentCollection": "top", "depth": 1},
+        {"name": "leftleaf", "friendlyName": "Left Leaf", "parentCollection": "left", "depth": 2},
+    ]
+    assert purview.calls == [("GET", "/account/collections")]
+
+
+@pytest.mark.parametrize("file_name", ["backup.json", "backup.jsonl"])
+def test_export_import_round_trip(make_client, tmp_path, file_name):
+    client, purview = make_client(TREE)
+    path = str(tmp_path / file_name)
+    records = client.export_collections("top", path=path)
+    client.delete_collections_recursively("top", also_delete_first_collection=True)
+    assert "top" not in purview.collections
+
+    plan = client.plan_import_collections(path)
+    assert [[action.name for action in level] for level in plan.levels] == [["top"], ["left", "right"], ["leftleaf"]]
+    results = client.import_collections(path)
+    assert all(result["error"] is None for result in results)
+    client.refresh()
+    assert client.export_collections("top") == records
+    assert len(client.plan_import_collections(path)) == 0
+
+
+@pytest.mark.parametrize("file_name", ["backup.json", "backup.jsonl"])
+def test_round_trip_keeps_quotes_and_backslashes(make_client, tmp_path, file_name):
+    client, purview = make_client(TREE)
+    purview.add_collection("quoted", 'Sales "EU"', "top")
+    purview.add_collection("path", "Data\\Raw\\", "quoted")
+    path = str(tmp_path / file_name)
+    records = client.export_collections("top", path=path)
+    client.delete_collections_recursively("top", also_delete_first_collection=True)
+
+    results = client.import_collections(path)
+    assert all(result["error"] is None for result in results)
+    assert purview.collections["quoted"]["friendlyName"] == 'Sales "EU"'
+    assert purview.collections["path"]["friendlyName"] == "Data\\Raw\\"
+    client.refresh()
+    assert client.export_collections("top") == records
+
+
+def test_import_under_another_parent(make_client):
+    client, purview = make_client(TREE)
+    records = client.export_collections("left")
+    client.import_collections(records, parent_collection="Other")
+    assert purview.collections["left"]["parentCollection"]["referenceName"] == "other"
+    assert purview.collections["leftleaf"]["parentCollection"]["referenceName"] == "left"
+
+
+def test_import_validates_parents(make_client):
+    client, purview = make_client(TREE)
+    records = [{"name": "new", "friendlyName": "New", "parentCollection": "missing", "depth": 0}]
+    with pytest.raises(ValueError, match="'missing'"):
+        client.import_collections(records)
+    with pytest.raises(ValueError, match="depth"):
+        client.import_collections([{"name": "new"}])
+    assert "new" not in purview.collections
+
+
+def test_async_export_import(make_client):
+    client, purview = make_client([("top", "Top", "account"), ("child", "Child", "top")], asynchronous=True)
+
+    async def run():
+        records = await client.export_collections("top")
+        return await client.import_collections(records[1:], parent_collection="account")
+
+    results = asyncio.run(run())
+    assert [result["action"] for result in results] == ["update"]
+    assert purview.collections["child"]["parentCollection"]["referenceName"] == "account"
+
+
+def test_async_export_import_and_sync_file_io_runs_off_the_event_loop(make_client, tmp_path, monkeypatch):
+    threads = []
+    for name in ("write_export", "read_export", "load_hierarchy"):
+        original = getattr(aio, name)
+
+        def recording(*args, original=original):
+            threads.append(threading.current_thread())
+            return original(*args)
+
+        monkeypatch.setattr(aio, name, recording)
+
+    client, purview = make_client([("top", "Top", "account")], asynchronous=True)
+    path = str(tmp_path / "export.json")
+    hierarchy = tmp_path / "hierarchy.json"
+    hierarchy.write_text('{"start_collection": "account", "collections": [{"friendlyName": "Top", "name": "top"}]}')
+
+    async def run():
+        async with client:
+            await client.export_collections("top", path=path)
+            await client.import_collections(path)
+            await client.sync_collections(str(hierarchy))
+        return threading.current_thread()
+
+    loop_thread = asyncio.run(run())
+    assert len(threads) == 3 and loop_thread not in threads
@@ -1,10 +1,12 @@
 import sys
 
+from purviewautomation.aio import AsyncPurviewCollections
 from purviewautomation.auth import (
     AzIdentityAuthentication,
     ServicePrincipalAuthentication,
 )
 from purviewautomation.collections import PurviewCollections
+from purviewautomation.transport import HttpTransport
 
 MODULE_OBJECTS = dir()
 
@@ -13,9 +15,13 @@ def test_import_modules():
     assert "purviewautomation" in sys.modules
     assert "purviewautomation.auth" in sys.modules
     assert "purviewautomation.collections" in sys.modules
+    assert "purviewautomation.transport" in sys.modules
+    assert "purviewautomation.aio" in sys.modules
 
 
 def test_import_classes():
     assert "AzIdentityAuthentication" in MODULE_OBJECTS
     assert "ServicePrincipalAuthentication" in MODULE_OBJECTS
-    assert "PurviewCollections" in MODULE_OBJECTS
\ No newline at end of file
+    assert "PurviewCollections" in MODULE_OBJECTS
+    assert "HttpTransport" in MODULE_OBJECTS
+    assert "AsyncPurviewCollections" in MODULE_OBJECTS
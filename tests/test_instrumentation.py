@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+from purviewautomation import (
+    AsyncPurviewCollections,
+    HttpTransport,
+    Instrumentation,
+    MetricsCollector,
+    MultiInstrumentation,
+    PurviewCollections,
+    RetryPolicy,
+)
+from purviewautomation.instrumentation import endpoint_label
+from purviewautomation.testing import (
+    AsyncFakePurview,
+    FakeAuth,
+    FakePurview,
+    FakeSession,
+)
+
+
+class BrokenSink(Instrumentation):
+    def on_request(self, event):
+        raise RuntimeError("exporter is down")
+
+
+def test_endpoint_label():
+    base = "https://account.purview.azure.com"
+    assert endpoint_label("GET", f"{base}/account/collections?api-version=1") == "list_collections"
+    assert endpoint_label("PUT", f"{base}/account/collections/abc?api-version=1") == "create_collection"
+    assert endpoint_label("DELETE", f"{base}/catalog/api/atlas/v2/entity/bulk?guid=1") == "bulk_delete_assets"
+    assert endpoint_label("GET", f"{base}/other") == "GET /other"
+
+
+def test_metrics_for_parallel_operations():
+    metrics = MetricsCollector(keep_events=True)
+    purview = FakePurview()
+    client = PurviewCollections(
+        "account", FakeAuth(), transport=purview, instrumentation=MultiInstrumentation(BrokenSink(), metrics)
+    )
+    client.create_collections("account", [f"dept{i}/team{i}" for i in range(10)], parallel=True)
+    client.delete_collections_recursively("dept0", also_delete_first_collection=True)
+
+    summary = metrics.summary()
+    assert summary["endpoints"]["list_collections"]["requests"] == 1
+    assert summary["endpoints"]["create_collection"]["requests"] == 20
+    assert summary["endpoints"]["create_collection"]["status_codes"] == {"200": 20}
+    assert summary["endpoints"]["delete_collection"]["requests"] == 2
+    assert summary["endpoints"]["create_collection"]["request_bytes"] > 0
+    assert summary["operations"]["create_collections"]["requests"] == 21
+    assert summary["operations"]["delete_collections_recursively"]["requests"] == 2
+    requests = [event for event in metrics.events if hasattr(event, "endpoint")]
+    assert {event.operation for event in requests} == {
+        "plan_create_collections",
+        "create_collections",
+        "delete_collections_recursively",
+    }
+
+
+def test_nested_operations_and_retries():
+    metrics = MetricsCollector(keep_events=True)
+    purview = FakePurview(throttle_rate=0.3, retry_after=0, seed=2)
+    transport = HttpTransport(session=FakeSession(purview), retry_policy=RetryPolicy(total=20), max_rate=None)
+    client = PurviewCollections("account", FakeAuth(), transport=transport, instrumentation=metrics)
+    client.create_collections("account", "assets1")
+    purview.add_assets("assets1", 10)
+    client.delete_collections("assets1", delete_assets=True)
+
+    operations = {event.name: event for event in metrics.events if not hasattr(event, "endpoint")}
+    assert operations["delete_collection_assets"].parent == "delete_collections"
+    assert operations["delete_collections"].requests > operations["delete_collection_assets"].requests
+    summary = metrics.summary()
+    assert sum(stats["retries"] for stats in summary["endpoints"].values()) == purview.throttled > 0
+
+
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_iter_collections_is_an_operation(prefetch):
+    metrics = MetricsCollector(keep_events=True)
+    purview = FakePurview(page_size=2)
+    purview.generate_tree(depth=1, breadth=5)
+    client = PurviewCollections("account", FakeAuth(), transport=purview, instrumentation=metrics)
+    assert len(list(client.iter_collections(prefetch=prefetch))) == 6
+
+    operation = metrics.summary()["operations"]["iter_collections"]
+    assert (operation["calls"], operation["requests"], operation["errors"]) == (1, 3, 0)
+    requests = [event for event in metrics.events if hasattr(event, "endpoint")]
+    assert {event.operation for event in requests} == {"iter_collections"}
+
+
+def test_errors_are_recorded():
+    metrics = MetricsCollector()
+    client = PurviewCollections("account", FakeAuth(), transport=FakePurview(), instrumentation=metrics)
+    try:
+        client.get_real_collection_name("missing")
+    except ValueError:
+        pass
+    assert metrics.summary()["operations"]["get_real_collection_name"]["errors"] == 1
+
+
+def test_async_metrics():
+    metrics = MetricsCollector()
+    client = AsyncPurviewCollections("account", FakeAuth(), transport=AsyncFakePurview(), instrumentation=metrics)
+    asyncio.run(client.create_collections("account", ["one/two", "three"]))
+    summary = metrics.summary()
+    assert summary["endpoints"]["create_collection"]["requests"] == 3
+    assert summary["operations"]["create_collections"]["requests"] == 4
+
+    async def iterate():
+        return [collection async for collection in client.iter_collections()]
+
+    assert len(asyncio.run(iterate())) == 4
+    assert metrics.summary()["operations"]["iter_collections"]["requests"] == 1
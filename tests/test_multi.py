@@ -0,0 +1,86 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+import pytest
+
+from purviewautomation import HttpTransport, MultiAccountExecutor, RetryPolicy
+from purviewautomation.testing import FakeAuth, FakePurview
+
+
+class Accounts:
+    """Sends every request to the FakePurview of its account (host)."""
+
+    def __init__(self, names, latency=0):
+        self.purviews = {name: FakePurview(account_name=name) for name in names}
+        self.latency = latency
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def request(self, method, url, headers=None, data=None, timeout=None):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.latency)
+            return self.purviews[urlparse(url).hostname.split(".")[0]].handle(method, url, data)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def test_run_on_every_account():
+    accounts = Accounts(["dev", "test", "prod"])
+    executor = MultiAccountExecutor(list(accounts.purviews), FakeAuth(), transport=accounts)
+    results = executor.run("create_collections", "dev", ["sales/emea"], parallel=True)
+    assert set(results) == {"dev", "test", "prod"}
+    assert results["dev"]["error"] is None
+    assert [result["name"] for result in results["dev"]["result"]] == ["sales", "emea"]
+    assert "'dev' either doesn't exist" in results["test"]["error"]
+    assert "sales" in accounts.purviews["dev"].collections
+    assert "sales" not in accounts.purviews["prod"].collections
+
+    results = executor.run(lambda client: len(client.list_collections()), accounts=["dev", "prod"])
+    assert {account: result["result"] for account, result in results.items()} == {"dev": 3, "prod": 1}
+    with pytest.raises(ValueError, match="Unknown"):
+        executor.run("list_collections", accounts=["missing"])
+
+
+def test_global_request_cap():
+    names = [f"account{index}" for index in range(6)]
+    accounts = Accounts(names, latency=0.02)
+    for purview in accounts.purviews.values():
+        purview.generate_tree(depth=1, breadth=10)
+    executor = MultiAccountExecutor(names, FakeAuth(), transport=accounts, max_accounts=6, max_requests=3)
+    results = executor.run(
+        lambda client: client.delete_collections_recursively(client.purview_account_name, max_workers=8)
+    )
+    assert all(result["error"] is None for result in results.values())
+    assert all(len(purview.collections) == 1 for purview in accounts.purviews.values())
+    assert accounts.max_in_flight <= 3
+
+
+class AccountsSession(Accounts):
+    def mount(self, prefix, adapter):
+        pass
+
+
+def test_throttled_account_does_not_hold_a_request_slot():
+    session = AccountsSession(["slow", "fast"])
+    session.purviews["slow"].throttle_rate = 1
+    session.purviews["slow"].retry_after = 0.3
+    transport = HttpTransport(session=session, retry_policy=RetryPolicy(total=2))
+    executor = MultiAccountExecutor(["slow", "fast"], FakeAuth(), transport=transport, max_accounts=2, max_requests=1)
+
+    def list_collections(client):
+        if client.purview_account_name == "fast":
+            # starts while the slow account waits for its Retry-After
+            time.sleep(0.1)
+        return client.list_collections()
+
+    results = executor.run(list_collections)
+    assert "429" in results["slow"]["error"]
+    assert results["fast"]["error"] is None
+    assert results["fast"]["seconds"] < 0.3
+    assert session.max_in_flight == 1
@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+from purviewautomation import CollectionPlan
+from purviewautomation.planning import CollectionAction, assign_levels
+
+TREE = [
+    ("top", "top", "account"),
+    ("left", "left", "top"),
+    ("leftleaf", "leftleaf", "left"),
+    ("right", "right", "top"),
+    ("solo", "solo", "account"),
+]
+
+
+def test_plan_create_only_lists(make_client):
+    client, purview = make_client(TREE)
+    plan = client.plan_create_collections("top", ["left/new1/new2", "new3", "left/new1/new4"])
+    assert isinstance(plan, CollectionPlan)
+    assert plan.names() == ["new1", "new2", "new3", "new4"]
+    assert [[action.name for action in level] for level in plan.levels] == [["new3"], ["new1"], ["new2", "new4"]]
+    assert plan.actions[1].depends_on == ("new1",)
+    assert plan.actions[0].depends_on == ()
+    assert plan.to_dicts()[0] == {
+        "action": "create",
+        "name": "new1",
+        "friendlyName": "new1",
+        "parentCollection": "left",
+        "level": 1,
+        "dependsOn": [],
+    }
+    assert len(purview.calls) == 1
+
+
+def test_plan_delete_recursively_levels(make_client):
+    client, purview = make_client(TREE)
+    plan = client.plan_delete_collections_recursively("top", also_delete_first_collection=True)
+    assert [sorted(action.name for action in level) for level in plan.levels] == [
+        ["leftleaf", "right"],
+        ["left"],
+        ["top"],
+    ]
+    assert sorted(plan.actions[-1].depends_on) == ["left", "right"]
+    assert len(purview.calls) == 1
+
+
+def test_plans_validate_before_deleting(make_client):
+    client, purview = make_client(TREE)
+    with pytest.raises(ValueError, match="has child collections"):
+        client.delete_collections(["solo", "top"])
+    with pytest.raises(ValueError, match="has no child collections"):
+        client.delete_collections_recursively(["top", "solo"])
+    assert len(purview.collections) == 6
+    assert all(method == "GET" for method, _ in purview.calls)
+
+
+def test_execute_plan(make_client):
+    client, purview = make_client(TREE)
+    create_plan = client.plan_create_collections("solo", [f"a{i}/b{i}" for i in range(5)])
+    results = client.execute_plan(create_plan, max_workers=4)
+    assert [result["action"] for result in results] == ["create"] * 10
+    assert all(result["error"] is None for result in results)
+
+    delete_plan = client.plan_delete_collections_recursively(["solo", "top"], also_delete_first_collection=True)
+    results = client.execute_plan(delete_plan)
+    assert len(results) == 15 and all(result["error"] is None for result in results)
+    assert set(purview.collections) == {"account"}
+
+
+def test_async_execute_plan(make_client):
+    client, purview = make_client(asynchronous=True)
+
+    async def run():
+        plan = await client.plan_create_collections("account", ["one/two/three"])
+        await client.execute_plan(plan)
+        plan = await client.plan_delete_collections_recursively("one", also_delete_first_collection=True)
+        return await client.execute_plan(plan)
+
+    results = asyncio.run(run())
+    assert [result["name"] for result in results] == ["three", "two", "one"]
+    assert set(purview.collections) == {"account"}
+
+
+def test_assign_levels():
+    actions = [
+        CollectionAction("create", "child", "Child", "parent", 0, ["parent"]),
+        CollectionAction("create", "parent", "Parent", "account", 0),
+        CollectionAction("create", "leaf", "Leaf", "child", 0, ["child"]),
+    ]
+    assign_levels(actions)
+    assert [action.level for action in actions] == [1, 0, 2]
+
+    loop = [
+        CollectionAction("update", "a", "A", "b", 0, ["b"]),
+        CollectionAction("update", "b", "B", "a", 0, ["a"]),
+    ]
+    with pytest.raises(ValueError, match="depend on each other"):
+        assign_levels(loop)
@@ -0,0 +1,88 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from purviewautomation import AsyncPurviewCollections, PurviewCollections
+from purviewautomation.singleflight import SingleFlight
+from purviewautomation.testing import AsyncFakePurview, FakeAuth, FakePurview
+
+LIST_PATH = "/account/collections"
+
+
+def test_single_flight_shares_result_and_error():
+    flight = SingleFlight()
+    calls = []
+
+    def slow(value):
+        calls.append(value)
+        time.sleep(0.05)
+        if value == "error":
+            raise ValueError("failed")
+        return value
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: flight.do("key", lambda: slow("ok")), range(8)))
+    assert results == ["ok"] * 8
+    assert calls == ["ok"]
+    assert flight.coalesced == 7
+
+    # nothing is cached once the call finished
+    assert flight.do("key", lambda: slow("again")) == "again"
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(flight.do, "key", lambda: slow("error")) for _ in range(4)]
+    for future in futures:
+        with pytest.raises(ValueError, match="failed"):
+            future.result()
+    assert calls.count("error") == 1
+
+
+def test_concurrent_reads_share_one_request():
+    transport = FakePurview("account", latency=0.05)
+    transport.generate_tree(depth=1, breadth=3)
+    client = PurviewCollections("account", FakeAuth(), transport=transport, cache_ttl=0)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        listings = list(executor.map(lambda _: client.list_collections(), range(8)))
+        children = list(executor.map(lambda _: client.get_child_collection_names("account"), range(8)))
+    assert all(listing == listings[0] for listing in listings)
+    assert transport.count("GET", LIST_PATH) == 1
+    assert all(child == children[0] for child in children)
+    assert transport.count("GET", "/account/collections/account/getChildCollectionNames") == 1
+
+    # the next read after the shared one finished calls Purview again (cache_ttl=0)
+    client.list_collections()
+    assert transport.count("GET", LIST_PATH) == 2
+
+
+def test_changes_during_fetch_are_kept():
+    transport = FakePurview("account", latency=0.1)
+    client = PurviewCollections("account", FakeAuth(), transport=transport)
+    listing = threading.Thread(target=client.list_collections)
+    listing.start()
+    time.sleep(0.03)
+    client._cache_update(
+        {"name": "new", "friendlyName": "New", "parentCollection": {"referenceName": "account"}},
+    )
+    listing.join()
+    assert "new" in client.list_collections(only_names=True)
+    assert transport.count("GET", LIST_PATH) == 1
+
+
+def test_async_concurrent_reads_share_one_request():
+    transport = AsyncFakePurview("account", latency=0.05)
+    client = AsyncPurviewCollections("account", FakeAuth(), transport=transport, cache_ttl=0)
+
+    async def run():
+        return await asyncio.gather(
+            *(client.list_collections() for _ in range(5)),
+            *(client.get_child_collection_names("account") for _ in range(5)),
+        )
+
+    results = asyncio.run(run())
+    assert all(result == results[0] for result in results[:5])
+    assert transport.count("GET", LIST_PATH) == 1
+    assert transport.count("GET", "/account/collections/account/getChildCollectionNames") == 1
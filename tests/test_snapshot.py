@@ -0,0 +1,94 @@
+import asyncio
+import threading
+
+from purviewautomation import SnapshotCache
+
+LIST_PATH = "/account/collections"
+
+
+def test_new_client_starts_from_snapshot(make_client, tmp_path):
+    cache = SnapshotCache(str(tmp_path))
+    first, purview = make_client(page_size=5, snapshot_cache=cache)
+    purview.generate_tree(depth=2, breadth=3)
+    collections = first.list_collections()
+    assert purview.count("GET", LIST_PATH) == 3
+
+    second, _ = make_client(purview=purview, snapshot_cache=cache)
+    assert second.list_collections() == collections
+    assert purview.count("GET", LIST_PATH) == 3
+
+
+def test_old_snapshot_is_revalidated(make_client, tmp_path):
+    cache = SnapshotCache(str(tmp_path), ttl=0)
+    client, purview = make_client(snapshot_cache=cache)
+    purview.generate_tree(depth=2, breadth=3)
+    client.list_collections()
+
+    # not modified: one conditional request and the snapshot is reused
+    client, _ = make_client(purview=purview, snapshot_cache=cache)
+    assert len(client.list_collections()) == 13
+    assert purview.count("GET", LIST_PATH) == 2
+
+    # changed by someone else: the new listing is returned and saved
+    purview.add_collection("other", "Other", "account")
+    client, _ = make_client(purview=purview, snapshot_cache=cache)
+    assert "other" in client.list_collections(only_names=True)
+    assert len(cache.get("account", client.collections_api_version).collections) == 14
+
+    # no ETag: listed again every time the snapshot is too old
+    purview.etags = False
+    client, _ = make_client(purview=purview, snapshot_cache=cache)
+    assert "other" in client.list_collections(only_names=True)
+
+
+def test_changes_drop_snapshot(make_client, tmp_path):
+    cache = SnapshotCache(str(tmp_path))
+    client, purview = make_client(snapshot_cache=cache)
+    purview.generate_tree(depth=2, breadth=3)
+    client.create_collections("account", ["new"])
+    assert cache.get("account", client.collections_api_version) is None
+
+    client, _ = make_client(purview=purview, snapshot_cache=cache)
+    assert "new" in client.list_collections(only_names=True)
+    client.refresh()
+    assert cache.get("account", client.collections_api_version) is None
+
+
+def test_corrupt_snapshot_is_ignored(make_client, tmp_path):
+    cache = SnapshotCache(str(tmp_path))
+    (tmp_path / "account.snapshot").write_bytes(b"not a snapshot")
+    client, purview = make_client(snapshot_cache=cache)
+    purview.generate_tree(depth=2, breadth=3)
+    assert len(client.list_collections()) == 13
+    assert cache.get("account", client.collections_api_version) is not None
+
+
+def test_async_client_uses_snapshot(make_client, tmp_path, monkeypatch):
+    cache = SnapshotCache(str(tmp_path), ttl=0)
+    first, purview = make_client(asynchronous=True, snapshot_cache=cache)
+    second, _ = make_client(purview=purview, asynchronous=True, snapshot_cache=cache)
+    purview.generate_tree(depth=1, breadth=4)
+
+    threads = []
+    for method in ("_read", "_write"):
+        original = getattr(SnapshotCache, method)
+
+        def recording(self, *args, original=original):
+            threads.append(threading.current_thread())
+            return original(self, *args)
+
+        monkeypatch.setattr(SnapshotCache, method, recording)
+
+    async def run():
+        async with first:
+            first_collections = await first.list_collections()
+        async with second:
+            second_collections = await second.list_collections()
+        return threading.current_thread(), first_collections, second_collections
+
+    loop_thread, first, second = asyncio.run(run())
+    # the snapshot file is read and written in the client's file thread, not on the event loop
+    assert threads and loop_thread not in threads
+    assert first == second
+    assert purview.calls.count(("GET", LIST_PATH)) == 2
+    assert cache.get("account", "2019-11-01-preview").etag is not None
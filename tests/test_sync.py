@@ -0,0 +1,110 @@
+import asyncio
+import json
+
+import pytest
+
+from purviewautomation import load_hierarchy
+
+HIERARCHY = {
+    "start_collection": "top",
+    "collections": [
+        {"friendlyName": "Sales", "name": "sales", "children": [{"friendlyName": "EMEA"}, {"friendlyName": "APAC"}]},
+        {"friendlyName": "Finance Team", "name": "finance", "children": [{"friendlyName": "Payroll", "name": "old"}]},
+    ],
+}
+TREE = [
+    ("top", "top", "account"),
+    ("finance", "Finance", "top"),
+    ("legacy", "Legacy", "top"),
+    ("old", "Old", "legacy"),
+    ("stale", "Stale", "legacy"),
+]
+
+
+def test_sync_creates_renames_moves_and_prunes(make_client):
+    client, purview = make_client(TREE)
+    plan = client.plan_sync_collections(HIERARCHY, prune=True)
+    actions = {action.name: action for action in plan}
+    assert {name: action.action for name, action in actions.items()} == {
+        "sales": "create",
+        "EMEA": "create",
+        "APAC": "create",
+        "finance": "update",
+        "old": "update",
+        "stale": "delete",
+        "legacy": "delete",
+    }
+    assert actions["EMEA"].depends_on == ("sales",)
+    assert actions["old"].depends_on == ("finance",)
+    assert sorted(actions["legacy"].depends_on) == ["old", "stale"]
+    assert len(purview.calls) == 1
+
+    results = client.sync_collections(HIERARCHY, prune=True)
+    assert all(result["error"] is None for result in results)
+    assert purview.collections["finance"]["friendlyName"] == "Finance Team"
+    assert purview.collections["old"]["parentCollection"]["referenceName"] == "finance"
+    assert purview.collections["EMEA"]["parentCollection"]["referenceName"] == "sales"
+    assert "legacy" not in purview.collections and "stale" not in purview.collections
+
+
+def test_sync_friendly_names_with_quotes_and_backslashes(make_client):
+    client, purview = make_client(TREE)
+    hierarchy = {
+        "start_collection": "top",
+        "collections": [{"friendlyName": 'Sales "EU"', "children": [{"friendlyName": "Data\\Raw"}]}],
+    }
+    results = client.sync_collections(hierarchy)
+    assert all(result["error"] is None for result in results)
+    friendly_names = {collection["friendlyName"] for collection in purview.collections.values()}
+    assert {'Sales "EU"', "Data\\Raw"} <= friendly_names
+    assert len(client.plan_sync_collections(hierarchy)) == 0
+
+
+def test_sync_is_idempotent(make_client):
+    client, purview = make_client(TREE)
+    client.sync_collections(HIERARCHY, prune=True)
+    client.refresh()
+    calls = len(purview.calls)
+    assert client.sync_collections(HIERARCHY, prune=True) == []
+    assert purview.calls[calls:] == [("GET", "/account/collections")]
+
+
+def test_sync_without_prune_keeps_extra_collections(make_client):
+    client, purview = make_client(TREE)
+    plan = client.plan_sync_collections(HIERARCHY)
+    assert all(action.action != "delete" for action in plan)
+    client.execute_plan(plan)
+    assert "legacy" in purview.collections and "stale" in purview.collections
+
+
+def test_sync_skips_changes_under_a_failed_parent(make_client):
+    client, purview = make_client(TREE)
+    purview.fail_names.add("sales")
+    results = {result["name"]: result for result in client.sync_collections(HIERARCHY)}
+    assert results["EMEA"]["error"] == "Parent collection 'sales' was not created."
+    assert "EMEA" not in purview.collections
+    assert results["finance"]["error"] is None
+
+
+def test_load_hierarchy_files(tmp_path):
+    json_path = tmp_path / "hierarchy.json"
+    json_path.write_text(json.dumps(HIERARCHY))
+    assert load_hierarchy(str(json_path)) == HIERARCHY
+
+    yaml = pytest.importorskip("yaml")
+    yaml_path = tmp_path / "hierarchy.yaml"
+    yaml_path.write_text(yaml.safe_dump(HIERARCHY))
+    assert load_hierarchy(str(yaml_path)) == HIERARCHY
+
+    with pytest.raises(ValueError, match="friendlyName"):
+        load_hierarchy({"start_collection": "top", "collections": [{"name": "x"}]})
+    with pytest.raises(ValueError, match="start_collection"):
+        load_hierarchy({"collections": []})
+
+
+def test_async_sync_collections(make_client):
+    client, purview = make_client([("top", "top", "account")], asynchronous=True)
+    results = asyncio.run(client.sync_collections(HIERARCHY))
+    assert sorted(result["name"] for result in results) == ["APAC", "EMEA", "finance", "old", "sales"]
+    assert all(result["error"] is None for result in results)
+    assert purview.collections["EMEA"]["parentCollection"]["referenceName"] == "sales"
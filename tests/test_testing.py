@@ -0,0 +1,39 @@
+from purviewautomation import HttpTransport, PurviewCollections, RetryPolicy
+from purviewautomation.testing import FakeAuth, FakePurview, FakeSession
+
+
+def test_generate_tree_and_page_through_it(capsys):
+    purview = FakePurview(page_size=1000)
+    names = purview.generate_tree(depth=4, breadth=10)
+    assert len(names) == 11110
+    client = PurviewCollections("account", FakeAuth(), transport=purview)
+    assert len(client.list_collections(only_names=True)) == 11111
+    assert purview.count("GET", "/account/collections") == 12
+    client.extract_collections(names[0])
+    assert capsys.readouterr().out.count("client.create_collections(") == 1111
+
+
+def test_millions_of_assets():
+    purview = FakePurview()
+    purview.add_collection("big", "big", "account")
+    purview.add_assets("account", 5_000_000)
+    purview.add_assets("big", 50_000)
+    client = PurviewCollections("account", FakeAuth(), transport=purview)
+    results = client._search_collection_assets("account", "account", "2022-03-01-preview", 1000)
+    assert results["@search.count"] == 5_000_000
+    assert len(results["value"]) == 1000
+    stats = client.delete_collection_assets("big", batch_size=1000, max_workers=4)
+    assert stats["big"]["deleted"] == 50_000
+    assert purview.asset_count("big") == 0
+    assert purview.asset_count() == 5_000_000
+
+
+def test_throttling_is_retried_by_http_transport():
+    purview = FakePurview(throttle_rate=0.3, retry_after=0, seed=1)
+    retry_policy = RetryPolicy(total=20, backoff_factor=0)
+    transport = HttpTransport(session=FakeSession(purview), retry_policy=retry_policy, max_rate=None)
+    client = PurviewCollections("account", FakeAuth(), transport=transport)
+    results = client.create_collections("account", [f"dept{i}/team{i}" for i in range(20)], parallel=True)
+    assert all(result["error"] is None for result in results)
+    assert len(purview.collections) == 41
+    assert purview.throttled > 0
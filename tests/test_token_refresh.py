@@ -0,0 +1,133 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from purviewautomation import (
+    AzIdentityAuthentication,
+    FileTokenCache,
+    PurviewCollections,
+)
+from purviewautomation.auth import _RefreshingAuthentication
+from purviewautomation.testing import FakePurview
+
+
+class FakeToken:
+    def __init__(self, token, expires_on):
+        self.token = token
+        self.expires_on = expires_on
+
+
+class FakeCredential:
+    def __init__(self, lifetime=3600, delay=0, identity="token"):
+        self.lifetime = lifetime
+        self.identity = identity
+        self.delay = delay
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def get_token(self, scope):
+        time.sleep(self.delay)
+        with self.lock:
+            self.calls += 1
+            calls = self.calls
+        return FakeToken(f"{self.identity}-{calls}", (datetime.now() + timedelta(seconds=self.lifetime)).timestamp())
+
+
+def test_token_is_reused():
+    credential = FakeCredential()
+    auth = AzIdentityAuthentication(credential)
+    assert auth.get_access_token() == "token-1"
+    assert auth.get_access_token() == "token-1"
+    assert credential.calls == 1
+
+
+def test_concurrent_callers_share_one_refresh():
+    credential = FakeCredential(delay=0.2)
+    auth = AzIdentityAuthentication(credential)
+    tokens = []
+    threads = [threading.Thread(target=lambda: tokens.append(auth.get_access_token())) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert tokens == ["token-1"] * 10
+    assert credential.calls == 1
+
+
+def test_refreshes_in_background_before_expiry():
+    credential = FakeCredential(lifetime=60, delay=0.1)
+    auth = AzIdentityAuthentication(credential, refresh_margin=120)
+    assert auth.get_access_token() == "token-1"
+    # within the refresh margin but not expired: returns the current token right away
+    assert auth.get_access_token() == "token-1"
+    deadline = time.monotonic() + 5
+    while auth.access_token == "token-1" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert auth.get_access_token() != "token-1"
+
+
+class RecordingTransport(FakePurview):
+    def __init__(self, account_name):
+        super().__init__(account_name)
+        self.tokens = []
+
+    def request(self, method, url, headers=None, data=None, timeout=None):
+        self.tokens.append(headers["Authorization"])
+        return super().request(method, url, headers=headers, data=data, timeout=timeout)
+
+
+def test_expired_token_refreshes_before_request():
+    auth = AzIdentityAuthentication(FakeCredential())
+    transport = RecordingTransport("account")
+    client = PurviewCollections("account", auth, transport=transport, cache_ttl=0)
+    client.list_collections()
+    auth.access_token_expiration = datetime.now() - timedelta(seconds=1)
+    client.list_collections()
+    assert transport.tokens == ["Bearer token-1", "Bearer token-2"]
+
+
+def test_file_token_cache_shared_between_clients(tmp_path):
+    cache = FileTokenCache(str(tmp_path / "tokens.json"))
+    credential = FakeCredential(delay=0.05)
+    auths = [AzIdentityAuthentication(credential, token_cache=cache, cache_key="identity") for _ in range(8)]
+    threads = [threading.Thread(target=auth.get_access_token) for auth in auths]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert credential.calls == 1
+    assert {auth.access_token for auth in auths} == {"token-1"}
+
+
+def test_file_token_cache_ignores_expiring_tokens(tmp_path):
+    cache = FileTokenCache(str(tmp_path / "tokens.json"))
+    credential = FakeCredential()
+    auth = AzIdentityAuthentication(credential, token_cache=cache, cache_key="identity")
+    cache.set("identity", "stale", datetime.now() + timedelta(seconds=60))
+    cache.set("expired", "expired", datetime.now() - timedelta(seconds=60))
+    assert cache.get("expired") is None
+    assert auth.get_access_token() == "token-1"
+    assert cache.get("identity")[0] == "token-1"
+
+
+def test_file_token_cache_keeps_identities_apart(tmp_path):
+    cache = FileTokenCache(str(tmp_path / "tokens.json"))
+    with pytest.raises(ValueError, match="cache_key"):
+        AzIdentityAuthentication(FakeCredential(), token_cache=cache)
+
+    # same credential class, different identities
+    first = AzIdentityAuthentication(FakeCredential(identity="a"), token_cache=cache, cache_key="tenant-a:client-a")
+    second = AzIdentityAuthentication(FakeCredential(identity="b"), token_cache=cache, cache_key="tenant-b:client-b")
+    assert first.get_access_token() == "a-1"
+    assert second.get_access_token() == "b-1"
+
+
+def test_subclass_without_cache_key_fails_when_created():
+    class NoCacheKey(_RefreshingAuthentication):
+        def _set_access_token(self):
+            self.access_token = "token"
+
+    with pytest.raises(TypeError, match="_cache_key"):
+        NoCacheKey()
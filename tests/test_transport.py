@@ -0,0 +1,179 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from purviewautomation import (
+    AdaptiveRateLimiter,
+    HttpTransport,
+    PurviewCollections,
+    RetryPolicy,
+)
+from purviewautomation.testing import FakeAuth, FakeResponse
+
+
+class RecordingTransport:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def request(self, method, url, headers=None, data=None, timeout=None):
+        self.calls.append((method, url, headers, data))
+        return self.responses.pop(0)
+
+
+def test_transport_pool_settings():
+    transport = HttpTransport(pool_connections=3, pool_maxsize=25, pool_block=True, timeout=5)
+    adapter = transport.session.get_adapter("https://account.purview.azure.com")
+    assert adapter._pool_connections == 3
+    assert adapter._pool_maxsize == 25
+    assert adapter._pool_block is True
+    assert transport.timeout == 5
+    transport.close()
+
+
+def test_client_uses_injected_transport():
+    body = {"value": [{"name": "account", "friendlyName": "account"}]}
+    transport = RecordingTransport([FakeResponse(body=body)])
+    client = PurviewCollections("account", FakeAuth(), transport=transport)
+    collections = client.list_collections(only_names=True)
+    assert collections == {"account": {"friendlyName": "account", "parentCollection": None}}
+    method, url, headers, _ = transport.calls[0]
+    assert method == "GET"
+    assert url.startswith("https://account.purview.azure.com/account/collections")
+    assert headers["Authorization"] == "Bearer fake-token"
+
+
+def test_client_default_transport():
+    client = PurviewCollections("account", FakeAuth())
+    assert isinstance(client.transport, HttpTransport)
+
+
+class StubSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def request(self, method, url, headers=None, data=None, timeout=None):
+        self.calls += 1
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def no_wait_policy(total=5):
+    return RetryPolicy(total=total, backoff_factor=0, jitter=False)
+
+
+def test_retries_throttled_and_unavailable_responses():
+    session = StubSession(
+        [FakeResponse(429, headers={"Retry-After": "0"}), FakeResponse(503), FakeResponse(200, body={"value": []})]
+    )
+    transport = HttpTransport(session=session, retry_policy=no_wait_policy())
+    response = transport.request("GET", "https://account.purview.azure.com/account/collections")
+    assert response.status_code == 200
+    assert session.calls == 3
+
+
+def test_retries_connection_errors():
+    session = StubSession([requests.exceptions.ConnectionError(), FakeResponse(200)])
+    transport = HttpTransport(session=session, retry_policy=no_wait_policy())
+    assert transport.request("GET", "https://account.purview.azure.com").status_code == 200
+
+    session = StubSession([requests.exceptions.ConnectionError()] * 3)
+    transport = HttpTransport(session=session, retry_policy=no_wait_policy(total=2))
+    with pytest.raises(requests.exceptions.ConnectionError):
+        transport.request("GET", "https://account.purview.azure.com")
+    assert session.calls == 3
+
+
+def test_returns_last_response_when_retries_run_out():
+    session = StubSession([FakeResponse(500)] * 3)
+    transport = HttpTransport(session=session, retry_policy=no_wait_policy(total=2))
+    assert transport.request("GET", "https://account.purview.azure.com").status_code == 500
+    assert session.calls == 3
+
+
+def test_does_not_retry_client_errors():
+    session = StubSession([FakeResponse(403)])
+    transport = HttpTransport(session=session, retry_policy=no_wait_policy())
+    assert transport.request("GET", "https://account.purview.azure.com").status_code == 403
+    assert session.calls == 1
+
+
+def test_backoff():
+    policy = RetryPolicy(backoff_factor=1, max_backoff=5, jitter=False)
+    assert [policy.get_backoff(retries) for retries in range(4)] == [1, 2, 4, 5]
+    assert policy.get_backoff(0, FakeResponse(429, headers={"Retry-After": "3"})) == 3
+    assert 0 <= RetryPolicy(backoff_factor=1).get_backoff(2) <= 4
+
+
+def test_adaptive_rate_limiter():
+    limiter = AdaptiveRateLimiter(max_rate=100, min_rate=10, cooldown=0)
+    limiter.on_throttle()
+    assert limiter.rate == 50
+    for _ in range(10):
+        limiter.on_throttle()
+    assert limiter.rate == 10
+    for _ in range(1000):
+        limiter.on_success()
+    assert 10 < limiter.rate <= 100
+
+
+def test_rate_limiter_cuts_once_per_cooldown():
+    limiter = AdaptiveRateLimiter(max_rate=100)
+    for _ in range(8):
+        limiter.on_throttle()
+    assert limiter.rate == 50
+    limiter._last_cut -= 1
+    limiter.on_throttle()
+    assert limiter.rate == 25
+
+
+class BurstSession:
+    """Throttles the first requests once all of them are in flight."""
+
+    def __init__(self, throttled):
+        self.throttled = throttled
+        self.barrier = threading.Barrier(throttled)
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def request(self, method, url, headers=None, data=None, timeout=None):
+        with self.lock:
+            self.calls += 1
+            throttle = self.calls <= self.throttled
+        if throttle:
+            self.barrier.wait(timeout=5)
+            return FakeResponse(429)
+        return FakeResponse(200)
+
+
+def test_concurrent_throttles_cut_the_rate_once():
+    session = BurstSession(throttled=8)
+    transport = HttpTransport(session=session, retry_policy=no_wait_policy())
+    url = "https://account.purview.azure.com/account/collections"
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        responses = list(executor.map(lambda _: transport.request("GET", url), range(8)))
+    assert [response.status_code for response in responses] == [200] * 8
+    assert 50 <= transport.rate_limiter(url).rate < 51
+
+
+def test_rate_limiter_per_host():
+    session = StubSession([FakeResponse(429), FakeResponse(200), FakeResponse(200)])
+    transport = HttpTransport(session=session, retry_policy=no_wait_policy(), max_rate=1000)
+    transport.request("GET", "https://first.purview.azure.com/account/collections")
+    transport.request("GET", "https://second.purview.azure.com/account/collections")
+    first = transport.rate_limiter("https://first.purview.azure.com")
+    second = transport.rate_limiter("https://second.purview.azure.com")
+    assert first is not second
+    assert first.rate < second.rate == 1000
+    assert HttpTransport(max_rate=None).rate_limiter("https://first.purview.azure.com") is None
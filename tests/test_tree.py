@@ -0,0 +1,88 @@
+import pytest
+
+from purviewautomation import CollectionTree
+
+
+def coll(name, friendly_name, parent=None):
+    collection = {"name": name, "friendlyName": friendly_name}
+    if parent:
+        collection["parentCollection"] = {"type": "CollectionReference", "referenceName": parent}
+    return collection
+
+
+@pytest.fixture
+def tree():
+    return CollectionTree(
+        [
+            coll("root", "root"),
+            coll("abc123", "Sales", "root"),
+            coll("def456", "Finance", "root"),
+            coll("ghi789", "Reports", "abc123"),
+            coll("jkl012", "Reports", "def456"),
+        ]
+    )
+
+
+def test_lookups(tree):
+    assert len(tree) == 5
+    assert "abc123" in tree
+    assert tree.parent("ghi789").name == "abc123"
+    assert [node.name for node in tree.children("root")] == ["abc123", "def456"]
+    assert tree.depth("ghi789") == 2
+    assert tree.path("ghi789") == "root/Sales/Reports"
+    assert tree.path("ghi789", friendly=False) == "root/abc123/ghi789"
+    assert {node.name for node in tree.find_by_friendly_name("Reports")} == {"ghi789", "jkl012"}
+
+
+def test_names(tree):
+    names = tree.names()
+    assert names["root"] == {"friendlyName": "root", "parentCollection": None}
+    assert names["ghi789"] == {"friendlyName": "Reports", "parentCollection": "abc123"}
+
+
+def test_resolve(tree):
+    assert tree.resolve("Sales") == "abc123"
+    assert tree.resolve("abc123") == "abc123"
+    with pytest.raises(ValueError):
+        tree.resolve("missing")
+    with pytest.raises(ValueError):
+        tree.resolve("Reports")
+
+
+def test_add_update_and_remove(tree):
+    tree.add(coll("mno345", "New", "ghi789"))
+    assert tree.depth("mno345") == 3
+    tree.add(coll("mno345", "Renamed", "def456"))
+    assert tree.find_by_friendly_name("New") == []
+    assert tree.parent("mno345").name == "def456"
+    assert "mno345" not in [node.name for node in tree.children("ghi789")]
+    tree.remove("mno345")
+    assert "mno345" not in tree
+    assert "mno345" not in [node.name for node in tree.children("def456")]
+
+
+def test_parent_added_after_child():
+    tree = CollectionTree([coll("root", "root"), coll("child1", "child1", "parent1")])
+    assert tree.parent("child1") is None
+    tree.add(coll("parent1", "parent1", "root"))
+    assert tree.parent("child1").name == "parent1"
+    assert tree.path("child1") == "root/parent1/child1"
+
+
+def test_traversals():
+    tree = CollectionTree(
+        [
+            coll("root", "root"),
+            coll("a", "a", "root"),
+            coll("b", "b", "root"),
+            coll("a1", "a1", "a"),
+            coll("a2", "a2", "a"),
+            coll("a11", "a11", "a1"),
+        ]
+    )
+    assert [node.name for node in tree.iter_bfs("root")] == ["a", "b", "a1", "a2", "a11"]
+    assert [node.name for node in tree.iter_dfs("root", include_start=True)] == ["root", "a", "a1", "a11", "a2", "b"]
+    assert [node.name for node in tree.descendants("a")] == ["a1", "a2", "a11"]
+    levels = tree.leaf_first_levels("root", include_start=True)
+    assert [[node.name for node in level] for level in levels] == [["b", "a2", "a11"], ["a1"], ["a"], ["root"]]
+    assert [node.name for node in tree.leaf_first("a")] == ["a2", "a11", "a1"]